@@ -4,14 +4,28 @@ os.environ['TK_SILENCE_DEPRECATION'] = '1'
 import matplotlib
 matplotlib.use('TkAgg')  # Set the backend before importing pyplot
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+import numpy as np
 
 import tkinter as tk
 from tkinter import ttk
 import mysql.connector
+from mysql.connector import errorcode
 from datetime import datetime, date, timedelta
 import ttkthemes
 from tkinter import messagebox
+from tkinter import filedialog
 import re
+import csv
+import sys
+import math
+import time
+import queue
+import heapq
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from tkcalendar import DateEntry
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -24,6 +38,12 @@ class ModernCalendar(ttk.Frame):
         self.colors = colors
         self.selected_date = date.today()
         self.callback = None
+        self.day_loader = None
+        # Per-day overlay values keyed by (year, month)
+        self.day_data = {}
+        self._loading = set()
+        self.shown_month = None
+        self.cell_dates = [None] * 42
         self.create_calendar_ui()
 
     def create_calendar_ui(self):
@@ -87,122 +107,2803 @@ class ModernCalendar(ttk.Frame):
         self.calendar_frame = ttk.Frame(self, style='Card.TFrame')
         self.calendar_frame.pack(fill='both', expand=True)
         
+        # The 6x7 grid is built once; month changes only reconfigure it
+        self.cells = []
+        for index in range(42):
+            date_frame = ttk.Frame(
+                self.calendar_frame,
+                style='Card.TFrame'
+            )
+            date_frame.grid(row=index // 7, column=index % 7, padx=1, pady=1, sticky='nsew')
+
+            # Use tk.Label instead of ttk.Label
+            date_label = tk.Label(
+                date_frame,
+                bg=self.colors['card_bg'],
+                fg=self.colors['text'],
+                font=('Segoe UI', 10),
+                padx=5,
+                pady=5,
+                cursor="hand2"
+            )
+            date_label.pack(fill='both', expand=True)
+            date_label.bind('<Button-1>', lambda e, i=index: self.on_cell_click(i))
+
+            # Use tk.Label - per-day overlay such as scheduled donations
+            marker_label = tk.Label(
+                date_frame,
+                bg=self.colors['card_bg'],
+                fg=self.colors['accent'],
+                font=('Segoe UI', 7)
+            )
+            marker_label.bind('<Button-1>', lambda e, i=index: self.on_cell_click(i))
+
+            self.cells.append((date_frame, date_label, marker_label))
+
+        # Configure grid weights
+        for i in range(7):
+            self.calendar_frame.grid_columnconfigure(i, weight=1)
+        for i in range(6):
+            self.calendar_frame.grid_rowconfigure(i, weight=1)
+        
+        self.update_calendar()
+
+    def month_bounds(self, year, month):
+        first_day = date(year, month, 1)
+        if month == 12:
+            last_day = date(year + 1, 1, 1) - timedelta(days=1)
+        else:
+            last_day = date(year, month + 1, 1) - timedelta(days=1)
+        return first_day, last_day
+
+    def update_calendar(self):
+            # Update header
+            self.header_label.configure(text=self.selected_date.strftime("%B %Y"))
+
+            # Get calendar information
+            year = self.selected_date.year
+            month = self.selected_date.month
+            self.shown_month = (year, month)
+
+            # Get first day of month and number of days
+            first_day, last_day = self.month_bounds(year, month)
+            num_days = last_day.day
+            start_day = (first_day.weekday() + 1) % 7  # Adjust to start on Sunday
+
+            self.cell_dates = [None] * 42
+            for index, (date_frame, date_label, marker_label) in enumerate(self.cells):
+                day = index - start_day + 1
+                if 1 <= day <= num_days:
+                    self.cell_dates[index] = date(year, month, day)
+                    date_label.configure(text=str(day))
+                    date_frame.grid()
+                else:
+                    # Cells outside the month stay allocated but hidden
+                    date_frame.grid_remove()
+
+            self.style_cells()
+            self.load_day_data(year, month)
+            # Prefetch the neighbouring months so navigation finds data ready
+            for delta in (-1, 1):
+                self.load_day_data(*self.shift_month(year, month, delta))
+
+    def style_cells(self):
+        today = date.today()
+        day_data = self.day_data.get(self.shown_month, {})
+        for index, current_date in enumerate(self.cell_dates):
+            if current_date is None:
+                continue
+            self.style_cell(index, current_date, today, day_data.get(current_date))
+
+    def style_cell(self, index, current_date, today, marker):
+        _, date_label, marker_label = self.cells[index]
+
+        # Style based on selection/today
+        is_selected = current_date == self.selected_date
+        is_today = current_date == today
+
+        bg_color = self.colors['accent'] if is_selected else (
+            self.colors['bg_light'] if is_today else self.colors['card_bg']
+        )
+        fg_color = self.colors['text'] if is_selected else (
+            self.colors['accent'] if is_today else self.colors['text']
+        )
+        date_label.configure(bg=bg_color, fg=fg_color)
+
+        if marker:
+            marker_label.configure(
+                text=str(marker),
+                bg=bg_color,
+                fg=self.colors['text'] if is_selected else self.colors['accent']
+            )
+            marker_label.pack(fill='x')
+        else:
+            marker_label.pack_forget()
+
+    def shift_month(self, year, month, delta):
+        month += delta
+        if month > 12:
+            month = 1
+            year += 1
+        elif month < 1:
+            month = 12
+            year -= 1
+        return year, month
+
+    def set_day_loader(self, loader):
+        """Attach loader(first_day, last_day, deliver) for per-day overlays.
+
+        The loader may run asynchronously and calls deliver({date: value})
+        when done; results are cached per month.
+        """
+        self.day_loader = loader
+        self.day_data.clear()
+        self._loading.clear()
+        self.update_calendar()
+
+    def invalidate_day_data(self):
+        self.day_data.clear()
+        self._loading.clear()
+        if self.day_loader:
+            self.update_calendar()
+
+    def load_day_data(self, year, month):
+        key = (year, month)
+        if not self.day_loader or key in self.day_data or key in self._loading:
+            return
+        self._loading.add(key)
+        first_day, last_day = self.month_bounds(year, month)
+        self.day_loader(first_day, last_day, lambda data, key=key: self.receive_day_data(key, data))
+
+    def receive_day_data(self, key, data):
+        self._loading.discard(key)
+        self.day_data[key] = data or {}
+        if key == self.shown_month and self.winfo_exists():
+            self.style_cells()
+
+    def on_cell_click(self, index):
+        if self.cell_dates[index] is not None:
+            self.select_date(self.cell_dates[index])
+
+    def change_month(self, delta):
+        year, month = self.shift_month(self.selected_date.year, self.selected_date.month, delta)
+
+        # Keep the same day if possible
+        try:
+            self.selected_date = self.selected_date.replace(year=year, month=month)
+        except ValueError:
+            # If day is out of range, use last day of month
+            self.selected_date = self.month_bounds(year, month)[1]
+
         self.update_calendar()
+        
+    def select_date(self, selected_date):
+        self.selected_date = selected_date
+        if (selected_date.year, selected_date.month) == self.shown_month:
+            # Same month: only the highlight moves
+            self.style_cells()
+        else:
+            self.update_calendar()
+        if self.callback:
+            self.callback(selected_date)
+
+    def get_date(self):
+        return self.selected_date
+
+    def set_date(self, new_date):
+        self.selected_date = new_date
+        self.update_calendar()
+
+    def bind_selection(self, callback):
+        self.callback = callback
+
+class VirtualTreeview(ttk.Treeview):
+    """Treeview that only creates Tk items for the rows in view.
+
+    Rows live in a plain list of (key, values, tags); a fixed set of slot
+    items is re-filled as the user scrolls, so the Tk item count stays at
+    the viewport size however many rows are loaded. Selection and the top
+    visible row are tracked by key, so they survive scrolling and refreshes,
+    and slots whose row did not change are never touched.
+    """
+
+    def __init__(self, parent, buffer_rows=2, **kwargs):
+        self._yscroll = kwargs.pop('yscrollcommand', None)
+        super().__init__(parent, **kwargs)
+        self.buffer_rows = buffer_rows
+        self._rows = []
+        self._slots = []
+        self._slot_rows = []
+        self._top = 0
+        self._visible = 10
+        self._selected = set()
+
+        self.bind('<Configure>', self._on_resize, add='+')
+        self.bind('<ButtonRelease-1>', self._on_click, add='+')
+        self.bind('<MouseWheel>', self._on_mousewheel, add='+')
+        self.bind('<Button-4>', lambda e: self._scroll_by(-3), add='+')
+        self.bind('<Button-5>', lambda e: self._scroll_by(3), add='+')
+        self.bind('<Up>', lambda e: self._move_selection(-1))
+        self.bind('<Down>', lambda e: self._move_selection(1))
+        self.bind('<Prior>', lambda e: self._move_selection(-self._visible))
+        self.bind('<Next>', lambda e: self._move_selection(self._visible))
+
+    def configure(self, cnf=None, **kwargs):
+        # The scrollbar follows the row model, not the slot items
+        if 'yscrollcommand' in kwargs:
+            self._yscroll = kwargs.pop('yscrollcommand')
+            self._render()
+            if cnf is None and not kwargs:
+                return None
+        return super().configure(cnf, **kwargs)
+
+    config = configure
+
+    def set_rows(self, rows):
+        """Replace the row model; only slots showing a changed row are redrawn"""
+        top_key = self._rows[self._top][0] if self._top < len(self._rows) else None
+        self._rows = [(key, tuple(values), tuple(tags)) for key, values, tags in rows]
+        positions = {row[0]: index for index, row in enumerate(self._rows)}
+
+        # Keep the same row at the top of the viewport if it is still there
+        if top_key is not None and top_key in positions:
+            self._top = positions[top_key]
+        self._selected &= positions.keys()
+        self._render()
+
+    def rows(self):
+        """Values of every loaded row, in display order"""
+        return [values for _, values, _ in self._rows]
+
+    def selected_keys(self):
+        return [key for key, _, _ in self._rows if key in self._selected]
+
+    def key_at(self, item):
+        """Key of the row shown in a slot item; None for placeholders and empty space"""
+        if item in self._slots:
+            index = self._top + self._slots.index(item)
+            if index < len(self._rows):
+                return self._rows[index][0]
+        return None
+
+    def event_key(self, event):
+        return self.key_at(self.identify_row(event.y))
+
+    def _row_height(self):
+        try:
+            return int(ttk.Style(self).lookup(self.cget('style') or 'Treeview', 'rowheight') or 25)
+        except (ValueError, tk.TclError):
+            return 25
+
+    def _on_resize(self, event=None):
+        row_height = self._row_height()
+        header = row_height
+        if self._slots:
+            bbox = self.bbox(self._slots[0])
+            if bbox:
+                header = bbox[1]
+        visible = max(1, (self.winfo_height() - header) // row_height)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    def _render(self):
+        total = len(self._rows)
+        self._top = max(0, min(self._top, total - self._visible))
+        window = self._rows[self._top:self._top + self._visible + self.buffer_rows]
+
+        # Grow or shrink the slot pool to the window size
+        while len(self._slots) < len(window):
+            self._slots.append(super().insert('', 'end'))
+            self._slot_rows.append(None)
+        while len(self._slots) > len(window):
+            super().delete(self._slots.pop())
+            self._slot_rows.pop()
+
+        selected_slots = []
+        for index, (slot, row) in enumerate(zip(self._slots, window)):
+            if self._slot_rows[index] != row:
+                self.item(slot, values=row[1], tags=row[2])
+                self._slot_rows[index] = row
+            if row[0] in self._selected:
+                selected_slots.append(slot)
+        if set(selected_slots) != set(self.selection()):
+            self.selection_set(*selected_slots)
+        super().yview_moveto(0)
+
+        if self._yscroll:
+            if total:
+                first = self._top / total
+                last = min(1.0, (self._top + self._visible) / total)
+            else:
+                first, last = 0.0, 1.0
+            self._yscroll(first, last)
+
+    def yview(self, *args):
+        if not args:
+            total = len(self._rows) or 1
+            return (self._top / total, min(1.0, (self._top + self._visible) / total))
+        if args[0] == 'moveto':
+            self._top = int(float(args[1]) * len(self._rows))
+        elif args[0] == 'scroll':
+            step = self._visible if args[2].startswith('page') else 1
+            self._top += int(args[1]) * step
+        self._render()
+
+    def yview_moveto(self, fraction):
+        self.yview('moveto', fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview('scroll', number, what)
+
+    def _scroll_by(self, rows):
+        self._top += rows
+        self._render()
+        return 'break'
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-delta * 3)
+
+    def _on_click(self, event):
+        # Tk has already updated the slot selection; fold it into the key set
+        window_keys = {key for key, _, _ in self._rows[self._top:self._top + len(self._slots)]}
+        clicked = {
+            self._rows[self._top + self._slots.index(slot)][0]
+            for slot in self.selection() if slot in self._slots
+        }
+        # Shift/Control keep selections that are scrolled out of view
+        if event.state & 0x0005:
+            self._selected = (self._selected - window_keys) | clicked
+        else:
+            self._selected = clicked
+
+    def _move_selection(self, delta):
+        if not self._rows:
+            return 'break'
+        focus = self.focus()
+        if focus in self._slots:
+            index = self._top + self._slots.index(focus)
+        else:
+            index = self._top
+        index = max(0, min(len(self._rows) - 1, index + delta))
+
+        # Scroll just enough to bring the new row into view
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self._visible:
+            self._top = index - self._visible + 1
+        self._selected = {self._rows[index][0]}
+        self._render()
+
+        slot = self._slots[index - self._top]
+        self.focus(slot)
+        return 'break'
+
+
+class ViewManager:
+    """Keeps screens alive in a container and swaps them with pack_forget/pack.
+
+    A screen is built once; later visits re-pack its frame and run its
+    refresh hook. At most max_inactive hidden screens stay resident; the
+    least recently used ones are destroyed beyond that.
+    """
+
+    def __init__(self, container, max_inactive=3):
+        self.container = container
+        self.max_inactive = max_inactive
+        self._views = OrderedDict()
+        self.current = None
+
+    def show(self, name, build, refresh=None):
+        """Show a screen; build(frame) runs on first visit and may return a refresh hook"""
+        self._prune()
+        managed = {frame for frame, _ in self._views.values()}
+        # Unmanaged content (login card, fallback screens) is not kept
+        for child in self.container.winfo_children():
+            if child not in managed:
+                child.destroy()
+
+        if self.current in self._views and self.current != name:
+            self._views[self.current][0].pack_forget()
+
+        if name in self._views:
+            frame, hook = self._views[name]
+            self._views.move_to_end(name)
+            frame.pack(fill='both', expand=True)
+            self.current = name
+            if hook:
+                hook()
+        else:
+            frame = ttk.Frame(self.container, style='Modern.TFrame')
+            frame.pack(fill='both', expand=True)
+            try:
+                hook = build(frame) or refresh
+            except Exception:
+                frame.destroy()
+                raise
+            self._views[name] = (frame, hook)
+            self.current = name
+        self._evict()
+
+    def _prune(self):
+        # Frames destroyed behind our back (e.g. by a full container clear)
+        for name in [n for n, (frame, _) in self._views.items() if not frame.winfo_exists()]:
+            del self._views[name]
+        if self.current not in self._views:
+            self.current = None
+
+    def _evict(self):
+        inactive = [name for name in self._views if name != self.current]
+        while len(inactive) > self.max_inactive:
+            self.discard(inactive.pop(0))
+
+    def discard(self, name):
+        frame, _ = self._views.pop(name, (None, None))
+        if frame is not None and frame.winfo_exists():
+            frame.destroy()
+        if self.current == name:
+            self.current = None
+
+    def clear(self):
+        for name in list(self._views):
+            self.discard(name)
+
+
+class ChangeEventBus:
+    """In-process publish/subscribe for data changes made by this window.
+
+    Write paths publish a typed event after their transaction commits and
+    each screen subscribes only the widgets that event affects. Callbacks run
+    on the Tk thread. A subscriber tied to an owner widget is dropped once
+    the widget is destroyed and skipped while it is hidden, since every kept
+    screen refreshes itself through its ViewManager hook when shown again.
+    """
+
+    INVENTORY_CHANGED = 'inventory_changed'
+    REQUEST_CHANGED = 'request_changed'
+    DONOR_ADDED = 'donor_added'
+    DONOR_CHANGED = 'donor_changed'
+    DONOR_DELETED = 'donor_deleted'
+    DONATION_RECORDED = 'donation_recorded'
+
+    def __init__(self):
+        self._subscribers = {}
+        # Bumped on every publish; caches key on it to notice local writes
+        self.version = 0
+
+    def subscribe(self, event_type, callback, owner=None):
+        self._subscribers.setdefault(event_type, []).append((callback, owner))
+
+    def publish(self, event_type, **details):
+        self.version += 1
+        subscribers = self._subscribers.get(event_type, [])
+        alive = []
+        for callback, owner in subscribers:
+            try:
+                if owner is not None:
+                    if not owner.winfo_exists():
+                        continue
+                    if not owner.winfo_ismapped():
+                        alive.append((callback, owner))
+                        continue
+                callback(**details)
+            except tk.TclError:
+                # Widget torn down mid-update
+                continue
+            except Exception as e:
+                print(f"Change subscriber failed for {event_type}: {e}")  # Debug print
+            alive.append((callback, owner))
+        self._subscribers[event_type] = alive
+
+
+class DatabasePool:
+    """Thread-safe MySQL connection pool handing out per-operation cursors"""
+
+    def __init__(self, pool_size=5, checkout_timeout=10, health_check_interval=30, **connect_args):
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self.connect_args = connect_args
+
+        # One slot per connection; idle connections are reused newest-first
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+        self.metrics = {
+            'checkouts': 0,
+            'in_use': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0,
+            'timeouts': 0,
+            'reconnects': 0,
+            'connections_opened': 0
+        }
+
+        # Open the first connection eagerly so bad credentials fail at startup
+        self._idle.put((self._open_connection(), time.monotonic()))
+
+    def _open_connection(self):
+        conn = mysql.connector.connect(**self.connect_args)
+        # Plain reads must not pin a stale REPEATABLE READ snapshot on a reused
+        # connection; writes go through transaction() which starts one explicitly
+        conn.autocommit = True
+        with self._lock:
+            self.metrics['connections_opened'] += 1
+        return conn
+
+    def _is_healthy(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def _checkout(self):
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            with self._lock:
+                self.metrics['timeouts'] += 1
+            raise mysql.connector.errors.PoolError(
+                f"No database connection available after {self.checkout_timeout}s "
+                f"(pool size {self.pool_size})"
+            )
+
+        try:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                conn, last_used = self._open_connection(), None
+
+            # Health check connections that sat idle long enough to go stale;
+            # one ping, and only then, so a busy pool adds no round trips
+            if last_used is not None and time.monotonic() - last_used > self.health_check_interval:
+                if not self._is_healthy(conn):
+                    self._discard(conn)
+                    conn = self._open_connection()
+                    with self._lock:
+                        self.metrics['reconnects'] += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        wait = time.monotonic() - start
+        with self._lock:
+            self.metrics['checkouts'] += 1
+            self.metrics['in_use'] += 1
+            self.metrics['wait_total'] += wait
+            self.metrics['wait_max'] = max(self.metrics['wait_max'], wait)
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
+
+    def _release(self, conn, broken=False):
+        with self._lock:
+            self.metrics['in_use'] -= 1
+        # is_connected() would ping the server; a dead connection raises on
+        # use and is flagged broken, and stale idle ones are caught at checkout
+        if broken:
+            self._discard(conn)
+        else:
+            self._idle.put((conn, time.monotonic()))
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self._checkout()
+        broken = False
+        try:
+            yield conn
+        except (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError):
+            # Lost connection - don't hand it to the next caller
+            broken = True
+            raise
+        finally:
+            self._release(conn, broken)
+
+    @contextmanager
+    def cursor(self):
+        """Buffered cursor for reads; the connection returns to the pool on exit"""
+        with self.connection() as conn:
+            cursor = conn.cursor(buffered=True)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def stream_cursor(self):
+        """Unbuffered cursor for large reads; rows are fetched as they are iterated"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                # A stream abandoned midway leaves rows on the wire; drain them
+                # so the connection can go back to the pool
+                if conn.unread_result:
+                    conn.consume_results()
+                cursor.close()
+
+    @contextmanager
+    def transaction(self):
+        """Buffered cursor inside a transaction, committed on success and rolled back on error"""
+        with self.connection() as conn:
+            cursor = conn.cursor(buffered=True)
+            conn.start_transaction()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                try:
+                    conn.rollback()
+                except mysql.connector.Error:
+                    pass
+                raise
+            finally:
+                cursor.close()
+
+    def get_metrics(self):
+        with self._lock:
+            metrics = dict(self.metrics)
+        checkouts = metrics['checkouts']
+        metrics['avg_wait_ms'] = (metrics['wait_total'] / checkouts * 1000) if checkouts else 0.0
+        metrics['max_wait_ms'] = metrics['wait_max'] * 1000
+        metrics['idle'] = self._idle.qsize()
+        metrics['pool_size'] = self.pool_size
+        return metrics
+
+    def close_all(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+class BackgroundQueryExecutor:
+    """Runs database work on worker threads and delivers results on the Tk thread"""
+
+    def __init__(self, root, db_pool, max_workers=4, poll_interval=30):
+        self.root = root
+        self.db_pool = db_pool
+        self.poll_interval = poll_interval
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db-query')
+        self._completed = queue.Queue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        # Latest generation and future per key; older submissions are superseded
+        self._latest = {}
+        self._futures = {}
+
+        # Tk is not thread-safe, so workers never touch widgets; the Tk thread
+        # drains finished jobs on a timer instead
+        self.root.after(self.poll_interval, self._poll)
+
+    def submit(self, query_fn, on_done=None, on_error=None, key=None):
+        """Run query_fn(cursor) on a worker thread with a pooled read cursor.
+
+        Callbacks are invoked on the Tk thread. Submitting again with the same
+        key supersedes the previous job: it is cancelled if it has not started
+        and its result is discarded if it has.
+        """
+        def job(generation):
+            # Skip work that was superseded while it sat in the queue
+            if self.is_superseded(key, generation):
+                return None
+            with self.db_pool.cursor() as cursor:
+                return query_fn(cursor)
+
+        return self._schedule(job, on_done, on_error, key)
+
+    def run_in_background(self, fn, on_done=None, on_error=None, key=None):
+        """Run fn() on a worker thread; for work that manages its own connections"""
+        return self._schedule(lambda generation: fn(), on_done, on_error, key)
+
+    def _schedule(self, job, on_done, on_error, key):
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            if key is not None:
+                previous = self._futures.get(key)
+                if previous is not None:
+                    previous.cancel()
+                self._latest[key] = generation
+
+            future = self._executor.submit(job, generation)
+            if key is not None:
+                self._futures[key] = future
+
+        future.add_done_callback(
+            lambda f: self._completed.put((key, generation, f, on_done, on_error))
+        )
+        return future
+
+    def cancel(self, key):
+        with self._lock:
+            self._generation += 1
+            self._latest[key] = self._generation
+            future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def is_superseded(self, key, generation):
+        if key is None:
+            return False
+        with self._lock:
+            return self._latest.get(key) != generation
+
+    def _poll(self):
+        while True:
+            try:
+                key, generation, future, on_done, on_error = self._completed.get_nowait()
+            except queue.Empty:
+                break
+
+            if future.cancelled() or self.is_superseded(key, generation):
+                continue
+
+            if key is not None:
+                with self._lock:
+                    if self._futures.get(key) is future:
+                        del self._futures[key]
+
+            try:
+                error = future.exception()
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"Background query failed: {error}")
+                elif on_done:
+                    on_done(future.result())
+            except tk.TclError:
+                # The widget the result was meant for has been destroyed
+                pass
+            except Exception as e:
+                print(f"Error handling background query result: {e}")
+
+        self.root.after(self.poll_interval, self._poll)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+class InventorySnapshot:
+    """Shared in-memory copy of BloodBank, loaded with a single query.
+
+    Local writes invalidate it. Writes by other clients are caught once
+    max_age has passed: a one-row probe of the BloodBank version decides
+    whether the copy is still current or needs a reload. Either may hit the
+    database, so the UI calls get() through the query executor.
+    """
+
+    def __init__(self, db_pool, max_age=60):
+        self.db_pool = db_pool
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._units = None
+        self._version = None
+        self._loaded_at = 0.0
+
+    def _load(self):
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("""
+                SELECT blood_group, units_available, last_updated
+                FROM BloodBank
+                ORDER BY blood_group
+            """)
+            rows = cursor.fetchall()
+
+        units = {blood_group: available for blood_group, available, _ in rows}
+        # Newest last_updated identifies the state the snapshot was taken from;
+        # the total catches a second write within the same timestamp second
+        version = (
+            max((updated for _, _, updated in rows if updated), default=None),
+            sum(units.values())
+        )
+        with self._lock:
+            self._units = units
+            self._version = version
+            self._loaded_at = time.monotonic()
+        return units
+
+    def _probe_version(self):
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("SELECT MAX(last_updated), COALESCE(SUM(units_available), 0) FROM BloodBank")
+            last_updated, total = cursor.fetchone()
+        return (last_updated, int(total))
+
+    def get(self):
+        """Units available per blood group; reloads only when invalidated or changed.
+
+        Blocks on the probe or reload once the copy has expired, so call it
+        from a worker thread rather than the Tk thread.
+        """
+        with self._lock:
+            units, version = self._units, self._version
+            if units is not None and time.monotonic() - self._loaded_at < self.max_age:
+                return dict(units)
+        # Expired: keep the copy if BloodBank has not moved since it was taken
+        if units is not None and self._probe_version() == version:
+            with self._lock:
+                if self._units is units:
+                    self._loaded_at = time.monotonic()
+            return dict(units)
+        return dict(self._load())
+
+    def invalidate(self):
+        with self._lock:
+            self._units = None
+
+class AnalyticsSnapshot:
+    """Every dataset the analytics charts need for one date range.
+
+    load() fetches them in a single AnalyticsEngine round trip; snapshots
+    are cached per (start date, data version) so charts sharing a dataset,
+    and revisits of a range, do not query again.
+    """
+
+    def __init__(self, max_age=60, max_entries=8):
+        # Safety net for writes made by other clients; local writes bump the version
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+    def cached(self, start, version):
+        key = (start, version)
+        with self._lock:
+            snapshot = self._cache.get(key)
+            if snapshot is None or time.monotonic() - snapshot['loaded_at'] >= self.max_age:
+                return None
+            self._cache.move_to_end(key)
+            return snapshot
+
+    def load(self, cursor, start, version):
+        today = date.today()
+        # The equally long period before start is loaded too, for comparisons
+        engine = AnalyticsEngine.load(cursor, start - (today - start) - timedelta(days=1), today)
+        snapshot = {
+            'start': start,
+            'end': today,
+            'engine': engine,
+            'request_status': engine.status_counts(start, today),
+            'inventory': engine.inventory(),
+            'loaded_at': time.monotonic()
+        }
+
+        with self._lock:
+            self._cache[(start, version)] = snapshot
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+class DebouncedSearch:
+    """Coalesces keystrokes in a search box into one query per typing pause.
+
+    The last full result is kept; when the user only extends the term, the
+    rows are narrowed in memory instead of going back to the database.
+    """
+
+    def __init__(self, root, delay_ms=300):
+        self.root = root
+        self.delay_ms = delay_ms
+        self._after_id = None
+        self._filters = None
+        self._term = None
+        self._rows = None
+
+    def schedule(self, callback):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+
+        def fire():
+            self._after_id = None
+            callback()
+
+        self._after_id = self.root.after(self.delay_ms, fire)
+
+    def store(self, filters, term, rows):
+        self._filters = filters
+        self._term = term.lower()
+        self._rows = rows
+
+    def narrow(self, filters, term, match):
+        """Rows for term from the cached result, or None if a query is needed"""
+        term = term.lower()
+        # Every row matching a longer term also matches any substring of it
+        if self._rows is None or filters != self._filters or self._term not in term:
+            return None
+        if term == self._term:
+            return self._rows
+        return [row for row in self._rows if match(row, term)]
+
+    def invalidate(self):
+        self._rows = None
+
+class KeysetPager:
+    """Seek-based paging for a list ordered by (sort key DESC, id DESC).
+
+    Each page starts after the (sort key, id) of the last row shown, so the
+    database reads one page of rows however deep the user pages. Page
+    queries must select the id first and the sort key last.
+    """
+
+    PAGE_SIZES = (50, 100, 250, 500)
+
+    def __init__(self, page_size=100):
+        self.page_size = page_size
+        self.on_update = None
+        self._filters = None
+        self._loaded = None
+        self.reset()
+
+    def reset(self):
+        self._starts = [None]
+        self._next_start = None
+        self.has_next = False
+        self.row_count = 0
+        self.total = None
+
+    def sync(self, filters):
+        """Go back to the first page when the filters have changed"""
+        if filters != self._filters:
+            self._filters = filters
+            self.reset()
+
+    @property
+    def page(self):
+        return len(self._starts) - 1
+
+    def page_query(self, query, params, sort_expr, id_expr, sort_params=()):
+        """Append the seek predicate, ORDER BY and LIMIT for the current page"""
+        params = list(params)
+        start = self._starts[-1]
+        if start is not None:
+            sort_value, last_id = start
+            query += f" AND ({sort_expr} < %s OR ({sort_expr} = %s AND {id_expr} < %s))"
+            params += [*sort_params, sort_value, *sort_params, sort_value, last_id]
+        # One extra row tells us whether there is a next page
+        query += f" ORDER BY {sort_expr} DESC, {id_expr} DESC LIMIT %s"
+        params += [*sort_params, self.page_size + 1]
+        return query, params
+
+    @staticmethod
+    def full_query(query, params, sort_expr, id_expr, sort_params=()):
+        """The same ordering as page_query without a page bound, for exports"""
+        return f"{query} ORDER BY {sort_expr} DESC, {id_expr} DESC", [*sort_params, *params]
+
+    @property
+    def _position(self):
+        return (self._filters, self._starts[-1], self.page_size)
+
+    @property
+    def is_reload(self):
+        """True when the next load re-reads the page that is already shown"""
+        return self._loaded == self._position
+
+    def receive(self, rows):
+        """Trim the look-ahead row and remember where the next page starts"""
+        self._loaded = self._position
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self._next_start = (rows[-1][-1], rows[-1][0]) if rows else None
+        self.row_count = len(rows)
+        # A first page with nothing after it is the whole result
+        if self.page == 0 and not self.has_next:
+            self.total = len(rows)
+        self._notify()
+        return rows
+
+    @property
+    def is_complete(self):
+        return self.page == 0 and not self.has_next
+
+    def next_page(self):
+        if not self.has_next:
+            return False
+        self._starts.append(self._next_start)
+        return True
+
+    def previous_page(self):
+        if self.page == 0:
+            return False
+        self._starts.pop()
+        return True
+
+    def set_page_size(self, page_size):
+        total = self.total
+        self.page_size = page_size
+        self.reset()
+        self.total = total
+
+    def set_total(self, total):
+        self.total = total
+        self._notify()
+
+    def describe(self):
+        if not self.row_count:
+            return "No rows"
+        first = self.page * self.page_size + 1
+        last = first + self.row_count - 1
+        total = f"{self.total:,}" if self.total is not None else "…"
+        return f"Rows {first:,}–{last:,} of {total}"
+
+    def _notify(self):
+        if self.on_update:
+            self.on_update()
+
+class DashboardStats:
+    """Counters behind the dashboard stat cards.
+
+    The write paths adjust them inside their own transactions, so the cards
+    read a handful of primary-key rows instead of counting the base tables.
+    reconcile() rebuilds them from scratch to correct any drift.
+    """
+
+    def __init__(self, db_pool):
+        self.db_pool = db_pool
+
+    @staticmethod
+    def add(cursor, name, delta):
+        if delta:
+            cursor.execute("""
+                INSERT INTO StatCounters (name, value) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE value = value + VALUES(value)
+            """, (name, delta))
+
+    @staticmethod
+    def add_day(cursor, day, donations=0, requests=0):
+        # day=None means the server's CURDATE(), matching the SQL write paths
+        if donations or requests:
+            cursor.execute("""
+                INSERT INTO DailyStats (stat_date, donations, requests)
+                VALUES (COALESCE(%s, CURDATE()), %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    donations = donations + VALUES(donations),
+                    requests = requests + VALUES(requests)
+            """, (day, donations, requests))
+
+    @staticmethod
+    def measure(cursor):
+        """Compare the counters with the base tables; returns the corrections as deltas
+
+        Plain SELECTs take no locks, and inside one transaction they all read
+        the same snapshot, so counters and base tables are compared as of the
+        same moment even while writers keep committing.
+        """
+        cursor.execute("SELECT name, value FROM StatCounters")
+        before = dict(cursor.fetchall())
+        cursor.execute("SELECT stat_date, donations, requests FROM DailyStats")
+        before_days = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        cursor.execute("SELECT donation_date, COUNT(*) FROM Donors GROUP BY donation_date")
+        days = {day: (count, 0) for day, count in cursor.fetchall()}
+        cursor.execute("SELECT request_date, COUNT(*) FROM Requests GROUP BY request_date")
+        for day, count in cursor.fetchall():
+            days[day] = (days.get(day, (0, 0))[0], count)
+
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM Requests WHERE status = 'Pending'),
+                (SELECT COUNT(*) FROM Donors),
+                (SELECT COALESCE(SUM(units_available), 0) FROM BloodBank)
+        """)
+        pending, donors, units = cursor.fetchone()
+        totals = {'pending_requests': pending, 'total_donors': donors, 'total_units': units}
+
+        counters = {
+            name: value - before.get(name, 0)
+            for name, value in totals.items() if before.get(name) != value
+        }
+        day_deltas = {}
+        for day in set(days) | set(before_days):
+            donations, requests = days.get(day, (0, 0))
+            had_donations, had_requests = before_days.get(day, (0, 0))
+            if (donations, requests) != (had_donations, had_requests):
+                day_deltas[day] = (donations - had_donations, requests - had_requests)
+        return counters, day_deltas
+
+    @staticmethod
+    def apply(cursor, counters, day_deltas):
+        """Add the corrections from measure() on top of whatever has committed since"""
+        for name, delta in counters.items():
+            DashboardStats.add(cursor, name, delta)
+        for day, (donations, requests) in day_deltas.items():
+            DashboardStats.add_day(cursor, day, donations, requests)
+        drift = dict(counters)
+        if day_deltas:
+            drift['days'] = len(day_deltas)
+        return drift
+
+    @staticmethod
+    def reconcile(cursor):
+        """Rebuild every counter from the base tables; returns what had drifted"""
+        return DashboardStats.apply(cursor, *DashboardStats.measure(cursor))
+
+    def reconcile_now(self):
+        # Count in one lock-free snapshot, then apply the corrections as
+        # deltas in a short transaction, so writers never wait on the scans
+        # and increments committed in between are kept
+        with self.db_pool.transaction() as cursor:
+            counters, day_deltas = self.measure(cursor)
+        if not counters and not day_deltas:
+            return {}
+        with self.db_pool.transaction() as cursor:
+            return self.apply(cursor, counters, day_deltas)
+
+    def read(self, cursor):
+        cursor.execute("""
+            SELECT
+                COALESCE((SELECT donations FROM DailyStats WHERE stat_date = CURDATE()), 0),
+                COALESCE((SELECT requests FROM DailyStats WHERE stat_date = CURDATE()), 0),
+                (SELECT COUNT(*) FROM BloodBank WHERE units_available < 10),
+                COALESCE((SELECT value FROM StatCounters WHERE name = 'pending_requests'), 0),
+                COALESCE((SELECT value FROM StatCounters WHERE name = 'total_units'), 0),
+                COALESCE((SELECT value FROM StatCounters WHERE name = 'total_donors'), 0)
+        """)
+        return cursor.fetchone()
+
+
+class AnalyticsRollups:
+    """Daily pre-aggregates behind the analytics charts and reports.
+
+    DailyDonations counts donors by (donation_date, blood_group), and
+    DailyRequests counts requests and units by (request_date, status,
+    priority, blood_group). Write paths move a row's contribution from its
+    old key to its new one inside their own transaction. rebuild() is the
+    backfill that recomputes a date range from the base tables.
+    """
+
+    def __init__(self, db_pool):
+        self.db_pool = db_pool
+
+    @staticmethod
+    def move_donation(cursor, before=None, after=None):
+        """Move one donor between (day, blood_group) keys; None on either side adds or removes"""
+        if before == after:
+            return
+        for key, delta in ((before, -1), (after, 1)):
+            if key is None:
+                continue
+            day, blood_group = key
+            cursor.execute("""
+                INSERT INTO DailyDonations (stat_date, blood_group, donations)
+                VALUES (COALESCE(%s, CURDATE()), %s, %s)
+                ON DUPLICATE KEY UPDATE donations = donations + VALUES(donations)
+            """, (day, blood_group, delta))
+
+    @staticmethod
+    def add_donations(cursor, counts):
+        """Add {(day, blood_group): donations} in one executemany"""
+        rows = [(day, blood_group, donations) for (day, blood_group), donations in counts.items() if donations]
+        if rows:
+            cursor.executemany("""
+                INSERT INTO DailyDonations (stat_date, blood_group, donations)
+                VALUES (COALESCE(%s, CURDATE()), %s, %s)
+                ON DUPLICATE KEY UPDATE donations = donations + VALUES(donations)
+            """, rows)
+
+    @staticmethod
+    def move_request(cursor, before=None, after=None):
+        """Move one request between (day, status, priority, blood_group, units) keys"""
+        AnalyticsRollups.move_requests(cursor, [(before, after)])
+
+    @staticmethod
+    def move_requests(cursor, moves):
+        """Apply many (before, after) request moves, netted per rollup row in one executemany"""
+        deltas = {}
+        for before, after in moves:
+            if before == after:
+                continue
+            for key, delta in ((before, -1), (after, 1)):
+                if key is None:
+                    continue
+                day, status, priority, blood_group, units = key
+                row = (day, status, priority, blood_group)
+                requests, total_units = deltas.get(row, (0, 0))
+                deltas[row] = (requests + delta, total_units + delta * units)
+        rows = [row + counts for row, counts in deltas.items() if counts != (0, 0)]
+        if rows:
+            cursor.executemany("""
+                INSERT INTO DailyRequests (stat_date, status, priority, blood_group, requests, units)
+                VALUES (COALESCE(%s, CURDATE()), %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    requests = requests + VALUES(requests),
+                    units = units + VALUES(units)
+            """, rows)
+
+    @staticmethod
+    def rebuild(cursor, since=None):
+        """Backfill the rollups from Donors and Requests, from since (or all time)"""
+        # Earliest DATE MySQL supports
+        since = since or date(1000, 1, 1)
+        # INSERT ... SELECT share-locks the rows it reads, so a concurrent
+        # writer either lands before the rebuild or waits for it
+        cursor.execute("DELETE FROM DailyDonations WHERE stat_date >= %s", (since,))
+        cursor.execute("""
+            INSERT INTO DailyDonations (stat_date, blood_group, donations)
+            SELECT donation_date, blood_group, COUNT(*)
+            FROM Donors
+            WHERE donation_date >= %s
+            GROUP BY donation_date, blood_group
+        """, (since,))
+        cursor.execute("DELETE FROM DailyRequests WHERE stat_date >= %s", (since,))
+        cursor.execute("""
+            INSERT INTO DailyRequests (stat_date, status, priority, blood_group, requests, units)
+            SELECT request_date, status, priority, blood_group, COUNT(*), SUM(units_requested)
+            FROM Requests
+            WHERE request_date >= %s
+            GROUP BY request_date, status, priority, blood_group
+        """, (since,))
+
+
+class BloodUnits:
+    """Lot-level inventory: one BloodUnit row per unit, next to the BloodBank counters.
+
+    Every write path that moves BloodBank.units_available moves the same
+    number of units here in the same transaction. Allocation is first
+    expiring, first out over the (blood_group, status, expires_at) index.
+    """
+
+    SHELF_LIFE_DAYS = 42
+
+    @staticmethod
+    def receive(cursor, blood_group, units, collected_at=None, donor_id=None):
+        BloodUnits.receive_lots(cursor, [(blood_group, donor_id, collected_at or date.today())] * units)
+
+    @staticmethod
+    def receive_lots(cursor, lots, status='Available'):
+        """Insert one unit per (blood_group, donor_id, collected_at) in a single executemany"""
+        if not lots:
+            return
+        shelf_life = timedelta(days=BloodUnits.SHELF_LIFE_DAYS)
+        cursor.executemany("""
+            INSERT INTO BloodUnit (blood_group, donor_id, collected_at, expires_at, status)
+            VALUES (%s, %s, %s, %s, %s)
+        """, [
+            (blood_group, donor_id, collected_at, collected_at + shelf_life, status)
+            for blood_group, donor_id, collected_at in lots
+        ])
+
+    @staticmethod
+    def allocate(cursor, blood_group, units, request_id):
+        """Allocate the first-expiring usable units to a request; raises if short"""
+        if units <= 0:
+            return []
+        # One range scan on idx_units_fefo, locking exactly the units taken
+        cursor.execute("""
+            SELECT id FROM BloodUnit
+            WHERE blood_group = %s AND status = 'Available' AND expires_at > CURDATE()
+            ORDER BY expires_at, id
+            LIMIT %s
+            FOR UPDATE
+        """, (blood_group, units))
+        unit_ids = [row[0] for row in cursor.fetchall()]
+        if len(unit_ids) < units:
+            raise ValueError(
+                f"Only {len(unit_ids)} usable unit(s) of {blood_group} available, {units} requested"
+            )
+        placeholders = ', '.join(['%s'] * len(unit_ids))
+        cursor.execute(f"""
+            UPDATE BloodUnit SET status = 'Allocated', request_id = %s
+            WHERE id IN ({placeholders})
+        """, [request_id] + unit_ids)
+        return unit_ids
+
+    @staticmethod
+    def allocate_many(cursor, requests):
+        """Allocate first-expiring units to many (request_id, blood_group, units) at once.
+
+        One locking range scan per blood group hands out consecutive slices
+        of the FEFO order, then a single executemany tags every unit. Raises
+        if any group is short; returns the units taken per blood group.
+        """
+        wanted = {}
+        for request_id, blood_group, units in requests:
+            if units > 0:
+                wanted.setdefault(blood_group, []).append((request_id, units))
+        taken = {}
+        assignments = []
+        # Lock groups in a fixed order so concurrent batches cannot deadlock
+        for blood_group, group_requests in sorted(wanted.items()):
+            total = sum(units for _, units in group_requests)
+            cursor.execute("""
+                SELECT id FROM BloodUnit
+                WHERE blood_group = %s AND status = 'Available' AND expires_at > CURDATE()
+                ORDER BY expires_at, id
+                LIMIT %s
+                FOR UPDATE
+            """, (blood_group, total))
+            unit_ids = [row[0] for row in cursor.fetchall()]
+            if len(unit_ids) < total:
+                raise ValueError(
+                    f"Only {len(unit_ids)} usable unit(s) of {blood_group} available, {total} requested"
+                )
+            offset = 0
+            for request_id, units in group_requests:
+                assignments.extend((request_id, unit_id) for unit_id in unit_ids[offset:offset + units])
+                offset += units
+            taken[blood_group] = total
+        if assignments:
+            cursor.executemany(
+                "UPDATE BloodUnit SET status = 'Allocated', request_id = %s WHERE id = %s",
+                assignments
+            )
+        return taken
+
+    @staticmethod
+    def release(cursor, request_id, blood_group, units):
+        """Return an approved request's units to stock.
+
+        Requests approved before lots existed have nothing allocated; their
+        units come back as fresh lots so the counters and lots stay equal.
+        Returns the units returned per blood group, which differ from the
+        request's own group when substitutes were allocated.
+        """
+        return BloodUnits.release_many(cursor, [(request_id, blood_group, units)])
+
+    @staticmethod
+    def release_many(cursor, requests):
+        """release() for many (request_id, blood_group, units) in one scan and one UPDATE.
+
+        Units that expired while allocated are below the expiry sweep's
+        watermark, so no sweep will see them again: they are written off as
+        Expired here and left out of the returned counts. Those the sweep has
+        already passed are alerted on here; the next sweep reports the rest.
+        """
+        if not requests:
+            return {}
+        placeholders = ', '.join(['%s'] * len(requests))
+        request_ids = [request_id for request_id, _, _ in requests]
+        cursor.execute(f"""
+            SELECT request_id, blood_group,
+                CASE
+                    WHEN expires_at > CURDATE() THEN 'usable'
+                    WHEN expires_at <= (
+                        SELECT swept_through FROM SweepWatermarks WHERE name = %s
+                    ) THEN 'missed'
+                    ELSE 'pending'
+                END AS state,
+                COUNT(*)
+            FROM BloodUnit
+            WHERE request_id IN ({placeholders}) AND status = 'Allocated'
+            GROUP BY request_id, blood_group, state
+        """, [ExpirySweeper.NAME] + request_ids)
+        released = {}
+        allocated = {}
+        missed = {}
+        for request_id, blood_group, state, count in cursor.fetchall():
+            if state == 'usable':
+                released[blood_group] = released.get(blood_group, 0) + count
+            elif state == 'missed':
+                missed[blood_group] = missed.get(blood_group, 0) + count
+            allocated[request_id] = allocated.get(request_id, 0) + count
+        cursor.execute(f"""
+            UPDATE BloodUnit
+            SET status = IF(expires_at > CURDATE(), 'Available', 'Expired'), request_id = NULL
+            WHERE request_id IN ({placeholders}) AND status = 'Allocated'
+        """, request_ids)
+        ExpirySweeper.record_alerts(cursor, [
+            (blood_group, 'Critical', f"{count} unit(s) expired while allocated, written off on release")
+            for blood_group, count in sorted(missed.items())
+        ])
+        for request_id, blood_group, units in requests:
+            shortfall = units - allocated.get(request_id, 0)
+            if shortfall > 0:
+                BloodUnits.receive(cursor, blood_group, shortfall)
+                released[blood_group] = released.get(blood_group, 0) + shortfall
+        return released
+
+    @staticmethod
+    def adjust_counters(cursor, deltas):
+        """Move the BloodBank counters by {blood_group: delta}, one statement for all groups"""
+        deltas = [(delta, blood_group) for blood_group, delta in deltas.items() if delta]
+        if not deltas:
+            return
+        cursor.executemany("""
+            UPDATE BloodBank
+            SET units_available = units_available + %s
+            WHERE blood_group = %s
+        """, deltas)
+        DashboardStats.add(cursor, 'total_units', sum(delta for delta, _ in deltas))
+
+    @staticmethod
+    def usable_counts(cursor):
+        """Units that can still be allocated, per blood group"""
+        cursor.execute("""
+            SELECT blood_group, COUNT(*) FROM BloodUnit
+            WHERE status = 'Available' AND expires_at > CURDATE()
+            GROUP BY blood_group
+        """)
+        return dict(cursor.fetchall())
+
+    @staticmethod
+    def backfill(cursor):
+        # Migrations run on an autocommit connection and an interrupted one is
+        # re-run from the top, so clear any lots a partial run left behind.
+        # Backfilled lots are the only ones without a donor at this point
+        cursor.execute("DELETE FROM BloodUnit WHERE donor_id IS NULL")
+        # Existing stock has no collection dates; count it as collected when
+        # its BloodBank row last changed, the latest it can have arrived
+        cursor.execute("SELECT blood_group, units_available, last_updated FROM BloodBank")
+        for blood_group, units, last_updated in cursor.fetchall():
+            if units > 0:
+                collected_at = last_updated.date() if last_updated else date.today()
+                BloodUnits.receive(cursor, blood_group, units, collected_at)
+
+
+class ExpirySweeper:
+    """Expires BloodUnit lots incrementally from a persisted watermark.
+
+    Each run handles only units whose expiry date, or warning date
+    warning_days earlier, falls between the last swept day and today, so
+    the work tracks what changed rather than the size of the table. Units
+    are expired in bounded batches; the alerts and the watermark advance
+    commit together, which gives one alert per group and boundary crossing.
+    """
+
+    NAME = 'expiry'
+
+    def __init__(self, db_pool, batch_size=500, warning_days=7):
+        self.db_pool = db_pool
+        self.batch_size = batch_size
+        self.warning_days = warning_days
+
+    @staticmethod
+    def record_alerts(cursor, alerts):
+        """Insert (blood_group, alert_type, message) expiry alerts"""
+        if alerts:
+            cursor.executemany(
+                """INSERT INTO Inventory_Alerts (blood_group, alert_type, message, source)
+                VALUES (%s, %s, %s, 'expiry')""",
+                alerts
+            )
+
+    def watermark(self, cursor):
+        cursor.execute("SELECT swept_through FROM SweepWatermarks WHERE name = %s", (self.NAME,))
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+        # First run: start just before the oldest expiry on record
+        cursor.execute("SELECT MIN(expires_at) FROM BloodUnit")
+        oldest = cursor.fetchone()[0]
+        return (oldest or date.today()) - timedelta(days=1)
+
+    def expire_batch(self, blood_group, since, today):
+        """Expire one batch of a group's units; returns how many were expired"""
+        with self.db_pool.transaction() as cursor:
+            cursor.execute("""
+                SELECT id FROM BloodUnit
+                WHERE blood_group = %s AND status = 'Available'
+                    AND expires_at > %s AND expires_at <= %s
+                ORDER BY expires_at, id
+                LIMIT %s
+                FOR UPDATE
+            """, (blood_group, since, today, self.batch_size))
+            unit_ids = [row[0] for row in cursor.fetchall()]
+            if not unit_ids:
+                return 0
+
+            placeholders = ', '.join(['%s'] * len(unit_ids))
+            cursor.execute(
+                f"UPDATE BloodUnit SET status = 'Expired' WHERE id IN ({placeholders})",
+                unit_ids
+            )
+            BloodUnits.adjust_counters(cursor, {blood_group: -len(unit_ids)})
+            return len(unit_ids)
+
+    def sweep(self, today=None):
+        """Process everything that crossed a boundary since the last run; returns units expired per group"""
+        today = today or date.today()
+        with self.db_pool.cursor() as cursor:
+            since = self.watermark(cursor)
+        if since >= today:
+            return {}
+
+        expired = {}
+        for blood_group in AnalyticsEngine.BLOOD_GROUPS:
+            while True:
+                count = self.expire_batch(blood_group, since, today)
+                expired[blood_group] = expired.get(blood_group, 0) + count
+                if count < self.batch_size:
+                    break
+
+        with self.db_pool.transaction() as cursor:
+            # Lock the watermark; a concurrent sweep that got here first wins
+            cursor.execute(
+                "SELECT swept_through FROM SweepWatermarks WHERE name = %s FOR UPDATE",
+                (self.NAME,)
+            )
+            row = cursor.fetchone()
+            if row and row[0] >= today:
+                return {group: count for group, count in expired.items() if count}
+            since = row[0] if row else since
+
+            # Alerts are counted from the index, not from this run's batches,
+            # so a run that died after expiring units still reports them once
+            cursor.execute("""
+                SELECT blood_group, COUNT(*), MIN(expires_at), MAX(expires_at)
+                FROM BloodUnit
+                WHERE status = 'Expired' AND expires_at > %s AND expires_at <= %s
+                GROUP BY blood_group
+            """, (since, today))
+            alerts = [
+                (group, 'Critical', f"{count} unit(s) expired ({first} to {last})")
+                for group, count, first, last in cursor.fetchall()
+            ]
+            warn_from = since + timedelta(days=self.warning_days)
+            warn_to = today + timedelta(days=self.warning_days)
+            cursor.execute("""
+                SELECT blood_group, COUNT(*), MIN(expires_at)
+                FROM BloodUnit
+                WHERE status = 'Available' AND expires_at > %s AND expires_at <= %s
+                GROUP BY blood_group
+            """, (warn_from, warn_to))
+            alerts += [
+                (group, 'Low', f"{count} unit(s) expire within {self.warning_days} days (first on {first})")
+                for group, count, first in cursor.fetchall()
+            ]
+            self.record_alerts(cursor, alerts)
+            cursor.execute("""
+                INSERT INTO SweepWatermarks (name, swept_through) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE swept_through = VALUES(swept_through)
+            """, (self.NAME, today))
+
+        return {group: count for group, count in expired.items() if count}
+
+
+def check_expired_release(db_pool, blood_group='AB-'):
+    """Release a request whose allocated units expired before the sweep watermark.
+
+    Runs against the configured database in one transaction that is always
+    rolled back. Checks that BloodBank is credited only with the usable
+    unit and that the expired ones raise one expiry alert. Returns True if
+    both hold.
+    """
+    failures = []
+    with db_pool.connection() as conn:
+        cursor = conn.cursor(buffered=True)
+        conn.start_transaction()
+        try:
+            cursor.execute("SELECT CURDATE()")
+            today = cursor.fetchone()[0]
+            # The sweep has already passed the day the allocated units expired
+            cursor.execute("""
+                INSERT INTO SweepWatermarks (name, swept_through) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE swept_through = VALUES(swept_through)
+            """, (ExpirySweeper.NAME, today - timedelta(days=1)))
+            cursor.execute("SELECT units_available FROM BloodBank WHERE blood_group = %s", (blood_group,))
+            before = cursor.fetchone()[0]
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM Inventory_Alerts")
+            last_alert = cursor.fetchone()[0]
+
+            cursor.execute("""
+                INSERT INTO Requests (hospital_name, blood_group, units_requested, request_date, status)
+                VALUES ('Expired release check', %s, 3, %s, 'Approved')
+            """, (blood_group, today))
+            request_id = cursor.lastrowid
+            # Two units expired ten days ago while allocated, one still usable
+            expired_on = today - timedelta(days=BloodUnits.SHELF_LIFE_DAYS + 10)
+            BloodUnits.receive_lots(
+                cursor, [(blood_group, None, expired_on)] * 2 + [(blood_group, None, today)], status='Allocated'
+            )
+            cursor.execute("""
+                UPDATE BloodUnit SET request_id = %s
+                WHERE status = 'Allocated' AND request_id IS NULL
+            """, (request_id,))
+
+            released = BloodUnits.release_many(cursor, [(request_id, blood_group, 3)])
+            BloodUnits.adjust_counters(cursor, released)
+
+            cursor.execute("SELECT units_available FROM BloodBank WHERE blood_group = %s", (blood_group,))
+            after = cursor.fetchone()[0]
+            cursor.execute("""
+                SELECT blood_group, alert_type, message FROM Inventory_Alerts
+                WHERE id > %s AND source = 'expiry'
+            """, (last_alert,))
+            alerts = cursor.fetchall()
+
+            if released != {blood_group: 1}:
+                failures.append(f"released {released}, expected {{{blood_group!r}: 1}}")
+            if after - before != 1:
+                failures.append(f"BloodBank moved by {after - before}, expected 1")
+            if len(alerts) != 1 or alerts[0][:2] != (blood_group, 'Critical') or not alerts[0][2].startswith('2 unit(s)'):
+                failures.append(f"expiry alerts {alerts}, expected one Critical alert for 2 units")
+        finally:
+            conn.rollback()
+            cursor.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("Expired release check " + ("failed" if failures else "passed"))
+    return not failures
+
+
+class DonorImporter:
+    """Streams donor records from a CSV file into the database in chunks.
+
+    Only one chunk is held in memory at a time. Each chunk is validated with
+    vectorised versions of the registration form's personal-info rules and
+    written in its own transaction: executemany inserts for Donors,
+    DonationSchedule and BloodUnit, one BloodBank update per blood group and
+    one rollup row per day and group. Rejected rows go to a CSV next to the
+    source file with the line number and reason.
+    """
+
+    REQUIRED = ('name', 'age', 'blood_group', 'contact')
+    OPTIONAL = ('email', 'address', 'health_status', 'donation_date', 'time_slot', 'notes')
+    EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    DEFAULT_TIME_SLOT = 'Morning (9AM-12PM)'
+    MIN_AGE, MAX_AGE = 18, 65
+
+    def __init__(self, db_pool, chunk_size=1000):
+        self.db_pool = db_pool
+        self.chunk_size = chunk_size
 
-    def update_calendar(self):
-            # Clear existing calendar
-            for widget in self.calendar_frame.winfo_children():
-                widget.destroy()
+    @classmethod
+    def validate(cls, columns, today):
+        """Check a chunk column-wise; returns ages, donation dates and a reason per row ('' if valid)"""
+        count = len(columns['name'])
+        missing = np.zeros(count, dtype=bool)
+        for field in cls.REQUIRED:
+            missing |= columns[field] == ''
 
-            # Update header
-            self.header_label.configure(text=self.selected_date.strftime("%B %Y"))
+        # isdecimal() accepts only what int() parses ('²' is a digit but not
+        # decimal); three characters keep the conversion from overflowing
+        numeric = np.char.isdecimal(columns['age']) & (np.char.str_len(columns['age']) <= 3)
+        ages = np.where(numeric, columns['age'], '0').astype(int)
+        in_range = (ages >= cls.MIN_AGE) & (ages <= cls.MAX_AGE)
+        known_group = np.isin(columns['blood_group'], AnalyticsEngine.BLOOD_GROUPS)
 
-            # Get calendar information
-            year = self.selected_date.year
-            month = self.selected_date.month
+        emails = columns['email']
+        email_ok = (emails == '') | np.not_equal(np.frompyfunc(cls.EMAIL_PATTERN.match, 1, 1)(emails), None)
 
-            # Get first day of month and number of days
-            first_day = date(year, month, 1)
-            if month == 12:
-                last_day = date(year + 1, 1, 1) - timedelta(days=1)
+        # A blank donation date means the record is entered on the day
+        def parse_day(text):
+            if not text:
+                return today
+            try:
+                return date.fromisoformat(text)
+            except ValueError:
+                return None
+        days = np.frompyfunc(parse_day, 1, 1)(columns['donation_date'])
+
+        unparsed = np.equal(days, None)
+        # Comparing only the parsed dates keeps None out of the comparison
+        future = np.zeros(count, dtype=bool)
+        future[~unparsed] = days[~unparsed] > today
+
+        reasons = np.select(
+            [missing, ~numeric, ~in_range, ~known_group, ~email_ok, unparsed, future],
+            [
+                "Please fill in all required fields",
+                "Please enter a valid age",
+                f"Age must be between {cls.MIN_AGE} and {cls.MAX_AGE}",
+                "Unknown blood group",
+                "Please enter a valid email address",
+                "Donation date must be YYYY-MM-DD",
+                "Donation date cannot be in the future"
+            ],
+            default=''
+        )
+        return ages, days, reasons
+
+    @classmethod
+    def columns(cls, header, records):
+        """Turn a chunk of CSV records into stripped string arrays per field"""
+        width = len(header)
+        positions = {name: index for index, name in enumerate(header)}
+        # Short rows are padded so every column has one entry per record
+        table = np.array([(record + [''] * width)[:width] for record in records], dtype=str).reshape(-1, width)
+        columns = {}
+        for field in cls.REQUIRED + cls.OPTIONAL:
+            if field in positions:
+                columns[field] = np.char.strip(table[:, positions[field]])
             else:
-                last_day = date(year, month + 1, 1) - timedelta(days=1)
-            
-            num_days = last_day.day
-            start_day = first_day.weekday()
-            start_day = (start_day + 1) % 7  # Adjust to start on Sunday
-
-            # Create calendar grid
-            day = 1
-            for week in range(6):
-                for weekday in range(7):
-                    if week == 0 and weekday < start_day:
-                        # Empty cells before start of month
-                        continue
-                    elif day > num_days:
-                        # Empty cells after end of month
+                columns[field] = np.full(len(records), '', dtype=str)
+        columns['blood_group'] = np.char.upper(columns['blood_group'])
+        return columns
+
+    @staticmethod
+    def write_chunk(cursor, rows, today):
+        """Insert validated (name, age, group, contact, email, address, health, day, slot, notes) rows"""
+        cursor.executemany("""
+            INSERT INTO Donors (
+                name, age, blood_group, contact_info,
+                email, address, health_status, donation_date
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, [row[:8] for row in rows])
+        # executemany sends one multi-row INSERT, whose ids normally run from
+        # lastrowid in steps of the server increment. Interleaved auto-increment
+        # locking does not promise that, so read the range back and fail the
+        # chunk unless it holds exactly these donors in order
+        first_id = cursor.lastrowid
+        cursor.execute("SELECT @@auto_increment_increment")
+        step = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT id, name, contact_info, donation_date FROM Donors
+            WHERE id BETWEEN %s AND %s
+            ORDER BY id
+        """, (first_id, first_id + (len(rows) - 1) * step))
+        inserted = cursor.fetchall()
+        if [(name, contact, day) for _, name, contact, day in inserted] != [(row[0], row[3], row[7]) for row in rows]:
+            raise mysql.connector.errors.DatabaseError(
+                "Imported donors did not receive consecutive ids; the chunk was rolled back"
+            )
+        donor_ids = [donor_id for donor_id, _, _, _ in inserted]
+
+        cursor.executemany("""
+            INSERT INTO DonationSchedule (
+                donor_id, scheduled_date, time_slot, notes
+            ) VALUES (%s, %s, %s, %s)
+        """, [(donor_id, row[7], row[8], row[9]) for donor_id, row in zip(donor_ids, rows)])
+
+        # Every donation is one unit of its group, collected on the donation date.
+        # Old paper records whose shelf life has already run out are stored as
+        # Expired and left out of the counters, as the expiry sweep would have done
+        shelf_life = timedelta(days=BloodUnits.SHELF_LIFE_DAYS)
+        fresh = [(row[2], donor_id, row[7]) for donor_id, row in zip(donor_ids, rows) if row[7] + shelf_life > today]
+        expired = [(row[2], donor_id, row[7]) for donor_id, row in zip(donor_ids, rows) if row[7] + shelf_life <= today]
+        BloodUnits.receive_lots(cursor, fresh)
+        BloodUnits.receive_lots(cursor, expired, status='Expired')
+
+        stock = {}
+        by_day = {}
+        by_day_group = {}
+        for blood_group, _, _ in fresh:
+            stock[blood_group] = stock.get(blood_group, 0) + 1
+        for row in rows:
+            by_day[row[7]] = by_day.get(row[7], 0) + 1
+            by_day_group[(row[7], row[2])] = by_day_group.get((row[7], row[2]), 0) + 1
+
+        BloodUnits.adjust_counters(cursor, stock)
+        for day, donations in by_day.items():
+            DashboardStats.add_day(cursor, day, donations=donations)
+        DashboardStats.add(cursor, 'total_donors', len(rows))
+        AnalyticsRollups.add_donations(cursor, by_day_group)
+        return stock
+
+    def run(self, path, progress=None, cancel=None):
+        """Import path chunk by chunk.
+
+        progress(summary) is called after every chunk on the importing
+        thread; cancel is a threading.Event checked between chunks. Chunks
+        already written stay committed. Returns the final summary.
+        """
+        summary = {
+            'read': 0, 'imported': 0, 'rejected': 0, 'fraction': 0.0,
+            'blood_groups': set(), 'rejected_path': None, 'cancelled': False
+        }
+        total_bytes = os.path.getsize(path) or 1
+        rejected_file = None
+        rejected_writer = None
+        try:
+            with open(path, 'rb') as source:
+                # csv reads decoded lines; the binary handle keeps tell() usable for progress
+                reader = csv.reader(line.decode('utf-8-sig') for line in source)
+                header = [name.strip().lower() for name in next(reader, [])]
+                absent = [field for field in self.REQUIRED if field not in header]
+                if absent:
+                    raise ValueError(f"Missing required column(s): {', '.join(absent)}")
+
+                line_number = 1
+                while not (cancel is not None and cancel.is_set()):
+                    records = []
+                    line_numbers = []
+                    for record in reader:
+                        line_number = reader.line_num
+                        if not any(field.strip() for field in record):
+                            continue
+                        records.append(record)
+                        line_numbers.append(line_number)
+                        if len(records) >= self.chunk_size:
+                            break
+                    if not records:
                         break
-                    
-                    current_date = date(year, month, day)
-                    
-                    # Create date button
-                    date_frame = ttk.Frame(
-                        self.calendar_frame,
-                        style='Card.TFrame'
-                    )
-                    date_frame.grid(row=week, column=weekday, padx=1, pady=1, sticky='nsew')
 
-                    # Style based on selection/today
-                    is_selected = current_date == self.selected_date
-                    is_today = current_date == date.today()
+                    columns = self.columns(header, records)
+                    today = date.today()
+                    ages, days, reasons = self.validate(columns, today)
+                    # The driver converts plain Python values, not NumPy scalars
+                    values = {field: column.tolist() for field, column in columns.items()}
+                    ages, days = ages.tolist(), days.tolist()
+                    rows = [
+                        (
+                            values['name'][i], ages[i], values['blood_group'][i],
+                            values['contact'][i], values['email'][i], values['address'][i],
+                            values['health_status'][i], days[i],
+                            values['time_slot'][i] or self.DEFAULT_TIME_SLOT, values['notes'][i]
+                        )
+                        for i in np.flatnonzero(reasons == '').tolist()
+                    ]
+                    if rows:
+                        with self.db_pool.transaction() as cursor:
+                            stock = self.write_chunk(cursor, rows, today)
+                        summary['blood_groups'].update(stock)
 
-                    bg_color = self.colors['accent'] if is_selected else (
-                        self.colors['bg_light'] if is_today else self.colors['card_bg']
-                    )
-                    fg_color = self.colors['text'] if is_selected else (
-                        self.colors['accent'] if is_today else self.colors['text']
-                    )
+                    for i in np.flatnonzero(reasons != '').tolist():
+                        if rejected_writer is None:
+                            summary['rejected_path'] = f"{os.path.splitext(path)[0]}_rejected.csv"
+                            rejected_file = open(summary['rejected_path'], 'w', newline='', encoding='utf-8-sig')
+                            rejected_writer = csv.writer(rejected_file)
+                            rejected_writer.writerow(['line', 'reason'] + header)
+                        rejected_writer.writerow([line_numbers[i], reasons[i]] + records[i])
 
-                    # Use tk.Label instead of ttk.Label
-                    date_label = tk.Label(
-                        date_frame,
-                        text=str(day),
-                        bg=bg_color,
-                        fg=fg_color,
-                        font=('Segoe UI', 10),
-                        padx=5,
-                        pady=5,
-                        cursor="hand2"
-                    )
-                    date_label.pack(fill='both', expand=True)
-                    date_label.bind('<Button-1>', lambda e, d=current_date: self.select_date(d))
-                    
-                    day += 1
+                    summary['read'] += len(records)
+                    summary['imported'] += len(rows)
+                    summary['rejected'] += len(records) - len(rows)
+                    summary['fraction'] = min(1.0, source.tell() / total_bytes)
+                    if progress:
+                        progress(dict(summary))
+                summary['cancelled'] = cancel is not None and cancel.is_set()
+        finally:
+            if rejected_file is not None:
+                rejected_file.close()
+        return summary
 
-            # Configure grid weights
-            for i in range(7):
-                self.calendar_frame.grid_columnconfigure(i, weight=1)
-            for i in range(6):
-                self.calendar_frame.grid_rowconfigure(i, weight=1)
 
-    def change_month(self, delta):
-        year = self.selected_date.year
-        month = self.selected_date.month + delta
-        
-        if month > 12:
-            month = 1
-            year += 1
-        elif month < 1:
-            month = 12
-            year -= 1
+class AnalyticsEngine:
+    """Vectorized statistics over the analytics rollups.
 
-        # Keep the same day if possible
+    Everything is loaded in one query as a single int64 array of
+    (kind, day ordinal, blood-group code, status code, count, units), so each
+    aggregate is a NumPy mask plus a bincount or cumsum over contiguous memory.
+    """
+
+    BLOOD_GROUPS = ('A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-')
+    STATUSES = ('Pending', 'Approved', 'Rejected')
+    DONATIONS, REQUESTS, INVENTORY = 0, 1, 2
+    DAY, GROUP, STATUS, COUNT, UNITS = 1, 2, 3, 4, 5
+
+    # TO_DAYS() counts from year 0, date.toordinal() from year 1; FIELD() is
+    # 1-based and 0 for unknown values, which become code -1
+    QUERY = """
+        SELECT 0, TO_DAYS(stat_date) - 365,
+            FIELD(blood_group, 'A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-') - 1,
+            -1, donations, 0
+        FROM DailyDonations WHERE stat_date BETWEEN %s AND %s
+        UNION ALL
+        SELECT 1, TO_DAYS(stat_date) - 365,
+            FIELD(blood_group, 'A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-') - 1,
+            FIELD(status, 'Pending', 'Approved', 'Rejected') - 1, requests, units
+        FROM DailyRequests WHERE stat_date BETWEEN %s AND %s
+        UNION ALL
+        SELECT 2, 0,
+            FIELD(blood_group, 'A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-') - 1,
+            -1, units_available, 0
+        FROM BloodBank
+    """
+
+    def __init__(self, rows, start, end):
+        self.start = start
+        self.end = end
+        data = np.array(rows, dtype=np.int64).reshape(-1, 6)
+        kind = data[:, 0]
+        self._donations = data[kind == self.DONATIONS]
+        self._requests = data[kind == self.REQUESTS]
+        self._inventory = data[kind == self.INVENTORY]
+
+    @classmethod
+    def load(cls, cursor, start, end):
+        cursor.execute(cls.QUERY, (start, end, start, end))
+        return cls(cursor.fetchall(), start, end)
+
+    def _bounds(self, start, end):
+        return (start or self.start).toordinal(), (end or self.end).toordinal()
+
+    def _records(self, measure, start, end):
+        """Day offsets, group codes and values of one measure within [start, end]"""
+        if measure == 'donations':
+            data, column = self._donations, self.COUNT
+        elif measure == 'requests':
+            data, column = self._requests, self.COUNT
+        elif measure == 'units_requested':
+            data, column = self._requests, self.UNITS
+        elif measure == 'units_issued':
+            data, column = self._requests[self._requests[:, self.STATUS] == 1], self.UNITS
+        else:
+            raise ValueError(f"Unknown measure: {measure}")
+
+        first, last = self._bounds(start, end)
+        days = data[:, self.DAY]
+        data = data[(days >= first) & (days <= last)]
+        return data[:, self.DAY] - first, data[:, self.GROUP], data[:, column], last - first + 1
+
+    def days(self, start=None, end=None):
+        first, last = self._bounds(start, end)
+        return np.arange(first, last + 1)
+
+    def daily(self, measure, start=None, end=None, blood_group=None):
+        """Dense per-day series of a measure, zero on days without activity"""
+        offsets, groups, values, length = self._records(measure, start, end)
+        if blood_group is not None:
+            keep = groups == self.BLOOD_GROUPS.index(blood_group)
+            offsets, values = offsets[keep], values[keep]
+        return np.bincount(offsets, weights=values, minlength=max(length, 0))
+
+    def daily_by_group(self, measure, start=None, end=None):
+        """groups x days matrix of a measure, rows in BLOOD_GROUPS order"""
+        offsets, groups, values, length = self._records(measure, start, end)
+        known = groups >= 0
+        cells = groups[known] * length + offsets[known]
+        group_count = len(self.BLOOD_GROUPS)
+        return np.bincount(cells, weights=values[known], minlength=group_count * length).reshape(group_count, length)
+
+    def by_group(self, measure, start=None, end=None):
+        _, groups, values, _ = self._records(measure, start, end)
+        known = groups >= 0
+        totals = np.bincount(groups[known], weights=values[known], minlength=len(self.BLOOD_GROUPS))
+        return dict(zip(self.BLOOD_GROUPS, totals.tolist()))
+
+    def total(self, measure, start=None, end=None):
+        return int(self._records(measure, start, end)[2].sum())
+
+    def status_counts(self, start=None, end=None):
+        first, last = self._bounds(start, end)
+        data = self._requests
+        days = data[:, self.DAY]
+        data = data[(days >= first) & (days <= last) & (data[:, self.STATUS] >= 0)]
+        counts = np.bincount(data[:, self.STATUS], weights=data[:, self.COUNT], minlength=len(self.STATUSES))
+        return {status: int(count) for status, count in zip(self.STATUSES, counts) if count}
+
+    def inventory(self):
+        known = self._inventory[self._inventory[:, self.GROUP] >= 0]
+        return {
+            self.BLOOD_GROUPS[code]: int(units)
+            for code, units in zip(known[:, self.GROUP], known[:, self.COUNT])
+        }
+
+    @staticmethod
+    def moving_average(series, window):
+        """Trailing mean; the first window-1 points average what is available"""
+        sums = np.cumsum(series, dtype=float)
+        sums[window:] = sums[window:] - sums[:-window]
+        return sums / np.minimum(np.arange(1, len(series) + 1), window)
+
+    @staticmethod
+    def percentiles(series, quantiles=(50, 90, 95)):
+        if len(series) == 0:
+            return {q: 0.0 for q in quantiles}
+        return dict(zip(quantiles, np.percentile(series, quantiles).tolist()))
+
+    def period_comparison(self, measure, start, end):
+        """Total over [start, end] against the equally long period just before it"""
+        length = (end - start).days + 1
+        previous_start = start - timedelta(days=length)
+        current = self.total(measure, start, end)
+        previous = self.total(measure, previous_start, start - timedelta(days=1))
+        return {
+            'current': current,
+            'previous': previous,
+            'delta': current - previous,
+            'change_pct': (current - previous) * 100.0 / previous if previous else None
+        }
+
+    def consumption_rates(self, start=None, end=None):
+        """Units issued per day for each blood group"""
+        first, last = self._bounds(start, end)
+        days = last - first + 1
+        return {group: units / days for group, units in self.by_group('units_issued', start, end).items()}
+
+
+def can_receive(recipient, donor):
+    """ABO/Rh red cell compatibility: can a recipient of one group take a donor's units"""
+    recipient_abo, recipient_rh = recipient[:-1], recipient[-1]
+    donor_abo, donor_rh = donor[:-1], donor[-1]
+    abo_ok = donor_abo == 'O' or donor_abo == recipient_abo or recipient_abo == 'AB'
+    rh_ok = donor_rh == '-' or recipient_rh == '+'
+    return abo_ok and rh_ok
+
+
+def compatible_donor_order(compatibility, groups):
+    """Substitution order per recipient: the exact group, then donors that serve the fewest recipients"""
+    # Donors that can serve many groups (O- above all) are scarce, so use them last
+    breadth = compatibility.sum(axis=0)
+    order = {}
+    for i, recipient in enumerate(groups):
+        donors = np.flatnonzero(compatibility[i])
+        ranked = sorted(donors, key=lambda j: (groups[j] != recipient, breadth[j]))
+        order[recipient] = tuple(groups[j] for j in ranked)
+    return order
+
+
+class FulfilmentEngine:
+    """Pending requests in a priority queue, matched against stock with ABO/Rh substitution.
+
+    The queue orders Emergency before Urgent before Normal, then oldest
+    first. propose() walks it in that order and allocates each request from
+    its own group first, then from compatible substitutes, keeping the most
+    universal donor groups (O- above all) for last.
+    """
+
+    PRIORITY_RANK = {'Emergency': 0, 'Urgent': 1, 'Normal': 2}
+    BLOOD_GROUPS = AnalyticsEngine.BLOOD_GROUPS
+    # COMPATIBILITY[recipient, donor] for the groups in BLOOD_GROUPS order
+    COMPATIBILITY = np.array([
+        [can_receive(recipient, donor) for donor in AnalyticsEngine.BLOOD_GROUPS]
+        for recipient in AnalyticsEngine.BLOOD_GROUPS
+    ])
+    COMPATIBLE_DONORS = compatible_donor_order(COMPATIBILITY, BLOOD_GROUPS)
+
+    def __init__(self):
+        self._heap = []
+        self._live = {}
+
+    def __len__(self):
+        return len(self._live)
+
+    def describe(self, request_id):
+        """(priority, blood_group, units) of a queued request"""
+        rank, _, _, blood_group, units = self._live[request_id]
+        priorities = list(self.PRIORITY_RANK)
+        return priorities[min(rank, len(priorities) - 1)], blood_group, units
+
+    def add(self, request_id, blood_group, units, priority, requested_at):
+        entry = (self.PRIORITY_RANK.get(priority, len(self.PRIORITY_RANK)), requested_at, request_id, blood_group, units)
+        self._live[request_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def discard(self, request_id):
+        # Lazy removal: stale heap entries are skipped when popped
+        self._live.pop(request_id, None)
+
+    def load(self, cursor):
+        """Replace the queue with the pending requests in the database"""
+        cursor.execute("""
+            SELECT id, blood_group, units_requested, priority, created_at
+            FROM Requests
+            WHERE status = 'Pending'
+        """)
+        entries = [
+            (self.PRIORITY_RANK.get(priority, len(self.PRIORITY_RANK)), created_at, request_id, blood_group, units)
+            for request_id, blood_group, units, priority, created_at in cursor.fetchall()
+        ]
+        heapq.heapify(entries)
+        self._heap = entries
+        self._live = {entry[2]: entry for entry in entries}
+        return self
+
+    def ordered(self):
+        """Live entries in fulfilment order; the queue itself is left intact"""
+        heap = [entry for entry in self._heap if self._live.get(entry[2]) is entry]
+        # Compact away stale entries while we have the live list
+        heapq.heapify(heap)
+        self._heap = list(heap)
+        while heap:
+            yield heapq.heappop(heap)
+
+    def propose(self, inventory):
+        """Allocations for every request the stock can cover, in priority order.
+
+        Returns [(request_id, [(donor_group, units), ...]), ...]; requests
+        the compatible stock cannot cover in full are left for later.
+        """
+        available = dict(inventory)
+        proposals = []
+        for _, _, request_id, blood_group, units in self.ordered():
+            donors = self.COMPATIBLE_DONORS.get(blood_group, ())
+            if sum(available.get(donor, 0) for donor in donors) < units:
+                continue
+            allocation = []
+            remaining = units
+            for donor in donors:
+                take = min(available.get(donor, 0), remaining)
+                if take > 0:
+                    allocation.append((donor, take))
+                    available[donor] -= take
+                    remaining -= take
+                if not remaining:
+                    break
+            proposals.append((request_id, allocation))
+        return proposals
+
+
+def run_fulfilment_benchmark(pending=5000, seed=0):
+    """Time FulfilmentEngine.propose on synthetic pending requests and stock"""
+    rng = np.random.default_rng(seed)
+    groups = FulfilmentEngine.BLOOD_GROUPS
+    # Rough population shares of each group
+    shares = np.array([0.34, 0.06, 0.09, 0.02, 0.03, 0.01, 0.38, 0.07])
+    requested_groups = rng.choice(len(groups), size=pending, p=shares)
+    priorities = rng.choice(list(FulfilmentEngine.PRIORITY_RANK), size=pending, p=[0.1, 0.3, 0.6])
+    units = rng.integers(1, 6, size=pending)
+    start = datetime.now() - timedelta(days=30)
+
+    engine = FulfilmentEngine()
+    started = time.perf_counter()
+    for i in range(pending):
+        engine.add(i, groups[requested_groups[i]], int(units[i]), priorities[i], start + timedelta(minutes=int(i)))
+    queued = time.perf_counter() - started
+
+    # Enough stock for roughly half of the demand
+    inventory = dict(zip(groups, (shares * units.sum() * 0.5).astype(int).tolist()))
+    started = time.perf_counter()
+    proposals = engine.propose(inventory)
+    matched = time.perf_counter() - started
+
+    substituted = sum(
+        1 for request_id, allocation in proposals
+        if any(donor != groups[requested_groups[request_id]] for donor, _ in allocation)
+    )
+    print(
+        f"{pending} pending requests queued in {queued * 1000:.1f} ms, "
+        f"{len(proposals)} matched ({substituted} with substitutes) in {matched * 1000:.1f} ms"
+    )
+
+
+class DemandForecaster:
+    """Per-blood-group demand forecast and days of supply.
+
+    Demand is units issued per day. Each group's level is simple exponential
+    smoothing of its daily demand, scaled by a day-of-week profile; all
+    groups are smoothed together as the rows of one array.
+    """
+
+    def __init__(self, alpha=0.1, horizon=28, critical_days=3, low_days=7):
+        self.alpha = alpha
+        self.horizon = horizon
+        self.critical_days = critical_days
+        self.low_days = low_days
+
+    def levels(self, history):
+        """One-step-ahead levels: column t only uses demand before day t"""
+        history = np.asarray(history, dtype=float)
+        levels = np.empty_like(history)
+        level = history[:, 0].copy()
+        for t in range(history.shape[1]):
+            levels[:, t] = level
+            level += self.alpha * (history[:, t] - level)
+        return levels, level
+
+    @staticmethod
+    def weekday_profile(history, weekdays):
+        """Mean demand per weekday relative to the overall mean, per group"""
+        onehot = np.eye(7)[weekdays]
+        totals = history @ onehot
+        counts = np.maximum(onehot.sum(axis=0), 1)
+        overall = history.mean(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profile = (totals / counts) / overall
+        return np.where(np.isfinite(profile), profile, 1.0)
+
+    def forecast(self, history, first_day, horizon=None):
+        """groups x horizon daily demand for the days after history ends.
+
+        history is groups x days of units issued, ending the day before first_day.
+        """
+        history = np.asarray(history, dtype=float)
+        horizon = horizon or self.horizon
+        start = first_day.toordinal() - history.shape[1]
+        weekdays = (np.arange(start, start + history.shape[1]) - 1) % 7
+        profile = self.weekday_profile(history, weekdays)
+        _, level = self.levels(history)
+        ahead = (np.arange(first_day.toordinal(), first_day.toordinal() + horizon) - 1) % 7
+        return level[:, None] * profile[:, ahead]
+
+    @staticmethod
+    def days_of_supply(units, demand):
+        """Days until cumulative forecast demand exceeds units on hand.
+
+        units has one entry per group and demand is groups x horizon. Beyond
+        the horizon the mean forecast rate is extrapolated; no demand is inf.
+        """
+        units = np.asarray(units, dtype=float)
+        cumulative = np.cumsum(demand, axis=1)
+        runs_out = cumulative > units[:, None]
+        day = np.argmax(runs_out, axis=1)
+        rows = np.arange(len(units))
+        before = np.where(day > 0, cumulative[rows, day - 1], 0.0)
+        within = day + (units - before) / np.maximum(demand[rows, day], 1e-9)
+
+        rate = demand.mean(axis=1)
+        with np.errstate(divide='ignore'):
+            beyond = np.where(rate > 0, units / rate, np.inf)
+        # An empty shelf has no supply whatever the forecast says
+        return np.where(units <= 0, 0.0, np.where(runs_out.any(axis=1), within, beyond))
+
+    def status(self, days):
+        if days < self.critical_days:
+            return 'Critical'
+        if days < self.low_days:
+            return 'Low'
+        return None
+
+    def backtest(self, history, first_day, horizon=7, min_train=56, step=7):
+        """Rolling-origin accuracy of horizon-day forecasts over history.
+
+        Smoothed levels are causal, so one pass serves every origin; the
+        weekday profile for each origin comes from running weekday totals.
+        Returns MAE and WAPE of daily forecasts plus the runtime in seconds.
+        """
+        started = time.perf_counter()
+        history = np.asarray(history, dtype=float)
+        days = history.shape[1]
+        start = first_day.toordinal()
+        weekdays = (np.arange(start, start + days) - 1) % 7
+        onehot = np.eye(7)[weekdays]
+
+        levels, _ = self.levels(history)
+        # Running per-weekday totals and counts: prefix [0, t) at index t
+        weekday_totals = np.concatenate(
+            [np.zeros((history.shape[0], 1, 7)), np.cumsum(history[:, :, None] * onehot, axis=1)], axis=1
+        )
+        weekday_counts = np.concatenate([np.zeros((1, 7)), np.cumsum(onehot, axis=0)])
+        running_totals = np.concatenate([np.zeros((history.shape[0], 1)), np.cumsum(history, axis=1)], axis=1)
+
+        errors = []
+        actuals = []
+        for origin in range(min_train, days - horizon + 1, step):
+            counts = np.maximum(weekday_counts[origin], 1)
+            overall = running_totals[:, origin:origin + 1] / origin
+            with np.errstate(divide='ignore', invalid='ignore'):
+                profile = (weekday_totals[:, origin] / counts) / overall
+            profile = np.where(np.isfinite(profile), profile, 1.0)
+            ahead = weekdays[origin:origin + horizon]
+            predicted = levels[:, origin, None] * profile[:, ahead]
+            actual = history[:, origin:origin + horizon]
+            errors.append(np.abs(predicted - actual))
+            actuals.append(actual)
+
+        if not errors:
+            return {'mae': None, 'wape': None, 'origins': 0, 'seconds': time.perf_counter() - started}
+        errors = np.stack(errors)
+        actuals = np.stack(actuals)
+        total = actuals.sum()
+        return {
+            'mae': float(errors.mean()),
+            'wape': float(errors.sum() / total) if total else None,
+            'origins': len(errors),
+            'seconds': time.perf_counter() - started
+        }
+
+
+def synthetic_demand(years=5, groups=8, seed=0):
+    """Daily units issued per group with trend, weekly season and Poisson noise"""
+    rng = np.random.default_rng(seed)
+    days = years * 365
+    t = np.arange(days)
+    base = rng.uniform(1, 12, size=(groups, 1))
+    trend = 1 + rng.uniform(-0.2, 0.4, size=(groups, 1)) * t / days
+    weekly = 1 + 0.3 * np.sin(2 * np.pi * (t % 7) / 7)
+    yearly = 1 + 0.1 * np.sin(2 * np.pi * t / 365)
+    return rng.poisson(base * trend * weekly * yearly).astype(float)
+
+
+def run_forecast_benchmark(years=5):
+    """Backtest DemandForecaster on synthetic history and print accuracy and runtime"""
+    history = synthetic_demand(years)
+    first_day = date.today() - timedelta(days=history.shape[1])
+    forecaster = DemandForecaster()
+    for horizon in (7, 14, 28):
+        result = forecaster.backtest(history, first_day, horizon=horizon)
+        print(
+            f"{years} years x {history.shape[0]} groups, {horizon}-day horizon: "
+            f"MAE {result['mae']:.2f} units/day, WAPE {result['wape']:.1%}, "
+            f"{result['origins']} origins in {result['seconds'] * 1000:.1f} ms"
+        )
+    started = time.perf_counter()
+    forecaster.forecast(history, date.today())
+    print(f"Forecast for all groups: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+def trend_granularity(start, end):
+    """Bucket size for a trend over [start, end]: 'day', 'week' or 'month'"""
+    span = (end - start).days
+    if span <= 31:
+        return 'day'
+    if span <= 186:
+        return 'week'
+    return 'month'
+
+
+def bucket_series(days, values, granularity):
+    """Sum daily values (days as date ordinals) into buckets; returns bucket start dates and totals"""
+    days = np.asarray(days, dtype=np.int64)
+    if granularity == 'week':
+        # date.fromordinal(1) is a Monday, so weeks start on Monday
+        keys = days - (days - 1) % 7
+    elif granularity == 'month':
+        epoch = date(1970, 1, 1).toordinal()
+        months = (days - epoch).astype('datetime64[D]').astype('datetime64[M]')
+        keys = months.astype('datetime64[D]').astype(np.int64) + epoch
+    else:
+        keys = days
+    buckets, index = np.unique(keys, return_inverse=True)
+    totals = np.bincount(index, weights=values, minlength=len(buckets))
+    return [date.fromordinal(int(day)) for day in buckets], totals
+
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets downsampling to at most threshold points.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves peaks and troughs.
+    xs must be numeric and ascending.
+    """
+    length = len(xs)
+    if threshold >= length or threshold < 3:
+        return list(range(length))
+
+    kept = [0]
+    every = (length - 2) / (threshold - 2)
+    previous = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+
+        # Average of the following bucket (the last point for the final bucket)
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, length)
+        if next_start >= next_end:
+            next_start, next_end = length - 1, length
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        px, py = xs[previous], ys[previous]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((px - avg_x) * (ys[j] - py) - (px - xs[j]) * (avg_y - py))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        previous = best
+
+    kept.append(length - 1)
+    return kept
+
+
+def fulltext_phrase(term):
+    """Boolean-mode phrase for MATCH ... AGAINST; None if the term is too short to index"""
+    term = term.replace('"', ' ').strip()
+    # Shorter than the default ngram_token_size of 2
+    if len(term) < 2:
+        return None
+    return f'"{term}"'
+
+
+def check_fulltext_search(cursor):
+    """Fail if a donor whose name contains a stopword letter is not found by full-text search"""
+    # "a" and "i" are on InnoDB's default stopword list; an index built with
+    # it would drop nearly every ngram of a name like "maria"
+    cursor.execute("""
+        SELECT name FROM Donors
+        WHERE name LIKE '%a%' OR name LIKE '%i%'
+        ORDER BY id LIMIT 1
+    """)
+    row = cursor.fetchone()
+    phrase = fulltext_phrase(row[0]) if row else None
+    if phrase is None:
+        return
+    cursor.execute("""
+        SELECT COUNT(*) FROM Donors
+        WHERE MATCH(name, contact_info, email, health_status) AGAINST (%s IN BOOLEAN MODE)
+    """, (phrase,))
+    if not cursor.fetchone()[0]:
+        raise mysql.connector.errors.DatabaseError(
+            f"Full-text search does not find donor {row[0]!r}; check innodb_ft_enable_stopword"
+        )
+
+
+def rebuild_fulltext_indexes(cursor):
+    """Drop and recreate the full-text indexes with the stopword list off"""
+    statements = [
+        "DROP INDEX ft_donors_search ON Donors",
+        """CREATE FULLTEXT INDEX ft_donors_search
+            ON Donors (name, contact_info, email, health_status) WITH PARSER ngram""",
+        "DROP INDEX ft_requests_search ON Requests",
+        """CREATE FULLTEXT INDEX ft_requests_search
+            ON Requests (hospital_name, notes) WITH PARSER ngram"""
+    ]
+    cursor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+    try:
+        for statement in statements:
+            try:
+                cursor.execute(statement)
+            except mysql.connector.Error as err:
+                # An interrupted rebuild re-runs from the top with the index already gone
+                if err.errno != errorcode.ER_CANT_DROP_FIELD_OR_KEY:
+                    raise
+    finally:
+        # The connection goes back to the pool, so never leave stopwords off
+        cursor.execute("SET SESSION innodb_ft_enable_stopword = ON")
+
+
+DB_CONFIG = {
+    'host': "localhost",
+    'user': "bloodbank_user",
+    'password': "Helbert@1",
+    'database': "blood_bank"
+}
+
+
+def seed_admin_account(cursor):
+    # Default login for a fresh install
+    cursor.execute("SELECT id FROM Users WHERE username = 'admin'")
+    if not cursor.fetchone():
+        hashed = bcrypt.hashpw('admin123'.encode('utf-8'), bcrypt.gensalt())
+        cursor.execute(
+            "INSERT INTO Users (username, password, role, email) VALUES (%s, %s, %s, %s)",
+            ('admin', hashed, 'admin', 'admin@bloodbank.com')
+        )
+
+
+# Forward-only schema migrations applied in order at startup. Released entries
+# are never edited - schema changes get a new version appended to the list.
+# A step is either an SQL string or a callable taking the cursor.
+SCHEMA_MIGRATIONS = [
+    (1, "Base tables", [
+        """CREATE TABLE IF NOT EXISTS BloodBank (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            blood_group VARCHAR(5) NOT NULL,
+            units_available INT NOT NULL,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )""",
+        """CREATE TABLE IF NOT EXISTS Donors (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            age INT NOT NULL,
+            blood_group VARCHAR(5) NOT NULL,
+            contact_info VARCHAR(100) NOT NULL,
+            email VARCHAR(100),
+            address TEXT,
+            donation_date DATE NOT NULL,
+            health_status TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        """CREATE TABLE IF NOT EXISTS Requests (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            hospital_name VARCHAR(100) NOT NULL,
+            blood_group VARCHAR(5) NOT NULL,
+            units_requested INT NOT NULL,
+            request_date DATE NOT NULL,
+            priority ENUM('Normal', 'Urgent', 'Emergency') DEFAULT 'Normal',
+            status ENUM('Pending', 'Approved', 'Rejected') DEFAULT 'Pending',
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        """CREATE TABLE IF NOT EXISTS Users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            role ENUM('admin', 'staff') NOT NULL,
+            email VARCHAR(100),
+            last_login TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        """CREATE TABLE IF NOT EXISTS DonationSchedule (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            donor_id INT,
+            scheduled_date DATE NOT NULL,
+            time_slot VARCHAR(20) NOT NULL,
+            status ENUM('Scheduled', 'Completed', 'Cancelled') DEFAULT 'Scheduled',
+            notes TEXT,
+            FOREIGN KEY (donor_id) REFERENCES Donors(id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS Inventory_Alerts (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            blood_group VARCHAR(5) NOT NULL,
+            alert_type ENUM('Low', 'Critical') NOT NULL,
+            message TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        # Seed one inventory row per blood group on a fresh database
+        """INSERT INTO BloodBank (blood_group, units_available)
+            SELECT g.blood_group, 0 FROM (
+                SELECT 'A+' AS blood_group UNION ALL SELECT 'A-' UNION ALL
+                SELECT 'B+' UNION ALL SELECT 'B-' UNION ALL
+                SELECT 'AB+' UNION ALL SELECT 'AB-' UNION ALL
+                SELECT 'O+' UNION ALL SELECT 'O-'
+            ) AS g
+            WHERE NOT EXISTS (SELECT 1 FROM BloodBank)"""
+    ]),
+    (2, "Hot-path indexes and query plan log", [
+        # Donor list filters by group and date range, newest first
+        "CREATE INDEX idx_donors_group_date ON Donors (blood_group, donation_date)",
+        "CREATE INDEX idx_donors_date ON Donors (donation_date)",
+        # Request list filters by status; the status chart groups a date range by status
+        "CREATE INDEX idx_requests_status_date ON Requests (status, request_date)",
+        "CREATE INDEX idx_requests_date_status ON Requests (request_date, status)",
+        # Donor history is per donor ordered by date; donation history joins on Completed
+        "CREATE INDEX idx_schedule_donor_date ON DonationSchedule (donor_id, scheduled_date)",
+        "CREATE INDEX idx_schedule_status_donor ON DonationSchedule (status, donor_id)",
+        """CREATE TABLE IF NOT EXISTS schema_query_plans (
+            query_name VARCHAR(64) PRIMARY KEY,
+            schema_version INT NOT NULL,
+            full_scan BOOLEAN NOT NULL,
+            plan TEXT NOT NULL,
+            recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )"""
+    ]),
+    (3, "Default admin account", [seed_admin_account]),
+    (4, "Dashboard stat counters", [
+        """CREATE TABLE IF NOT EXISTS DailyStats (
+            stat_date DATE PRIMARY KEY,
+            donations INT NOT NULL DEFAULT 0,
+            requests INT NOT NULL DEFAULT 0
+        )""",
+        """CREATE TABLE IF NOT EXISTS StatCounters (
+            name VARCHAR(32) PRIMARY KEY,
+            value BIGINT NOT NULL DEFAULT 0
+        )""",
+        DashboardStats.reconcile
+    ]),
+    # ngram parser so partial words match, like the LIKE '%term%' it replaces
+    (5, "Full-text search indexes", [
+        """CREATE FULLTEXT INDEX ft_donors_search
+            ON Donors (name, contact_info, email, health_status) WITH PARSER ngram""",
+        """CREATE FULLTEXT INDEX ft_requests_search
+            ON Requests (hospital_name, notes) WITH PARSER ngram"""
+    ]),
+    # Calendar overlays count a month of bookings by day
+    (6, "Schedule date index", [
+        "CREATE INDEX idx_schedule_date ON DonationSchedule (scheduled_date)"
+    ]),
+    (7, "Analytics rollups", [
+        """CREATE TABLE IF NOT EXISTS DailyDonations (
+            stat_date DATE NOT NULL,
+            blood_group VARCHAR(5) NOT NULL,
+            donations INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (stat_date, blood_group)
+        )""",
+        """CREATE TABLE IF NOT EXISTS DailyRequests (
+            stat_date DATE NOT NULL,
+            status ENUM('Pending', 'Approved', 'Rejected') NOT NULL,
+            priority ENUM('Normal', 'Urgent', 'Emergency') NOT NULL,
+            blood_group VARCHAR(5) NOT NULL,
+            requests INT NOT NULL DEFAULT 0,
+            units INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (stat_date, status, priority, blood_group)
+        )""",
+        AnalyticsRollups.rebuild
+    ]),
+    # FEFO allocation reads one group's available units in expiry order
+    (8, "Lot-level blood units", [
+        """CREATE TABLE IF NOT EXISTS BloodUnit (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            blood_group VARCHAR(5) NOT NULL,
+            donor_id INT NULL,
+            collected_at DATE NOT NULL,
+            expires_at DATE NOT NULL,
+            status ENUM('Available', 'Allocated', 'Expired', 'Discarded') NOT NULL DEFAULT 'Available',
+            request_id INT NULL,
+            INDEX idx_units_fefo (blood_group, status, expires_at),
+            INDEX idx_units_request (request_id)
+        )""",
+        BloodUnits.backfill
+    ]),
+    # The expiry sweeper scans by status and expiry date across all groups
+    (9, "Expiry sweep watermark", [
+        """CREATE TABLE IF NOT EXISTS SweepWatermarks (
+            name VARCHAR(32) PRIMARY KEY,
+            swept_through DATE NOT NULL
+        )""",
+        "CREATE INDEX idx_units_status_expiry ON BloodUnit (status, expires_at)"
+    ]),
+    # The ngram parser drops every ngram containing a stopword ("a", "i",
+    # "in", ...), and version 5 built the indexes with the stopword list on
+    (10, "Rebuild full-text indexes without stopwords", [
+        rebuild_fulltext_indexes,
+        check_fulltext_search
+    ]),
+    # Expiry sweeps and demand forecasts both raise Low/Critical alerts;
+    # the forecast's once-a-day dedupe looks only at its own
+    (11, "Inventory alert source", [
+        "ALTER TABLE Inventory_Alerts ADD COLUMN source VARCHAR(16) NULL",
+        "CREATE INDEX idx_alerts_dedupe ON Inventory_Alerts (blood_group, source, alert_type, created_at)"
+    ]),
+]
+
+# Representative forms of the queries behind the list screens and charts.
+# Their EXPLAIN output is recorded after every migration run.
+HOT_QUERIES = {
+    'donors_by_group': (
+        """SELECT id, name, blood_group, donation_date FROM Donors
+        WHERE blood_group = %s AND donation_date >= %s
+        ORDER BY donation_date DESC, id DESC LIMIT 101""",
+        ('O+', date(2000, 1, 1))
+    ),
+    'donors_by_date': (
+        """SELECT id, name, blood_group, donation_date FROM Donors
+        WHERE donation_date >= %s ORDER BY donation_date DESC, id DESC LIMIT 101""",
+        (date(2000, 1, 1),)
+    ),
+    'requests_by_status': (
+        """SELECT id, hospital_name, request_date, status FROM Requests
+        WHERE status = %s ORDER BY request_date DESC, id DESC LIMIT 101""",
+        ('Pending',)
+    ),
+    'analytics_snapshot': (
+        AnalyticsEngine.QUERY,
+        (date(2000, 1, 1), date(2001, 1, 1), date(2000, 1, 1), date(2001, 1, 1))
+    ),
+    'donation_history': (
+        """SELECT ds.id, d.name, d.donation_date FROM Donors d
+        JOIN DonationSchedule ds ON d.id = ds.donor_id
+        WHERE ds.status = 'Completed' AND d.donation_date >= %s
+        ORDER BY d.donation_date DESC, ds.id DESC LIMIT 101""",
+        (date(2000, 1, 1),)
+    ),
+    'donor_history': (
+        """SELECT scheduled_date, time_slot, status FROM DonationSchedule
+        WHERE donor_id = %s ORDER BY scheduled_date DESC""",
+        (1,)
+    ),
+    'calendar_schedule_counts': (
+        """SELECT scheduled_date, COUNT(*) FROM DonationSchedule
+        WHERE scheduled_date BETWEEN %s AND %s GROUP BY scheduled_date""",
+        (date(2000, 1, 1), date(2000, 1, 31))
+    ),
+    'fefo_allocation': (
+        """SELECT id FROM BloodUnit
+        WHERE blood_group = %s AND status = 'Available' AND expires_at > CURDATE()
+        ORDER BY expires_at, id LIMIT 10""",
+        ('O+',)
+    ),
+    'fulfilment_queue': (
+        """SELECT id, blood_group, units_requested, priority, created_at
+        FROM Requests WHERE status = 'Pending'""",
+        ()
+    ),
+    'usable_stock': (
+        """SELECT blood_group, COUNT(*) FROM BloodUnit
+        WHERE status = 'Available' AND expires_at > CURDATE()
+        GROUP BY blood_group""",
+        ()
+    ),
+    'expiry_sweep_alerts': (
+        """SELECT blood_group, COUNT(*) FROM BloodUnit
+        WHERE status = 'Expired' AND expires_at > %s AND expires_at <= %s
+        GROUP BY blood_group""",
+        (date(2000, 1, 1), date(2000, 1, 2))
+    ),
+    'donor_search': (
+        """SELECT id, name FROM Donors
+        WHERE MATCH(name, contact_info, email, health_status) AGAINST (%s IN BOOLEAN MODE)""",
+        ('"smith"',)
+    ),
+    'request_search': (
+        """SELECT id, hospital_name FROM Requests
+        WHERE MATCH(hospital_name, notes) AGAINST (%s IN BOOLEAN MODE)""",
+        ('"general"',)
+    ),
+}
+
+
+class SchemaMigrator:
+    """Applies SCHEMA_MIGRATIONS and records EXPLAIN plans for HOT_QUERIES"""
+
+    LOCK_NAME = 'blood_bank_schema_migration'
+
+    def __init__(self, db_pool, migrations=SCHEMA_MIGRATIONS, hot_queries=HOT_QUERIES):
+        self.db_pool = db_pool
+        self.migrations = sorted(migrations, key=lambda m: m[0])
+        self.hot_queries = hot_queries
+
+    @property
+    def latest_version(self):
+        return self.migrations[-1][0] if self.migrations else 0
+
+    def _ensure_version_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def _current_version(self, cursor):
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        return cursor.fetchone()[0]
+
+    def _apply(self, cursor, version, description, statements):
+        # MySQL commits DDL implicitly, so a migration interrupted halfway is
+        # re-run from the top; statements whose effect already exists are skipped
+        for statement in statements:
+            try:
+                if callable(statement):
+                    statement(cursor)
+                else:
+                    cursor.execute(statement)
+            except mysql.connector.Error as err:
+                if err.errno not in (errorcode.ER_DUP_KEYNAME, errorcode.ER_DUP_FIELDNAME,
+                                     errorcode.ER_CANT_DROP_FIELD_OR_KEY):
+                    raise
+        cursor.execute(
+            "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+            (version, description)
+        )
+
+    def probe_version(self):
+        """Current schema version in one round trip; 0 if never migrated"""
         try:
-            self.selected_date = self.selected_date.replace(year=year, month=month)
-        except ValueError:
-            # If day is out of range, use last day of month
-            if month == 12:
-                self.selected_date = date(year + 1, 1, 1) - timedelta(days=1)
-            else:
-                self.selected_date = date(year, month + 1, 1) - timedelta(days=1)
+            with self.db_pool.cursor() as cursor:
+                cursor.execute("SELECT MAX(version) FROM schema_version")
+                return cursor.fetchone()[0] or 0
+        except mysql.connector.errors.ProgrammingError as err:
+            if err.errno == errorcode.ER_NO_SUCH_TABLE:
+                return 0
+            raise
 
-        self.update_calendar()
-        
-    def select_date(self, selected_date):
-        self.selected_date = selected_date
-        self.update_calendar()
-        if self.callback:
-            self.callback(selected_date)
+    def migrate(self):
+        """Apply pending migrations; returns the list of versions applied"""
+        applied = []
+        with self.db_pool.connection() as conn:
+            cursor = conn.cursor(buffered=True)
+            try:
+                # Serialise against other clients starting at the same time
+                cursor.execute("SELECT GET_LOCK(%s, 30)", (self.LOCK_NAME,))
+                if cursor.fetchone()[0] != 1:
+                    raise mysql.connector.errors.DatabaseError(
+                        "Timed out waiting for another client to finish migrating the schema"
+                    )
+                try:
+                    self._ensure_version_table(cursor)
+                    current = self._current_version(cursor)
+                    for version, description, statements in self.migrations:
+                        if version <= current:
+                            continue
+                        print(f"Applying schema migration {version}: {description}")
+                        self._apply(cursor, version, description, statements)
+                        applied.append(version)
+                    if applied:
+                        self.record_query_plans(cursor)
+                finally:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (self.LOCK_NAME,))
+                    cursor.fetchall()
+            finally:
+                cursor.close()
+        return applied
 
-    def get_date(self):
-        return self.selected_date
+    def explain(self, cursor, sql, params=()):
+        cursor.execute("EXPLAIN " + sql, params)
+        columns = cursor.column_names
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-    def set_date(self, new_date):
-        self.selected_date = new_date
-        self.update_calendar()
+    def record_query_plans(self, cursor):
+        """EXPLAIN each hot query and store the plan; returns names that still full-scan"""
+        full_scans = []
+        for name, (sql, params) in self.hot_queries.items():
+            plan = self.explain(cursor, sql, params)
+            full_scan = any(step.get('type') == 'ALL' for step in plan)
+            if full_scan:
+                full_scans.append(name)
+            summary = "; ".join(
+                f"{step.get('table')}: type={step.get('type')}, key={step.get('key')}, "
+                f"rows={step.get('rows')}, extra={step.get('Extra') or ''}"
+                for step in plan
+            )
+            cursor.execute("""
+                REPLACE INTO schema_query_plans (query_name, schema_version, full_scan, plan)
+                VALUES (%s, %s, %s, %s)
+            """, (name, self.latest_version, full_scan, summary))
+        if full_scans:
+            print(f"Full table scans in query plans: {', '.join(full_scans)}")
+        return full_scans
+
+    def query_plans(self):
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("""
+                SELECT query_name, full_scan, plan, recorded_at
+                FROM schema_query_plans
+                ORDER BY full_scan DESC, query_name
+            """)
+            return cursor.fetchall()
 
-    def bind_selection(self, callback):
-        self.callback = callback
 
 class ModernBloodBankSystem:
     def __init__(self):
@@ -238,19 +2939,24 @@ class ModernBloodBankSystem:
         self.configure_custom_styles()
         
         self.current_user = None
+        # Writes announce what changed; open screens update only affected widgets
+        self.events = ChangeEventBus()
         self.init_database()
-        self.setup_admin()
         
         # Create main container with modern padding
         self.main_container = ttk.Frame(self.root, style='Modern.TFrame')
         self.main_container.pack(fill=tk.BOTH, expand=True, padx=30, pady=30)
         
+        # Main screens are built once and swapped in and out
+        self.views = ViewManager(self.main_container, max_inactive=3)
+        
         # Initialize login screen
         self.show_login_screen()
         
     def show_simple_dashboard(self):
         try:
             # Clear main container
+            self.views.clear()
             for widget in self.main_container.winfo_children():
                 widget.destroy()
                 
@@ -374,107 +3080,169 @@ class ModernBloodBankSystem:
             print(f"Error configuring styles: {e}")
 
     def init_database(self):
+        self.startup_timings = {}
         try:
-            self.db = mysql.connector.connect(
-                host="localhost",
-                user="bloodbank_user",
-                password="Helbert@1",
-                database="blood_bank"
+            start = time.perf_counter()
+            # Every screen, dialog and background job checks out its own
+            # connection, so a slow query no longer stalls the other windows
+            self.db_pool = DatabasePool(
+                pool_size=5,
+                checkout_timeout=10,
+                health_check_interval=30,
+                **DB_CONFIG
             )
-            self.cursor = self.db.cursor(buffered=True)
+            self.startup_timings['connect_ms'] = (time.perf_counter() - start) * 1000
+            # Dashboard cards and charts share one BloodBank read
+            self.inventory = InventorySnapshot(self.db_pool)
+            # Screens hand slow queries to worker threads so the mainloop keeps running
+            self.query_executor = BackgroundQueryExecutor(self.root, self.db_pool, max_workers=4)
+            self.dashboard_stats = DashboardStats(self.db_pool)
+            self.analytics_rollups = AnalyticsRollups(self.db_pool)
+            self.analytics_snapshot = AnalyticsSnapshot()
+            # Forecast daily demand per blood group; cards turn it into days of supply
+            self.forecaster = DemandForecaster()
+            self.demand_forecast = {}
+            self.expiry_sweeper = ExpirySweeper(self.db_pool)
+            # Pending requests the current stock can fulfil, refreshed on changes
+            self.fulfilment_proposals = []
+            self.fulfilment_engine = FulfilmentEngine()
             self.create_tables()
+            self.schedule_stats_reconciliation()
+            self.schedule_demand_forecast()
+            self.schedule_expiry_sweep()
         except mysql.connector.Error as err:
             messagebox.showerror("Database Error", f"Failed to connect to database: {err}")
             self.root.quit()
 
     def create_tables(self):
-            tables = [
-                """CREATE TABLE IF NOT EXISTS BloodBank (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    blood_group VARCHAR(5) NOT NULL,
-                    units_available INT NOT NULL,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-                )""",
-                """CREATE TABLE IF NOT EXISTS Donors (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(100) NOT NULL,
-                    age INT NOT NULL,
-                    blood_group VARCHAR(5) NOT NULL,
-                    contact_info VARCHAR(100) NOT NULL,
-                    email VARCHAR(100),
-                    address TEXT,
-                    donation_date DATE NOT NULL,
-                    health_status TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )""",
-                """CREATE TABLE IF NOT EXISTS Requests (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    hospital_name VARCHAR(100) NOT NULL,
-                    blood_group VARCHAR(5) NOT NULL,
-                    units_requested INT NOT NULL,
-                    request_date DATE NOT NULL,
-                    priority ENUM('Normal', 'Urgent', 'Emergency') DEFAULT 'Normal',
-                    status ENUM('Pending', 'Approved', 'Rejected') DEFAULT 'Pending',
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )""",
-                """CREATE TABLE IF NOT EXISTS Users (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    username VARCHAR(50) UNIQUE NOT NULL,
-                    password VARCHAR(255) NOT NULL,
-                    role ENUM('admin', 'staff') NOT NULL,
-                    email VARCHAR(100),
-                    last_login TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )""",
-                """CREATE TABLE IF NOT EXISTS DonationSchedule (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    donor_id INT,
-                    scheduled_date DATE NOT NULL,
-                    time_slot VARCHAR(20) NOT NULL,
-                    status ENUM('Scheduled', 'Completed', 'Cancelled') DEFAULT 'Scheduled',
-                    notes TEXT,
-                    FOREIGN KEY (donor_id) REFERENCES Donors(id)
-                )""",
-                """CREATE TABLE IF NOT EXISTS Inventory_Alerts (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    blood_group VARCHAR(5) NOT NULL,
-                    alert_type ENUM('Low', 'Critical') NOT NULL,
-                    message TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )"""
-            ]
-            
-            for table in tables:
-                self.cursor.execute(table)
-            
-            # Initialize blood bank data if empty
-            self.cursor.execute("SELECT COUNT(*) FROM BloodBank")
-            if self.cursor.fetchone()[0] == 0:
-                self.cursor.execute("""
-                    INSERT INTO BloodBank (blood_group, units_available) VALUES 
-                    ('A+', 0), ('A-', 0), ('B+', 0), ('B-', 0),
-                    ('AB+', 0), ('AB-', 0), ('O+', 0), ('O-', 0)
-                """)
-            
-            self.db.commit()
+        # Schema lives in SCHEMA_MIGRATIONS. A single version probe decides
+        # whether the bootstrap (tables, seed rows, admin account) runs at all
+        self.schema_migrator = SchemaMigrator(self.db_pool)
         
-    def setup_admin(self):
-        try:
-            # Check if admin exists
-            self.cursor.execute("SELECT * FROM Users WHERE username = 'admin'")
-            if not self.cursor.fetchone():
-                hashed = bcrypt.hashpw('admin123'.encode('utf-8'), bcrypt.gensalt())
-                self.cursor.execute(
-                    "INSERT INTO Users (username, password, role, email) VALUES (%s, %s, %s, %s)",
-                    ('admin', hashed, 'admin', 'admin@bloodbank.com')
+        start = time.perf_counter()
+        self.schema_version = self.schema_migrator.probe_version()
+        self.startup_timings['probe_ms'] = (time.perf_counter() - start) * 1000
+        
+        if self.schema_version >= self.schema_migrator.latest_version:
+            self.startup_timings['bootstrap_ms'] = None
+        else:
+            start = time.perf_counter()
+            self.schema_migrator.migrate()
+            self.schema_version = self.schema_migrator.latest_version
+            self.startup_timings['bootstrap_ms'] = (time.perf_counter() - start) * 1000
+        
+        print(self.format_startup_timings())
+    
+    def schedule_stats_reconciliation(self, interval_ms=15 * 60 * 1000):
+        # Periodically rebuild the dashboard counters in case anything
+        # (manual SQL, another client version) changed the tables behind them
+        def reconciled(drift):
+            if drift:
+                print(f"Dashboard counters corrected: {drift}")
+        
+        def run():
+            self.query_executor.run_in_background(
+                self.dashboard_stats.reconcile_now,
+                reconciled,
+                lambda e: print(f"Stats reconciliation failed: {e}"),
+                key='stats_reconcile'
+            )
+            self.root.after(interval_ms, run)
+        
+        self.root.after(interval_ms, run)
+    
+    def schedule_demand_forecast(self, interval_ms=60 * 60 * 1000, history_days=180):
+        # Demand moves slowly, so an hourly refit is plenty
+        def fit():
+            today = date.today()
+            with self.db_pool.cursor() as cursor:
+                engine = AnalyticsEngine.load(cursor, today - timedelta(days=history_days), today - timedelta(days=1))
+            inventory = engine.inventory()
+            demand = self.forecaster.forecast(engine.daily_by_group('units_issued'), today)
+            forecast = dict(zip(AnalyticsEngine.BLOOD_GROUPS, demand))
+            
+            units = [inventory.get(group, 0) for group in AnalyticsEngine.BLOOD_GROUPS]
+            supply = dict(zip(AnalyticsEngine.BLOOD_GROUPS, DemandForecaster.days_of_supply(units, demand)))
+            self.record_shortage_alerts(supply)
+            return forecast
+        
+        def fitted(forecast):
+            self.demand_forecast = forecast
+            # Every card's status depends on the forecast
+            self.events.publish(ChangeEventBus.INVENTORY_CHANGED, blood_groups=None)
+        
+        def run():
+            self.query_executor.run_in_background(
+                fit,
+                fitted,
+                lambda e: print(f"Demand forecast failed: {e}"),
+                key='demand_forecast'
+            )
+            self.root.after(interval_ms, run)
+        
+        self.root.after(0, run)
+    
+    def schedule_expiry_sweep(self, interval_ms=60 * 60 * 1000):
+        # Cheap when nothing crossed a boundary, so it can run hourly; the
+        # watermark makes every day's crossings count once however often it runs
+        def swept(expired):
+            if expired:
+                print(f"Expired units: {expired}")
+                self.inventory.invalidate()
+                self.events.publish(ChangeEventBus.INVENTORY_CHANGED, blood_groups=list(expired))
+        
+        def run():
+            self.query_executor.run_in_background(
+                self.expiry_sweeper.sweep,
+                swept,
+                lambda e: print(f"Expiry sweep failed: {e}"),
+                key='expiry_sweep'
+            )
+            self.root.after(interval_ms, run)
+        
+        self.root.after(0, run)
+    
+    def record_shortage_alerts(self, supply):
+        """Write one Inventory_Alerts row per group and day for projected shortages"""
+        with self.db_pool.transaction() as cursor:
+            for blood_group, days in supply.items():
+                alert_type = self.forecaster.status(days)
+                if alert_type is None:
+                    continue
+                # Expiry alerts share the table; only a forecast alert counts as a duplicate
+                cursor.execute("""
+                    SELECT 1 FROM Inventory_Alerts
+                    WHERE blood_group = %s AND source = 'forecast' AND alert_type = %s
+                        AND created_at >= CURDATE()
+                    LIMIT 1
+                """, (blood_group, alert_type))
+                if cursor.fetchone():
+                    continue
+                cursor.execute(
+                    """INSERT INTO Inventory_Alerts (blood_group, alert_type, message, source)
+                    VALUES (%s, %s, %s, 'forecast')""",
+                    (blood_group, alert_type, f"Projected to run out in {days:.1f} days at forecast demand")
                 )
-            self.db.commit()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to setup admin: {e}")
-
+    
+    def days_of_supply(self, blood_type, units):
+        demand = self.demand_forecast.get(blood_type)
+        if demand is None:
+            return None
+        return float(DemandForecaster.days_of_supply([units], demand[None, :])[0])
+    
+    def format_startup_timings(self):
+        timings = self.startup_timings
+        bootstrap = timings.get('bootstrap_ms')
+        return (
+            f"Startup: connect {timings.get('connect_ms', 0):.1f} ms, "
+            f"schema probe {timings.get('probe_ms', 0):.1f} ms, "
+            + (f"bootstrap {bootstrap:.1f} ms" if bootstrap is not None
+               else f"bootstrap skipped (schema v{self.schema_version} current)")
+        )
+        
     def show_login_screen(self):
-        # Clear main container
+        # Clear main container; cached screens belong to the previous user
+        self.views.clear()
         for widget in self.main_container.winfo_children():
             widget.destroy()
         
@@ -656,25 +3424,26 @@ class ModernBloodBankSystem:
                 self.show_error("Please enter your password")
                 return
             
-            self.cursor.execute(
-                "SELECT password, role FROM Users WHERE username = %s",
-                (username,)
-            )
-            result = self.cursor.fetchone()
+            with self.db_pool.cursor() as cursor:
+                cursor.execute(
+                    "SELECT password, role FROM Users WHERE username = %s",
+                    (username,)
+                )
+                result = cursor.fetchone()
             
             if result and bcrypt.checkpw(password.encode('utf-8'), result[0].encode('utf-8')):
                 self.current_user = {'username': username, 'role': result[1]}
                 
                 # Try to update last_login, but continue if it fails
                 try:
-                    self.cursor.execute(
-                        "UPDATE Users SET last_login = CURRENT_TIMESTAMP WHERE username = %s",
-                        (username,)
-                    )
-                    self.db.commit()
+                    with self.db_pool.transaction() as cursor:
+                        cursor.execute(
+                            "UPDATE Users SET last_login = CURRENT_TIMESTAMP WHERE username = %s",
+                            (username,)
+                        )
                 except mysql.connector.Error:
                     # Silently continue if the last_login column doesn't exist
-                    self.db.rollback()
+                    pass
                     
                 self.show_dashboard()
             else:
@@ -689,57 +3458,68 @@ class ModernBloodBankSystem:
         
 
     def show_dashboard(self):
+        if not self.current_user:
+            self.show_login_screen()
+            return
+        
         try:
-            if not self.current_user:
-                self.show_login_screen()
-                return
-
-            print("Starting dashboard setup")  # Debug print
-            
-            # Clear all widgets from main container
-            for widget in self.main_container.winfo_children():
-                widget.destroy()
-            
-            print("Creating dashboard layout")  # Debug print
-            
-            # Create sidebar
-            sidebar = ttk.Frame(self.main_container, style='Card.TFrame')
-            sidebar.pack(side='left', fill='y', padx=(0, 20))
-            
-            # User profile section
-            print("Creating user profile")  # Debug print
-            self.create_user_profile(sidebar)
-            
-            # Navigation menu
-            print("Creating navigation menu")  # Debug print
-            self.create_navigation_menu(sidebar)
-            
-            # Main content area
-            print("Creating main content area")  # Debug print
-            content_frame = ttk.Frame(self.main_container, style='Modern.TFrame')
-            content_frame.pack(side='left', fill='both', expand=True)
-            
-            # Force update of UI
-            self.root.update_idletasks()
-            
-            # Dashboard header
-            print("Creating dashboard header")  # Debug print
-            self.create_dashboard_header(content_frame)
-            
-            # Quick stats
-            print("Creating quick stats")  # Debug print
-            self.create_quick_stats(content_frame)
-            
-            # Blood inventory
-            print("Showing blood inventory")  # Debug print
-            self.show_blood_inventory(content_frame)
-            
-            print("Dashboard setup complete")  # Debug print
-            
+            # Built once per login; later visits only refresh the data
+            self.views.show('dashboard', self.build_dashboard)
         except Exception as e:
             print(f"Error in dashboard: {e}")  # Debug print
             messagebox.showerror("Dashboard Error", f"Error setting up dashboard: {str(e)}")
             self.show_simple_dashboard()
+    
+    def build_dashboard(self, container):
+        print("Starting dashboard setup")  # Debug print
+        
+        print("Creating dashboard layout")  # Debug print
+        
+        # Create sidebar
+        sidebar = ttk.Frame(container, style='Card.TFrame')
+        sidebar.pack(side='left', fill='y', padx=(0, 20))
+        
+        # User profile section
+        print("Creating user profile")  # Debug print
+        self.create_user_profile(sidebar)
+        
+        # Navigation menu
+        print("Creating navigation menu")  # Debug print
+        self.create_navigation_menu(sidebar)
+        
+        # Main content area
+        print("Creating main content area")  # Debug print
+        content_frame = ttk.Frame(container, style='Modern.TFrame')
+        content_frame.pack(side='left', fill='both', expand=True)
+        
+        # Force update of UI
+        self.root.update_idletasks()
+        
+        # Dashboard header
+        print("Creating dashboard header")  # Debug print
+        self.create_dashboard_header(content_frame)
+        
+        # Quick stats
+        print("Creating quick stats")  # Debug print
+        refresh_stats = self.create_quick_stats(content_frame)
+        
+        # Blood inventory
+        print("Showing blood inventory")  # Debug print
+        refresh_cards = self.show_blood_inventory(content_frame)
+        
+        print("Dashboard setup complete")  # Debug print
+        
+        # Every write moves at least one quick-stat counter
+        for event_type in (ChangeEventBus.INVENTORY_CHANGED, ChangeEventBus.REQUEST_CHANGED,
+                           ChangeEventBus.DONOR_ADDED, ChangeEventBus.DONOR_DELETED,
+                           ChangeEventBus.DONATION_RECORDED):
+            self.events.subscribe(event_type, lambda **details: refresh_stats(), owner=content_frame)
+        
+        def refresh():
+            refresh_stats()
+            refresh_cards()
+        
+        return refresh
         
     def setup_dashboard_layout(self):
         # Create sidebar
@@ -866,27 +3646,16 @@ class ModernBloodBankSystem:
         stats_frame = ttk.Frame(parent, style='Modern.TFrame')
         stats_frame.pack(fill='x', pady=(0, 20))
         
-        # Enhanced stats query to get more dynamic data
-        self.cursor.execute("""
-            SELECT 
-                (SELECT COUNT(*) FROM Donors WHERE DATE(donation_date) = CURDATE()) as today_donations,
-                (SELECT COUNT(*) FROM Requests WHERE DATE(request_date) = CURDATE()) as today_requests,
-                (SELECT COUNT(*) FROM BloodBank WHERE units_available < 10) as low_inventory,
-                (SELECT COUNT(*) FROM Requests WHERE status = 'Pending') as pending_requests,
-                (SELECT SUM(units_available) FROM BloodBank) as total_blood_units,
-                (SELECT COUNT(*) FROM Donors) as total_donors
-        """)
-        stats = self.cursor.fetchone()
-        
-        # Create stat cards with dynamic data
+        # Create stat cards in a loading state; values arrive from the background query
         stat_cards = [
-            ("Today's Donations", stats[0], "💉", self.colors['success']),
-            ("Today's Requests", stats[1], "📝", self.colors['warning']),
-            ("Low Inventory Alert", stats[2], "⚠️", self.colors['error']),
-            ("Pending Requests", stats[3], "⏳", self.colors['accent'])
+            ("Today's Donations", "💉", self.colors['success']),
+            ("Today's Requests", "📝", self.colors['warning']),
+            ("Low Inventory Alert", "⚠️", self.colors['error']),
+            ("Pending Requests", "⏳", self.colors['accent'])
         ]
+        value_labels = []
         
-        for i, (label, value, icon, color) in enumerate(stat_cards):
+        for i, (label, icon, color) in enumerate(stat_cards):
             card = ttk.Frame(stats_frame, style='Card.TFrame')
             card.grid(row=0, column=i, padx=10, sticky='nsew')
             
@@ -900,13 +3669,15 @@ class ModernBloodBankSystem:
             ).pack(pady=(20, 5))
             
             # Value - Use tk.Label
-            tk.Label(
+            value_label = tk.Label(
                 card,
-                text=str(value),
+                text="…",
                 font=('Segoe UI', 36, 'bold'),
-                fg=self.colors['text'],
+                fg=self.colors['text_secondary'],
                 bg=self.colors['card_bg']
-            ).pack()
+            )
+            value_label.pack()
+            value_labels.append(value_label)
             
             # Label - Use tk.Label
             tk.Label(
@@ -919,6 +3690,69 @@ class ModernBloodBankSystem:
         
         # Configure grid weights
         stats_frame.grid_columnconfigure((0,1,2,3), weight=1)
+        
+        def show_stats(stats):
+            for value_label, value in zip(value_labels, stats):
+                value_label.configure(text=str(value), fg=self.colors['text'])
+        
+        def show_stats_error(error):
+            for value_label in value_labels:
+                value_label.configure(text="!", fg=self.colors['error'])
+            print(f"Failed to load quick stats: {error}")
+        
+        def refresh():
+            # Counters are maintained by the write paths, so this is a few key lookups
+            self.query_executor.submit(self.dashboard_stats.read, show_stats, show_stats_error, key='quick_stats')
+        
+        refresh()
+        return refresh
+
+    def create_header_stats(self, stats_frame, stat_items, query_fn, key):
+        """Header stat cards filled by query_fn(cursor) in the background; returns the refresh"""
+        value_labels = []
+        for i, (label, icon, *colors) in enumerate(stat_items):
+            card = ttk.Frame(stats_frame, style='Card.TFrame')
+            card.grid(row=0, column=i, padx=5, sticky='nsew')
+            
+            color = colors[0] if colors else self.colors['text']
+            
+            # Use tk.Label
+            value_label = tk.Label(
+                card,
+                text=f"{icon} …",
+                font=('Segoe UI', 20, 'bold'),
+                fg=color,
+                bg=self.colors['card_bg']
+            )
+            value_label.pack(pady=(10, 5))
+            value_labels.append((value_label, icon))
+            
+            # Use tk.Label
+            tk.Label(
+                card,
+                text=label,
+                font=('Segoe UI', 10),
+                fg=self.colors['text_secondary'],
+                bg=self.colors['card_bg']
+            ).pack(pady=(0, 10))
+        
+        stats_frame.grid_columnconfigure(tuple(range(len(stat_items))), weight=1)
+        
+        def show_stats(stats):
+            for (value_label, icon), value in zip(value_labels, stats):
+                # SUM over no rows is NULL
+                value_label.configure(text=f"{icon} {value or 0}")
+        
+        def refresh():
+            self.query_executor.submit(
+                query_fn,
+                show_stats,
+                lambda e: print(f"Failed to load header stats: {e}"),
+                key=key
+            )
+        
+        refresh()
+        return refresh
 
     def create_tooltip(self, widget, text):
         def show_tooltip(event):
@@ -946,6 +3780,86 @@ class ModernBloodBankSystem:
             
         widget.bind('<Enter>', show_tooltip)
 
+    def create_pager_controls(self, parent, pager, refresh):
+        # Previous/next buttons, row range label and page size picker for a KeysetPager
+        bar = ttk.Frame(parent, style='Modern.TFrame')
+        bar.pack(side='bottom', fill='x', pady=(10, 0))
+        
+        prev_button = ttk.Button(
+            bar,
+            text="◀ Previous",
+            style='Secondary.TButton',
+            command=lambda: pager.previous_page() and refresh()
+        )
+        prev_button.pack(side='left', padx=5)
+        
+        next_button = ttk.Button(
+            bar,
+            text="Next ▶",
+            style='Secondary.TButton',
+            command=lambda: pager.next_page() and refresh()
+        )
+        next_button.pack(side='left', padx=5)
+        
+        # Use tk.Label
+        status_label = tk.Label(
+            bar,
+            text="",
+            font=('Segoe UI', 11),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text_secondary']
+        )
+        status_label.pack(side='left', padx=15)
+        
+        page_size_var = tk.StringVar(value=str(pager.page_size))
+        size_combo = ttk.Combobox(
+            bar,
+            textvariable=page_size_var,
+            values=[str(size) for size in KeysetPager.PAGE_SIZES],
+            state='readonly',
+            width=6
+        )
+        size_combo.pack(side='right', padx=5)
+        
+        def change_page_size(event=None):
+            pager.set_page_size(int(page_size_var.get()))
+            refresh()
+        
+        size_combo.bind('<<ComboboxSelected>>', change_page_size)
+        
+        # Use tk.Label
+        tk.Label(
+            bar,
+            text="Rows per page:",
+            font=('Segoe UI', 11),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text_secondary']
+        ).pack(side='right', padx=5)
+        
+        def update_controls():
+            try:
+                status_label.configure(text=pager.describe())
+                prev_button.state(['!disabled'] if pager.page > 0 else ['disabled'])
+                next_button.state(['!disabled'] if pager.has_next else ['disabled'])
+            except tk.TclError:
+                # Controls destroyed while a page was loading
+                pager.on_update = None
+        
+        pager.on_update = update_controls
+        update_controls()
+        return bar
+
+    def show_tree_loading(self, tree):
+        # Replace the rows with a single placeholder while a background query runs
+        values = [''] * len(tree['columns'])
+        values[min(1, len(values) - 1)] = "⏳ Loading..."
+        tree.tag_configure('loading', foreground=self.colors['text_secondary'])
+        if isinstance(tree, VirtualTreeview):
+            tree.set_rows([(None, values, ('loading',))])
+        else:
+            tree.delete(*tree.get_children())
+            tree.insert('', 'end', values=values, tags=('loading',))
+
     def show_blood_inventory(self, parent):
         inventory_frame = ttk.Frame(parent, style='Modern.TFrame')
         inventory_frame.pack(fill='both', expand=True)
@@ -978,16 +3892,50 @@ class ModernBloodBankSystem:
         
         # Grid layout for blood type cards
         blood_types = ['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-']
+        cards = {}
         
         for i, blood_type in enumerate(blood_types):
-            self.create_blood_type_card(blood_types_frame, blood_type, i)
+            cards[blood_type] = self.create_blood_type_card(blood_types_frame, blood_type, i, 0)
+            # Placeholder until the snapshot arrives from the worker
+            units_label, status_label, _ = cards[blood_type]
+            units_label.configure(text="…")
+            status_label.configure(text="Loading…", bg=self.colors['card_bg'])
         
         # Configure grid weights
         for i in range(4):
             blood_types_frame.grid_columnconfigure(i, weight=1)
         for i in range(2):
             blood_types_frame.grid_rowconfigure(i, weight=1)
-            
+        
+        # Groups whose cards are waiting on the next snapshot; a newer load
+        # supersedes an older one, so the groups accumulate until one lands
+        pending = set()
+        
+        def render(inventory):
+            if not blood_types_frame.winfo_exists():
+                return
+            for blood_type in pending & set(cards):
+                self.update_blood_type_card(cards[blood_type], inventory.get(blood_type, 0))
+            pending.clear()
+        
+        def load(blood_groups=None):
+            # The snapshot may probe or reload BloodBank, so fetch it off the Tk thread
+            pending.update(blood_groups or cards)
+            self.query_executor.run_in_background(
+                self.inventory.get,
+                render,
+                lambda e: messagebox.showerror("Error", f"Failed to load inventory: {str(e)}"),
+                key='inventory_cards'
+            )
+        
+        def on_inventory_changed(blood_groups=None, **details):
+            # Only the cards for the groups that moved are touched
+            load(blood_groups)
+        
+        self.events.subscribe(ChangeEventBus.INVENTORY_CHANGED, on_inventory_changed, owner=blood_types_frame)
+        load()
+        
+        return load
             
     def show_donation_history(self):
         # Create a top-level window for donation history
@@ -1076,7 +4024,7 @@ class ModernBloodBankSystem:
             filter_frame,
             text="Apply Filter",
             style='Modern.TButton',
-            command=lambda: self.refresh_donation_history(tree, date_range_var.get(), blood_group_var.get())
+            command=lambda: refresh()
         ).pack(side='left', padx=10)
         
         # Export button
@@ -1084,7 +4032,7 @@ class ModernBloodBankSystem:
             filter_frame,
             text="Export to CSV",
             style='Modern.TButton',
-            command=lambda: self.export_donation_history(tree, date_range_var.get(), blood_group_var.get())
+            command=lambda: self.export_donation_history(history_window, date_range_var.get(), blood_group_var.get())
         ).pack(side='right', padx=10)
         
         # Stats frame
@@ -1093,7 +4041,7 @@ class ModernBloodBankSystem:
         
         # Create a treeview to display donation history
         columns = ('id', 'donor', 'blood_group', 'date', 'units', 'status', 'time_slot', 'notes')
-        tree = ttk.Treeview(main_frame, columns=columns, show='headings')
+        tree = VirtualTreeview(main_frame, columns=columns, show='headings')
         
         # Define column headings
         tree.heading('id', text='ID')
@@ -1119,22 +4067,28 @@ class ModernBloodBankSystem:
         scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
         tree.configure(yscrollcommand=scrollbar.set)
         
+        # Page navigation below the list
+        pager = KeysetPager()
+        
+        def refresh():
+            self.refresh_donation_history(tree, date_range_var.get(), blood_group_var.get(), pager)
+        
+        self.create_pager_controls(main_frame, pager, refresh)
+        
         # Pack the tree and scrollbar
         tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
         
         # Initial load of data
-        self.refresh_donation_history(tree, "All Time", "All")
+        refresh()
         
         # Bind double-click event to show donation details
-        tree.bind('<Double-1>', lambda e: self.show_donation_details(tree))
+        # The loading placeholder has no key, so double-clicking it does nothing
+        tree.bind('<Double-1>', lambda e: self.show_donation_details(tree) if tree.event_key(e) is not None else None)
         
         
-    def refresh_donation_history(self, tree, date_range, blood_group):
-        # Clear existing data
-        for item in tree.get_children():
-            tree.delete(item)
-        
+    def donation_history_query(self, date_range, blood_group):
+        """(query, count_query, params) for completed donations matching the filters"""
         # Prepare date filter
         today = date.today()
         date_clause = ""
@@ -1156,31 +4110,66 @@ class ModernBloodBankSystem:
             blood_clause = "AND d.blood_group = %s"
             date_params.append(blood_group)
         
-        # Fetch donation history from database
-        try:
-            query = f"""
-                SELECT ds.id, d.name, d.blood_group, d.donation_date, 
-                    ds.status, ds.time_slot, ds.notes
-                FROM Donors d
-                JOIN DonationSchedule ds ON d.id = ds.donor_id
-                WHERE ds.status = 'Completed' {date_clause} {blood_clause}
-                ORDER BY d.donation_date DESC
-            """
-            
-            self.cursor.execute(query, date_params)
-            
-            for row in self.cursor.fetchall():
-                # Format date
-                date_str = row[3].strftime("%Y-%m-%d")
-                # Default units to 1
-                units = 1
-                time_slot = row[5] if row[5] else "N/A"
-                notes = row[6] if row[6] else ""
-                
-                tree.insert('', 'end', values=(row[0], row[1], row[2], date_str, units, row[4], time_slot, notes))
-                    
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load donation history: {str(e)}")
+        # Fetch donation history from database, one keyset page at a time
+        query = f"""
+            SELECT ds.id, d.name, d.blood_group, d.donation_date, 
+                ds.status, ds.time_slot, ds.notes, d.donation_date
+            FROM Donors d
+            JOIN DonationSchedule ds ON d.id = ds.donor_id
+            WHERE ds.status = 'Completed' {date_clause} {blood_clause}
+        """
+        count_query = f"""
+            SELECT COUNT(*)
+            FROM Donors d
+            JOIN DonationSchedule ds ON d.id = ds.donor_id
+            WHERE ds.status = 'Completed' {date_clause} {blood_clause}
+        """
+        return query, count_query, date_params
+
+    @staticmethod
+    def format_history_row(row):
+        # Units default to 1
+        return (row[0], row[1], row[2], row[3].strftime("%Y-%m-%d"), 1, row[4], row[5] or "N/A", row[6] or "")
+
+    def refresh_donation_history(self, tree, date_range, blood_group, pager):
+        query, count_query, date_params = self.donation_history_query(date_range, blood_group)
+        
+        pager.sync((date_range, blood_group))
+        page_query, page_params = pager.page_query(query, date_params, "d.donation_date", "ds.id")
+        
+        def fetch_history(cursor):
+            cursor.execute(page_query, page_params)
+            return cursor.fetchall()
+        
+        def count_history(cursor):
+            cursor.execute(count_query, date_params)
+            return cursor.fetchone()[0]
+        
+        def populate(rows):
+            tree.set_rows([(row[0], self.format_history_row(row), ()) for row in rows])
+        
+        # Each history window loads independently of any other open one
+        key = f'donation_history_{tree}'
+        
+        def loaded(rows):
+            rows = pager.receive(rows)
+            if not pager.is_complete and (pager.total is None or pager.page == 0):
+                self.query_executor.submit(
+                    count_history,
+                    pager.set_total,
+                    lambda e: print(f"Failed to count donation history: {e}"),
+                    key=key + '_count'
+                )
+            populate(rows)
+        
+        if not pager.is_reload:
+            self.show_tree_loading(tree)
+        self.query_executor.submit(
+            fetch_history,
+            loaded,
+            lambda e: messagebox.showerror("Error", f"Failed to load donation history: {str(e)}"),
+            key=key
+        )
         
     def show_donation_details(self, tree):
         try:
@@ -1218,15 +4207,15 @@ class ModernBloodBankSystem:
             details_frame.pack(fill='x', pady=20)
             
             # Query additional details
-            self.cursor.execute("""
-                SELECT d.id, d.name, d.blood_group, d.age, d.contact_info, d.email,
-                    d.address, d.donation_date, ds.time_slot, ds.status, ds.notes
-                FROM Donors d
-                JOIN DonationSchedule ds ON d.id = ds.donor_id
-                WHERE ds.id = %s
-            """, (donation_id,))
-            
-            row = self.cursor.fetchone()
+            with self.db_pool.cursor() as cursor:
+                cursor.execute("""
+                    SELECT d.id, d.name, d.blood_group, d.age, d.contact_info, d.email,
+                        d.address, d.donation_date, ds.time_slot, ds.status, ds.notes
+                    FROM Donors d
+                    JOIN DonationSchedule ds ON d.id = ds.donor_id
+                    WHERE ds.id = %s
+                """, (donation_id,))
+                row = cursor.fetchone()
             if row:
                 # Display all details
                 details = [
@@ -1280,33 +4269,52 @@ class ModernBloodBankSystem:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to show donation details: {str(e)}")
     
-    def export_donation_history(self, tree, date_range, blood_group):
-        try:
-            # Create reports directory if it doesn't exist
-            reports_dir = "reports"
-            if not os.path.exists(reports_dir):
-                os.makedirs(reports_dir)
-            
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(reports_dir, f"donation_history_{timestamp}.csv")
-            
-            with open(filename, 'w', newline='') as file:
-                file.write("ID,Donor Name,Blood Group,Donation Date,Units,Status,Time Slot,Notes\n")
-                
-                for item_id in tree.get_children():
-                    values = tree.item(item_id, 'values')
-                    # Escape quotes in values
-                    escaped_values = [f'"{str(v).replace(chr(34), chr(34)+chr(34))}"' for v in values]
-                    file.write(','.join(escaped_values) + '\n')
-            
+    def write_csv_export(self, filename, header, rows):
+        """Write rows to filename under reports/, streaming; returns the path"""
+        # Create reports directory if it doesn't exist
+        reports_dir = "reports"
+        if not os.path.exists(reports_dir):
+            os.makedirs(reports_dir)
+        
+        path = os.path.join(reports_dir, filename)
+        with open(path, 'w', newline='') as file:
+            file.write(header + "\n")
+            for values in rows:
+                # Escape quotes in values
+                escaped_values = [f'"{str(v).replace(chr(34), chr(34)+chr(34))}"' for v in values]
+                file.write(','.join(escaped_values) + '\n')
+        return path
+
+    def export_donation_history(self, window, date_range, blood_group):
+        # Export the whole filtered history, not just the page on screen
+        query, _, params = self.donation_history_query(date_range, blood_group)
+        full_query, full_params = KeysetPager.full_query(query, params, "d.donation_date", "ds.id")
+        
+        # Generate filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        def export():
+            # Unbuffered, so rows go to the file as they arrive instead of
+            # the whole result being held in memory first
+            with self.db_pool.stream_cursor() as cursor:
+                cursor.execute(full_query, full_params)
+                return self.write_csv_export(
+                    f"donation_history_{timestamp}.csv",
+                    "ID,Donor Name,Blood Group,Donation Date,Units,Status,Time Slot,Notes",
+                    (self.format_history_row(row) for row in cursor)
+                )
+        
+        def exported(filename):
             # Open the file
             os.startfile(filename) if os.name == 'nt' else os.system(f'xdg-open "{filename}"')
-            
             messagebox.showinfo("Export Successful", f"Donation history exported to {filename}")
         
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export donation history: {str(e)}")
+        self.query_executor.run_in_background(
+            export,
+            exported,
+            lambda e: messagebox.showerror("Export Error", f"Failed to export donation history: {str(e)}"),
+            key=f'donation_history_export_{window}'
+        )
         
     def show_request_form(self, blood_type=None):
         request_window = tk.Toplevel(self.root)
@@ -1496,36 +4504,33 @@ class ModernBloodBankSystem:
                 raise ValueError("Please enter a valid number of units")
             
             # Insert request into database
-            self.cursor.execute("""
-                INSERT INTO Requests (
-                    hospital_name, blood_group, units_requested,
-                    request_date, priority, notes
-                ) VALUES (%s, %s, %s, CURDATE(), %s, %s)
-            """, (hospital, blood_type, units, priority, notes))
-            
-            self.db.commit()
+            with self.db_pool.transaction() as cursor:
+                cursor.execute("""
+                    INSERT INTO Requests (
+                        hospital_name, blood_group, units_requested,
+                        request_date, priority, notes
+                    ) VALUES (%s, %s, %s, CURDATE(), %s, %s)
+                """, (hospital, blood_type, units, priority, notes))
+                request_id = cursor.lastrowid
+                
+                self.dashboard_stats.add_day(cursor, None, requests=1)
+                self.dashboard_stats.add(cursor, 'pending_requests', 1)
+                self.analytics_rollups.move_request(
+                    cursor, after=(None, 'Pending', priority or 'Normal', blood_type, units)
+                )
+            
             messagebox.showinfo("Success", "Blood request submitted successfully!")
             window.destroy()
             
-            # Refresh blood requests view if currently displayed
-            if hasattr(self, 'request_tree'):
-                self.refresh_requests()
+            self.events.publish(ChangeEventBus.REQUEST_CHANGED, request_id=request_id)
         
         except Exception as e:
-            self.db.rollback()
             messagebox.showerror("Error", str(e))
               
-    def create_blood_type_card(self, parent, blood_type, index):
+    def create_blood_type_card(self, parent, blood_type, index, units):
         card = ttk.Frame(parent, style='Card.TFrame')
         card.grid(row=index//4, column=index%4, padx=10, pady=10, sticky='nsew')
         
-        # Get inventory data - Using a fresh query for each card
-        self.cursor.execute(
-            "SELECT units_available FROM BloodBank WHERE blood_group = %s",
-            (blood_type,)
-        )
-        units = self.cursor.fetchone()[0]
-        
         # Blood type label - Use tk.Label
         tk.Label(
             card,
@@ -1536,13 +4541,14 @@ class ModernBloodBankSystem:
         ).pack(pady=(20, 10))
         
         # Units display - Use tk.Label
-        tk.Label(
+        units_label = tk.Label(
             card,
             text=str(units),
             font=('Segoe UI', 36, 'bold'),
             fg=self.colors['text'],
             bg=self.colors['card_bg']
-        ).pack()
+        )
+        units_label.pack()
         
         # Use tk.Label
         tk.Label(
@@ -1557,11 +4563,12 @@ class ModernBloodBankSystem:
         status_frame = ttk.Frame(card, style='Card.TFrame')
         status_frame.pack(pady=(0, 20))
         
-        status_color = self.get_status_color(units)
-        status_text = self.get_status_text(units)
+        days = self.days_of_supply(blood_type, units)
+        status_color = self.get_status_color(units, days)
+        status_text = self.get_status_text(units, days)
         
         # Use tk.Label
-        tk.Label(
+        status_label = tk.Label(
             status_frame,
             text=status_text,
             bg=status_color,
@@ -1569,7 +4576,8 @@ class ModernBloodBankSystem:
             font=('Segoe UI', 10),
             padx=10,
             pady=5
-        ).pack()
+        )
+        status_label.pack()
         
         # Action buttons
         button_frame = ttk.Frame(card, style='Card.TFrame')
@@ -1588,8 +4596,24 @@ class ModernBloodBankSystem:
             style='Modern.TButton',
             command=lambda bt=blood_type: self.show_request_form(bt)
         ).pack(side='left', padx=5)
+        
+        return units_label, status_label, blood_type
+    
+    def update_blood_type_card(self, card, units):
+        units_label, status_label, blood_type = card
+        days = self.days_of_supply(blood_type, units)
+        units_label.configure(text=str(units))
+        status_label.configure(text=self.get_status_text(units, days), bg=self.get_status_color(units, days))
 
-    def get_status_color(self, units):
+    def get_status_color(self, units, days_of_supply=None):
+        # Forecast days of supply when available, fixed unit thresholds otherwise
+        if days_of_supply is not None:
+            status = self.forecaster.status(days_of_supply)
+            if status == 'Critical':
+                return self.colors['error']
+            elif status == 'Low':
+                return self.colors['warning']
+            return self.colors['success']
         if units < 5:
             return self.colors['error']
         elif units < 10:
@@ -1597,7 +4621,15 @@ class ModernBloodBankSystem:
         else:
             return self.colors['success']
 
-    def get_status_text(self, units):
+    def get_status_text(self, units, days_of_supply=None):
+        if days_of_supply is not None:
+            status = self.forecaster.status(days_of_supply)
+            supply = f"{days_of_supply:.1f} days" if days_of_supply < 100 else "100+ days"
+            if status == 'Critical':
+                return f"⚠️ Critical · {supply}"
+            elif status == 'Low':
+                return f"⚠️ Low · {supply}"
+            return f"✅ {supply}"
         if units < 5:
             return "⚠️ Critical"
         elif units < 10:
@@ -1606,12 +4638,13 @@ class ModernBloodBankSystem:
             return "✅ Sufficient"
 
     def refresh_inventory(self):
-            # Clear main container
-            for widget in self.main_container.winfo_children():
-                widget.destroy()
-            
+            # Explicit refresh always re-reads the inventory
+            self.inventory.invalidate()
+            self.views.show('inventory', self.build_inventory_view)
+    
+    def build_inventory_view(self, container):
             # Create frame for the blood inventory
-            content_frame = ttk.Frame(self.main_container, style='Modern.TFrame')
+            content_frame = ttk.Frame(container, style='Modern.TFrame')
             content_frame.pack(fill='both', expand=True)
             
             # Add back button at the top
@@ -1626,7 +4659,7 @@ class ModernBloodBankSystem:
             ).pack(side='left', pady=5, padx=5)
             
             # Show the blood inventory
-            self.show_blood_inventory(content_frame)
+            return self.show_blood_inventory(content_frame)
         
     def show_donor_registration(self):
         registration_window = tk.Toplevel(self.root)
@@ -1698,10 +4731,10 @@ class ModernBloodBankSystem:
         ).pack(side='right', padx=5)
 
     def show_donors_list(self):
-        for widget in self.main_container.winfo_children():
-            widget.destroy()
-                
-        main_frame = ttk.Frame(self.main_container, style='Modern.TFrame')
+        self.views.show('donors', self.build_donors_list, self.refresh_donors_list)
+    
+    def build_donors_list(self, container):
+        main_frame = ttk.Frame(container, style='Modern.TFrame')
         main_frame.pack(fill='both', expand=True)
         
         # Header with stats
@@ -1734,51 +4767,37 @@ class ModernBloodBankSystem:
             command=self.show_donor_registration
         ).pack(side='right')
         
-        # Quick stats
-        self.cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                COUNT(DISTINCT blood_group) as blood_types,
-                (SELECT COUNT(*) FROM Donors WHERE DATE(donation_date) = CURDATE()) as today,
-                (SELECT COUNT(*) FROM Donors WHERE donation_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)) as last_30_days
-        """)
-        stats = self.cursor.fetchone()
+        # Bulk entry of paper records after a blood drive
+        ttk.Button(
+            header_frame,
+            text="📥 Import CSV",
+            style='Secondary.TButton',
+            command=self.show_donor_import
+        ).pack(side='right', padx=(0, 10))
+        
+        # Quick stats, re-read on every visit and after donor changes
+        def donor_stats(cursor):
+            cursor.execute("""
+                SELECT 
+                    COUNT(*) as total,
+                    COUNT(DISTINCT blood_group) as blood_types,
+                    (SELECT COUNT(*) FROM Donors WHERE donation_date = CURDATE()) as today,
+                    (SELECT COUNT(*) FROM Donors WHERE donation_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)) as last_30_days
+                FROM Donors
+            """)
+            return cursor.fetchone()
         
         stats_frame = ttk.Frame(main_frame, style='Modern.TFrame')
         stats_frame.pack(fill='x', pady=(0, 20))
-        
-        stat_items = [
-            ("Total Donors", stats[0], "👥"),
-            ("Blood Types", stats[1], "🩸"),
-            ("Today's Donors", stats[2], "📅", self.colors['success']),
-            ("Last 30 Days", stats[3], "📊", self.colors['accent'])
-        ]
-        
-        for i, (label, value, icon, *colors) in enumerate(stat_items):
-            card = ttk.Frame(stats_frame, style='Card.TFrame')
-            card.grid(row=0, column=i, padx=5, sticky='nsew')
-            
-            color = colors[0] if colors else self.colors['text']
-            
-            # Use tk.Label
-            tk.Label(
-                card,
-                text=f"{icon} {value}",
-                font=('Segoe UI', 20, 'bold'),
-                fg=color,
-                bg=self.colors['card_bg']
-            ).pack(pady=(10, 5))
-            
-            # Use tk.Label
-            tk.Label(
-                card,
-                text=label,
-                font=('Segoe UI', 10),
-                fg=self.colors['text_secondary'],
-                bg=self.colors['card_bg']
-            ).pack(pady=(0, 10))
-        
-        stats_frame.grid_columnconfigure((0,1,2,3), weight=1)
+        refresh_stats = self.create_header_stats(stats_frame, [
+            ("Total Donors", "👥"),
+            ("Blood Types", "🩸"),
+            ("Today's Donors", "📅", self.colors['success']),
+            ("Last 30 Days", "📊", self.colors['accent'])
+        ], donor_stats, 'donor_stats')
+        for event_type in (ChangeEventBus.DONOR_ADDED, ChangeEventBus.DONOR_CHANGED,
+                           ChangeEventBus.DONOR_DELETED, ChangeEventBus.DONATION_RECORDED):
+            self.events.subscribe(event_type, lambda **details: refresh_stats(), owner=stats_frame)
         
         # Filters and search
         filter_frame = self.create_donor_filters(main_frame)
@@ -1786,6 +4805,12 @@ class ModernBloodBankSystem:
         
         # Donors list - create in a separate function
         self.create_donors_list(main_frame)
+        
+        def refresh():
+            refresh_stats()
+            self.refresh_donors_list()
+        
+        return refresh
 
     def create_donor_filters(self, parent):
         filter_frame = ttk.Frame(parent, style='Card.TFrame')
@@ -1849,7 +4874,10 @@ class ModernBloodBankSystem:
         search_frame.pack(side='right', padx=20, pady=10)
         
         self.donor_search_var = tk.StringVar()
-        self.donor_search_var.trace('w', lambda *args: self.refresh_donors_list())
+        self.donor_search = DebouncedSearch(self.root)
+        self.donor_search_var.trace(
+            'w', lambda *args: self.donor_search.schedule(lambda: self.refresh_donors_list(narrow=True))
+        )
         
         search_entry = ttk.Entry(
             search_frame,
@@ -1881,7 +4909,7 @@ class ModernBloodBankSystem:
             'email', 'donation_date', 'health_status'
         )
         
-        self.donors_tree = ttk.Treeview(
+        self.donors_tree = VirtualTreeview(
             list_container,
             columns=columns,
             show='headings',
@@ -1920,13 +4948,24 @@ class ModernBloodBankSystem:
         )
         self.donors_tree.configure(xscrollcommand=x_scrollbar.set)
         
+        # Keyset paging controls under the list
+        self.donors_pager = KeysetPager()
+        self.create_pager_controls(list_container, self.donors_pager, self.refresh_donors_list)
+        
         # Pack elements
         y_scrollbar.pack(side='right', fill='y')
         x_scrollbar.pack(side='bottom', fill='x')
         self.donors_tree.pack(side='left', fill='both', expand=True)
         
         # Bind double-click event
-        self.donors_tree.bind('<Double-1>', self.show_donor_details)
+        self.donors_tree.bind(
+            '<Double-1>',
+            lambda e: self.show_donor_details(e) if self.donors_tree.event_key(e) is not None else None
+        )
+        
+        for event_type in (ChangeEventBus.DONOR_ADDED, ChangeEventBus.DONOR_CHANGED,
+                           ChangeEventBus.DONOR_DELETED, ChangeEventBus.DONATION_RECORDED):
+            self.events.subscribe(event_type, lambda **details: self.refresh_donors_list(), owner=self.donors_tree)
         
         # Bottom action buttons
         action_frame = ttk.Frame(parent, style='Modern.TFrame')
@@ -1949,44 +4988,42 @@ class ModernBloodBankSystem:
         # Initial load
         self.refresh_donors_list()
 
-    def refresh_donors_list(self):
-        # Clear existing data
-        for item in self.donors_tree.get_children():
-            self.donors_tree.delete(item)
-        
+    def donors_list_query(self):
+        """(query, count_query, params, sort_expr, sort_params) for the donor filters on screen"""
         # Get filter values
         blood_filter = self.donor_blood_var.get()
         date_filter = self.donor_date_var.get()
         search_term = self.donor_search_var.get().strip()
         
-        # Build query
-        query = """
-            SELECT id, name, age, blood_group, contact_info, 
-                email, donation_date, health_status
-            FROM Donors
-            WHERE 1=1
-        """
-        
+        # Build filter clauses
+        where = ""
         params = []
         
         # Apply blood group filter
         if blood_filter != 'All':
-            query += " AND blood_group = %s"
+            where += " AND blood_group = %s"
             params.append(blood_filter)
         
         # Apply date filter
         if date_filter == 'Today':
-            query += " AND DATE(donation_date) = CURDATE()"
+            where += " AND donation_date = CURDATE()"
         elif date_filter == 'Last 7 Days':
-            query += " AND donation_date >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)"
+            where += " AND donation_date >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)"
         elif date_filter == 'Last 30 Days':
-            query += " AND donation_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)"
+            where += " AND donation_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)"
         elif date_filter == 'Last Year':
-            query += " AND donation_date >= DATE_SUB(CURDATE(), INTERVAL 1 YEAR)"
-        
-        # Apply search filter
-        if search_term:
-            query += """ AND (
+            where += " AND donation_date >= DATE_SUB(CURDATE(), INTERVAL 1 YEAR)"
+        
+        # Apply search filter through the full-text index, best matches first
+        phrase = fulltext_phrase(search_term)
+        sort_expr, sort_params = "donation_date", []
+        if phrase:
+            match = "MATCH(name, contact_info, email, health_status) AGAINST (%s IN BOOLEAN MODE)"
+            where += f" AND {match}"
+            params.append(phrase)
+            sort_expr, sort_params = match, [phrase]
+        elif search_term:
+            where += """ AND (
                 name LIKE %s OR
                 contact_info LIKE %s OR
                 email LIKE %s OR
@@ -1995,22 +5032,84 @@ class ModernBloodBankSystem:
             search_pattern = f"%{search_term}%"
             params.extend([search_pattern, search_pattern, search_pattern, search_pattern])
         
-        # Add ordering
-        query += " ORDER BY donation_date DESC"
+        # The sort key is selected last so the pager can seek past it
+        query = f"""
+            SELECT id, name, age, blood_group, contact_info, 
+                email, donation_date, health_status, {sort_expr}
+            FROM Donors
+            WHERE 1=1 {where}
+        """
+        count_query = f"SELECT COUNT(*) FROM Donors WHERE 1=1 {where}"
+        return query, count_query, params, sort_expr, sort_params
+
+    @staticmethod
+    def format_donor_row(donor):
+        # Format date for display
+        donor_values = list(donor[:8])
+        donor_values[6] = donor[6].strftime("%Y-%m-%d") if donor[6] else "Never"
+        return donor_values
+
+    def refresh_donors_list(self, narrow=False):
+        blood_filter = self.donor_blood_var.get()
+        date_filter = self.donor_date_var.get()
+        search_term = self.donor_search_var.get().strip()
+        query, count_query, params, sort_expr, sort_params = self.donors_list_query()
+        
+        pager = self.donors_pager
+        filters = (blood_filter, date_filter)
+        pager.sync(filters + (search_term,))
+        page_query, page_params = pager.page_query(query, sort_params + params, sort_expr, "id", sort_params)
+        
+        def fetch_donors(cursor):
+            cursor.execute(page_query, page_params)
+            return cursor.fetchall()
         
-        # Execute query
-        self.cursor.execute(query, params)
+        def count_donors(cursor):
+            cursor.execute(count_query, params)
+            return cursor.fetchone()[0]
         
-        # Populate treeview
-        for donor in self.cursor.fetchall():
-            # Format date for display
-            donor_values = list(donor)
-            if donor[6]:  # donation_date
-                donor_values[6] = donor[6].strftime("%Y-%m-%d")
+        def populate(donors):
+            self.donors_tree.set_rows([(donor[0], self.format_donor_row(donor), ()) for donor in donors])
+        
+        def loaded(rows):
+            donors = pager.receive(rows)
+            # Only a complete result can be narrowed locally
+            if pager.is_complete:
+                self.donor_search.store(filters, search_term, donors)
             else:
-                donor_values[6] = "Never"
-                
-            self.donors_tree.insert('', 'end', values=donor_values)
+                self.donor_search.invalidate()
+                # Count in the background; the label shows "…" until it arrives
+                if pager.total is None or pager.page == 0:
+                    self.query_executor.submit(
+                        count_donors,
+                        pager.set_total,
+                        lambda e: print(f"Failed to count donors: {e}"),
+                        key='donors_count'
+                    )
+            populate(donors)
+        
+        # Search-box edits that only extend the term are answered from the last result
+        if narrow:
+            donors = self.donor_search.narrow(
+                filters, search_term,
+                lambda row, term: any(term in str(row[i] or '').lower() for i in (1, 4, 5, 7))
+            )
+            if donors is not None:
+                self.query_executor.cancel('donors_list')
+                populate(pager.receive(donors))
+                return
+        
+        # Execute query off the Tk thread; a newer refresh supersedes this one.
+        # Re-reading the page on screen keeps the rows up so the diff can
+        # leave selection and scroll position alone
+        if not pager.is_reload:
+            self.show_tree_loading(self.donors_tree)
+        self.query_executor.submit(
+            fetch_donors,
+            loaded,
+            lambda e: messagebox.showerror("Error", f"Failed to load donors: {str(e)}"),
+            key='donors_list'
+        )
 
     def show_donor_details(self, event):
         try:
@@ -2065,14 +5164,14 @@ class ModernBloodBankSystem:
             ).pack(fill='x')
             
             # Get donor's full details and donation history
-            self.cursor.execute("""
-                SELECT d.*, 
-                    (SELECT COUNT(*) FROM DonationSchedule WHERE donor_id = d.id) as donation_count
-                FROM Donors d
-                WHERE d.id = %s
-            """, (donor_id,))
-            
-            donor = self.cursor.fetchone()
+            with self.db_pool.cursor() as cursor:
+                cursor.execute("""
+                    SELECT d.*, 
+                        (SELECT COUNT(*) FROM DonationSchedule WHERE donor_id = d.id) as donation_count
+                    FROM Donors d
+                    WHERE d.id = %s
+                """, (donor_id,))
+                donor = cursor.fetchone()
             
             if not donor:
                 tk.Label(
@@ -2191,14 +5290,14 @@ class ModernBloodBankSystem:
         ).pack(fill='x', padx=20)
         
         # Fetch donation history
-        self.cursor.execute("""
-            SELECT scheduled_date, time_slot, status, notes
-            FROM DonationSchedule
-            WHERE donor_id = %s
-            ORDER BY scheduled_date DESC
-        """, (donor_id,))
-        
-        history = self.cursor.fetchall()
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("""
+                SELECT scheduled_date, time_slot, status, notes
+                FROM DonationSchedule
+                WHERE donor_id = %s
+                ORDER BY scheduled_date DESC
+            """, (donor_id,))
+            history = cursor.fetchall()
         
         if not history:
             tk.Label(
@@ -2275,59 +5374,66 @@ class ModernBloodBankSystem:
             return
         
         try:
-            # Begin transaction
-            self.cursor.execute("START TRANSACTION")
-            
-            # Delete donation schedule entries first (foreign key constraint)
-            self.cursor.execute(
-                "DELETE FROM DonationSchedule WHERE donor_id = %s",
-                (donor_id,)
-            )
-            
-            # Delete donor
-            self.cursor.execute(
-                "DELETE FROM Donors WHERE id = %s",
-                (donor_id,)
-            )
+            with self.db_pool.transaction() as cursor:
+                cursor.execute(
+                    "SELECT donation_date, blood_group FROM Donors WHERE id = %s FOR UPDATE",
+                    (donor_id,)
+                )
+                donor = cursor.fetchone()
+                
+                # Delete donation schedule entries first (foreign key constraint)
+                cursor.execute(
+                    "DELETE FROM DonationSchedule WHERE donor_id = %s",
+                    (donor_id,)
+                )
+                
+                # Delete donor
+                cursor.execute(
+                    "DELETE FROM Donors WHERE id = %s",
+                    (donor_id,)
+                )
+                
+                if donor:
+                    self.dashboard_stats.add_day(cursor, donor[0], donations=-1)
+                    self.dashboard_stats.add(cursor, 'total_donors', -1)
+                    self.analytics_rollups.move_donation(cursor, before=donor)
             
-            self.db.commit()
             messagebox.showinfo("Success", f"Donor '{donor_name}' deleted successfully")
             
-            # Refresh the list
-            self.refresh_donors_list()
+            self.events.publish(ChangeEventBus.DONOR_DELETED, donor_id=donor_id)
             
         except Exception as e:
-            self.db.rollback()
             messagebox.showerror("Error", f"Failed to delete donor: {str(e)}")
 
     def export_donors_list(self):
-        try:
-            # Create reports directory if it doesn't exist
-            reports_dir = "reports"
-            if not os.path.exists(reports_dir):
-                os.makedirs(reports_dir)
-            
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(reports_dir, f"donors_list_{timestamp}.csv")
-            
-            # Get filtered data from tree
-            with open(filename, 'w', newline='') as file:
-                file.write("ID,Name,Age,Blood Group,Contact,Email,Last Donation,Health Status\n")
-                
-                for item_id in self.donors_tree.get_children():
-                    values = self.donors_tree.item(item_id, 'values')
-                    # Escape quotes in values
-                    escaped_values = [f'"{str(v).replace(chr(34), chr(34)+chr(34))}"' for v in values]
-                    file.write(','.join(escaped_values) + '\n')
-            
+        # Export every donor matching the filters, not just the page on screen
+        query, _, params, sort_expr, sort_params = self.donors_list_query()
+        full_query, full_params = KeysetPager.full_query(query, params, sort_expr, "id", sort_params)
+        
+        # Generate filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        def export():
+            # Unbuffered, so rows go to the file as they arrive
+            with self.db_pool.stream_cursor() as cursor:
+                cursor.execute(full_query, full_params)
+                return self.write_csv_export(
+                    f"donors_list_{timestamp}.csv",
+                    "ID,Name,Age,Blood Group,Contact,Email,Last Donation,Health Status",
+                    (self.format_donor_row(donor) for donor in cursor)
+                )
+        
+        def exported(filename):
             # Open the file
             os.startfile(filename) if os.name == 'nt' else os.system(f'open "{filename}"')
-            
             messagebox.showinfo("Export Successful", f"Donors list exported to {filename}")
         
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export donors list: {str(e)}")
+        self.query_executor.run_in_background(
+            export,
+            exported,
+            lambda e: messagebox.showerror("Export Error", f"Failed to export donors list: {str(e)}"),
+            key='donors_export'
+        )
         
     def print_donor_details(self, donor_id):
         try:
@@ -2340,15 +5446,23 @@ class ModernBloodBankSystem:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = os.path.join(reports_dir, f"donor_{donor_id}_{timestamp}.txt")
             
-            # Fetch donor details
-            self.cursor.execute("""
-                SELECT d.*, 
-                    (SELECT COUNT(*) FROM DonationSchedule WHERE donor_id = d.id) as donation_count
-                FROM Donors d
-                WHERE d.id = %s
-            """, (donor_id,))
-            
-            donor = self.cursor.fetchone()
+            # Fetch donor details and donation history
+            with self.db_pool.cursor() as cursor:
+                cursor.execute("""
+                    SELECT d.*, 
+                        (SELECT COUNT(*) FROM DonationSchedule WHERE donor_id = d.id) as donation_count
+                    FROM Donors d
+                    WHERE d.id = %s
+                """, (donor_id,))
+                donor = cursor.fetchone()
+                
+                cursor.execute("""
+                    SELECT scheduled_date, time_slot, status, notes
+                    FROM DonationSchedule
+                    WHERE donor_id = %s
+                    ORDER BY scheduled_date DESC
+                """, (donor_id,))
+                history = cursor.fetchall()
             
             if not donor:
                 messagebox.showerror("Error", "Donor not found")
@@ -2365,22 +5479,12 @@ class ModernBloodBankSystem:
                 file.write(f"Age: {donor[2]}\n")
                 file.write(f"Blood Group: {donor[3]}\n")
                 file.write(f"Contact: {donor[4]}\n")
-                file.write(f"Email: {donor[5] if donor[5] else 'N/A'}\n")
-                file.write(f"Address: {donor[6] if donor[6] else 'N/A'}\n")
-                file.write(f"Last Donation: {donor[7].strftime('%Y-%m-%d') if donor[7] else 'Never'}\n")
-                file.write(f"Health Status: {donor[8] if donor[8] else 'N/A'}\n")
-                file.write(f"Registration Date: {donor[9].strftime('%Y-%m-%d %H:%M') if donor[9] else 'N/A'}\n")
-                file.write(f"Total Donations: {donor[10]}\n\n")
-                
-                # Fetch donation history
-                self.cursor.execute("""
-                    SELECT scheduled_date, time_slot, status, notes
-                    FROM DonationSchedule
-                    WHERE donor_id = %s
-                    ORDER BY scheduled_date DESC
-                """, (donor_id,))
-                
-                history = self.cursor.fetchall()
+                file.write(f"Email: {donor[5] if donor[5] else 'N/A'}\n")
+                file.write(f"Address: {donor[6] if donor[6] else 'N/A'}\n")
+                file.write(f"Last Donation: {donor[7].strftime('%Y-%m-%d') if donor[7] else 'Never'}\n")
+                file.write(f"Health Status: {donor[8] if donor[8] else 'N/A'}\n")
+                file.write(f"Registration Date: {donor[9].strftime('%Y-%m-%d %H:%M') if donor[9] else 'N/A'}\n")
+                file.write(f"Total Donations: {donor[10]}\n\n")
                 
                 file.write("-----------------------------------------\n")
                 file.write("             DONATION HISTORY            \n")
@@ -2416,10 +5520,11 @@ class ModernBloodBankSystem:
 
     def show_edit_donor_form(self, donor_id, parent_window=None):
         # Fetch donor information
-        self.cursor.execute("""
-            SELECT * FROM Donors WHERE id = %s
-        """, (donor_id,))
-        donor = self.cursor.fetchone()
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("""
+                SELECT * FROM Donors WHERE id = %s
+            """, (donor_id,))
+            donor = cursor.fetchone()
         
         if not donor:
             messagebox.showerror("Error", "Donor not found")
@@ -2575,14 +5680,25 @@ class ModernBloodBankSystem:
                 raise ValueError("Please enter a valid email address")
             
             # Update donor in database
-            self.cursor.execute("""
-                UPDATE Donors
-                SET name = %s, age = %s, blood_group = %s, contact_info = %s,
-                    email = %s, address = %s, health_status = %s
-                WHERE id = %s
-            """, (name, age, blood_group, contact, email, address, health_status, donor_id))
-            
-            self.db.commit()
+            with self.db_pool.transaction() as cursor:
+                cursor.execute(
+                    "SELECT donation_date, blood_group FROM Donors WHERE id = %s FOR UPDATE",
+                    (donor_id,)
+                )
+                original = cursor.fetchone()
+                
+                cursor.execute("""
+                    UPDATE Donors
+                    SET name = %s, age = %s, blood_group = %s, contact_info = %s,
+                        email = %s, address = %s, health_status = %s
+                    WHERE id = %s
+                """, (name, age, blood_group, contact, email, address, health_status, donor_id))
+                
+                if original:
+                    self.analytics_rollups.move_donation(
+                        cursor, before=original, after=(original[0], blood_group)
+                    )
+            
             messagebox.showinfo("Success", "Donor information updated successfully")
             
             # Close the edit window
@@ -2592,12 +5708,9 @@ class ModernBloodBankSystem:
             if parent_window:
                 parent_window.destroy()
             
-            # Refresh the donors list if it's open
-            if hasattr(self, 'donors_tree'):
-                self.refresh_donors_list()
+            self.events.publish(ChangeEventBus.DONOR_CHANGED, donor_id=donor_id)
             
         except Exception as e:
-            self.db.rollback()
             messagebox.showerror("Error", str(e))
 
     # Function to show donation form with pre-selected donor
@@ -2723,16 +5836,6 @@ class ModernBloodBankSystem:
         
         donor_var = tk.StringVar()
         
-        # If donor_id is provided, select that donor
-        if donor_id:
-            self.cursor.execute(
-                "SELECT id, name FROM Donors WHERE id = %s",
-                (donor_id,)
-            )
-            selected_donor = self.cursor.fetchone()
-            if selected_donor:
-                donor_var.set(f"{selected_donor[0]} - {selected_donor[1]}")
-        
         # Get list of donors matching blood type if specified
         filter_clause = ""
         filter_params = []
@@ -2741,11 +5844,22 @@ class ModernBloodBankSystem:
             filter_clause = "WHERE blood_group = %s"
             filter_params.append(blood_type)
         
-        self.cursor.execute(
-            f"SELECT id, name FROM Donors {filter_clause} ORDER BY name",
-            filter_params
-        )
-        donors = self.cursor.fetchall()
+        with self.db_pool.cursor() as cursor:
+            # If donor_id is provided, select that donor
+            if donor_id:
+                cursor.execute(
+                    "SELECT id, name FROM Donors WHERE id = %s",
+                    (donor_id,)
+                )
+                selected_donor = cursor.fetchone()
+                if selected_donor:
+                    donor_var.set(f"{selected_donor[0]} - {selected_donor[1]}")
+            
+            cursor.execute(
+                f"SELECT id, name FROM Donors {filter_clause} ORDER BY name",
+                filter_params
+            )
+            donors = cursor.fetchall()
         donor_list = [f"{d[0]} - {d[1]}" for d in donors]
         
         donor_combo = ttk.Combobox(
@@ -2989,6 +6103,8 @@ class ModernBloodBankSystem:
             self.colors
         )
         self.date_entry.pack(fill='x')
+        # Show how many donations are already booked on each day
+        self.date_entry.set_day_loader(self.load_scheduled_donation_counts)
         
         # Time slot selection
         time_frame = ttk.Frame(frame, style='Card.TFrame')
@@ -3059,14 +6175,121 @@ class ModernBloodBankSystem:
             # If all tabs are valid, save the donor
             self.save_donor_to_database(window)
             
-            # After successful save, refresh dashboard
-            self.show_dashboard()
-            
         except ValueError as e:
             messagebox.showerror("Validation Error", str(e))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save donor: {str(e)}")
 
+    def show_donor_import(self):
+        path = filedialog.askopenfilename(
+            title="Import Donors",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Import Donors")
+        window.geometry("500x260")
+        window.configure(bg=self.colors['bg_dark'])
+        
+        main_frame = ttk.Frame(window, style='Modern.TFrame')
+        main_frame.pack(fill='both', expand=True, padx=30, pady=30)
+        
+        # Use tk.Label
+        tk.Label(
+            main_frame,
+            text=f"Importing {os.path.basename(path)}",
+            font=('Segoe UI', 16, 'bold'),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text']
+        ).pack(anchor='w', pady=(0, 15))
+        
+        progress_bar = ttk.Progressbar(main_frame, mode='determinate', maximum=100)
+        progress_bar.pack(fill='x', pady=(0, 10))
+        
+        # Use tk.Label
+        status_label = tk.Label(
+            main_frame,
+            text="Starting…",
+            font=('Segoe UI', 11),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text_secondary']
+        )
+        status_label.pack(anchor='w')
+        
+        cancel = threading.Event()
+        cancel_button = ttk.Button(
+            main_frame,
+            text="Cancel",
+            style='Secondary.TButton',
+            command=cancel.set
+        )
+        cancel_button.pack(side='bottom', anchor='e', pady=(20, 0))
+        window.protocol("WM_DELETE_WINDOW", lambda: (cancel.set(), window.destroy()))
+        
+        # The importer reports from its worker thread; the Tk thread drains it on a timer
+        updates = queue.Queue()
+        latest = {'imported': 0, 'blood_groups': set()}
+        
+        def show(summary):
+            progress_bar['value'] = summary['fraction'] * 100
+            status_label.configure(
+                text=f"{summary['read']:,} rows read · {summary['imported']:,} imported · "
+                     f"{summary['rejected']:,} rejected"
+            )
+        
+        def poll():
+            while True:
+                try:
+                    latest.update(updates.get_nowait())
+                except queue.Empty:
+                    break
+                if window.winfo_exists():
+                    show(latest)
+            if not finished.is_set() and window.winfo_exists():
+                window.after(100, poll)
+        
+        def announce():
+            # Committed chunks are visible even when the import stops early
+            if latest['imported']:
+                self.inventory.invalidate()
+                self.events.publish(ChangeEventBus.DONOR_ADDED, count=latest['imported'])
+                self.events.publish(ChangeEventBus.INVENTORY_CHANGED, blood_groups=sorted(latest['blood_groups']))
+        
+        def done(summary):
+            finished.set()
+            latest.update(summary)
+            announce()
+            if window.winfo_exists():
+                show(summary)
+                cancel_button.configure(text="Close", command=window.destroy)
+            message = f"Imported {summary['imported']:,} of {summary['read']:,} donors"
+            if summary['cancelled']:
+                message += " before the import was cancelled"
+            if summary['rejected_path']:
+                message += f"\n\n{summary['rejected']:,} rejected rows were written to:\n{summary['rejected_path']}"
+            messagebox.showinfo("Import Complete", message)
+        
+        def failed(error):
+            finished.set()
+            announce()
+            if window.winfo_exists():
+                window.destroy()
+            messagebox.showerror(
+                "Import Error",
+                f"Import stopped after {latest['imported']:,} donors: {str(error)}"
+            )
+        
+        finished = threading.Event()
+        importer = DonorImporter(self.db_pool)
+        self.query_executor.run_in_background(
+            lambda: importer.run(path, progress=updates.put, cancel=cancel),
+            done,
+            failed
+        )
+        window.after(100, poll)
+
     def validate_personal_info(self):
         name = self.personal_entries['name'].get().strip()
         age = self.personal_entries['age'].get().strip()
@@ -3114,64 +6337,87 @@ class ModernBloodBankSystem:
         if selected_date < date.today():
             raise ValueError("Cannot schedule donation for past dates")
 
+    def load_scheduled_donation_counts(self, first_day, last_day, deliver):
+        """Calendar day loader: scheduled donations per day, read off the Tk thread"""
+        def query(cursor):
+            cursor.execute("""
+                SELECT scheduled_date, COUNT(*) FROM DonationSchedule
+                WHERE scheduled_date BETWEEN %s AND %s
+                GROUP BY scheduled_date
+            """, (first_day, last_day))
+            return dict(cursor.fetchall())
+        
+        self.query_executor.submit(query, deliver)
+    
     def save_donor_to_database(self, window):
         try:
-            # Insert donor information
-            self.cursor.execute("""
-                INSERT INTO Donors (
-                    name, age, blood_group, contact_info,
-                    email, address, health_status, donation_date
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                self.personal_entries['name'].get().strip(),
-                int(self.personal_entries['age'].get()),
-                self.personal_entries['blood_group'].get(),
-                self.personal_entries['contact'].get().strip(),
-                self.personal_entries['email'].get().strip(),
-                self.personal_entries['address'].get().strip(),
-                self.health_notes.get("1.0", tk.END).strip(),
-                self.date_entry.get_date()
-            ))
-            
-            # Get the donor ID
-            donor_id = self.cursor.lastrowid
-            
-            # Schedule the donation
-            self.cursor.execute("""
-                INSERT INTO DonationSchedule (
-                    donor_id, scheduled_date, time_slot, notes
-                ) VALUES (%s, %s, %s, %s)
-            """, (
-                donor_id,
-                self.date_entry.get_date(),
-                self.time_var.get(),
-                self.schedule_notes.get("1.0", tk.END).strip()
-            ))
-            
-            # Update blood bank inventory - add 1 unit for the donation
-            blood_group = self.personal_entries['blood_group'].get()
-            self.cursor.execute("""
-                UPDATE BloodBank 
-                SET units_available = units_available + 1
-                WHERE blood_group = %s
-            """, (blood_group,))
-            
-            self.db.commit()
+            with self.db_pool.transaction() as cursor:
+                # Insert donor information
+                cursor.execute("""
+                    INSERT INTO Donors (
+                        name, age, blood_group, contact_info,
+                        email, address, health_status, donation_date
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """, (
+                    self.personal_entries['name'].get().strip(),
+                    int(self.personal_entries['age'].get()),
+                    self.personal_entries['blood_group'].get(),
+                    self.personal_entries['contact'].get().strip(),
+                    self.personal_entries['email'].get().strip(),
+                    self.personal_entries['address'].get().strip(),
+                    self.health_notes.get("1.0", tk.END).strip(),
+                    self.date_entry.get_date()
+                ))
+                
+                # Get the donor ID
+                donor_id = cursor.lastrowid
+                
+                # Schedule the donation
+                cursor.execute("""
+                    INSERT INTO DonationSchedule (
+                        donor_id, scheduled_date, time_slot, notes
+                    ) VALUES (%s, %s, %s, %s)
+                """, (
+                    donor_id,
+                    self.date_entry.get_date(),
+                    self.time_var.get(),
+                    self.schedule_notes.get("1.0", tk.END).strip()
+                ))
+                
+                # Update blood bank inventory - add 1 unit for the donation
+                blood_group = self.personal_entries['blood_group'].get()
+                cursor.execute("""
+                    UPDATE BloodBank 
+                    SET units_available = units_available + 1
+                    WHERE blood_group = %s
+                """, (blood_group,))
+                stocked = cursor.rowcount
+                if stocked:
+                    BloodUnits.receive(cursor, blood_group, 1, self.date_entry.get_date(), donor_id)
+                
+                self.dashboard_stats.add_day(cursor, self.date_entry.get_date(), donations=1)
+                self.dashboard_stats.add(cursor, 'total_donors', 1)
+                self.dashboard_stats.add(cursor, 'total_units', stocked)
+                self.analytics_rollups.move_donation(
+                    cursor, after=(self.date_entry.get_date(), blood_group)
+                )
+            
+            self.inventory.invalidate()
+            
             messagebox.showinfo("Success", "Donor registered successfully!")
             window.destroy()
             
-            # Refresh dashboard after donor registration to show updated stats
-            self.show_dashboard()
+            self.events.publish(ChangeEventBus.DONOR_ADDED, donor_id=donor_id, blood_group=blood_group)
+            self.events.publish(ChangeEventBus.INVENTORY_CHANGED, blood_groups=[blood_group])
             
         except Exception as e:
-            self.db.rollback()
             raise Exception(f"Failed to save donor: {str(e)}")
     
     def show_blood_requests(self):
-        for widget in self.main_container.winfo_children():
-            widget.destroy()
-                
-        main_frame = ttk.Frame(self.main_container, style='Modern.TFrame')
+        self.views.show('requests', self.build_blood_requests, self.refresh_requests)
+    
+    def build_blood_requests(self, container):
+        main_frame = ttk.Frame(container, style='Modern.TFrame')
         main_frame.pack(fill='both', expand=True)
         
         # Header with stats
@@ -3204,60 +6450,64 @@ class ModernBloodBankSystem:
             command=self.show_request_form
         ).pack(side='right')
         
-        # Quick stats
-        self.cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) as pending,
-                SUM(CASE WHEN status = 'Approved' THEN 1 ELSE 0 END) as approved,
-                SUM(CASE WHEN status = 'Rejected' THEN 1 ELSE 0 END) as rejected
-            FROM Requests
-            WHERE request_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
-        """)
-        stats = self.cursor.fetchone()
+        # Bulk actions on the rows selected in the list
+        ttk.Button(
+            header_frame,
+            text="❌ Reject Selected",
+            style='Secondary.TButton',
+            command=lambda: self.update_selected_requests('Rejected')
+        ).pack(side='right', padx=(0, 10))
+        
+        ttk.Button(
+            header_frame,
+            text="✅ Approve Selected",
+            style='Secondary.TButton',
+            command=lambda: self.update_selected_requests('Approved')
+        ).pack(side='right', padx=(0, 10))
+        
+        # Quick stats, re-read on every visit and after request changes
+        def request_stats(cursor):
+            cursor.execute("""
+                SELECT 
+                    COUNT(*) as total,
+                    SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) as pending,
+                    SUM(CASE WHEN status = 'Approved' THEN 1 ELSE 0 END) as approved,
+                    SUM(CASE WHEN status = 'Rejected' THEN 1 ELSE 0 END) as rejected
+                FROM Requests
+                WHERE request_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
+            """)
+            return cursor.fetchone()
         
         stats_frame = ttk.Frame(main_frame, style='Modern.TFrame')
         stats_frame.pack(fill='x', pady=(0, 20))
-        
-        stat_items = [
-            ("Total Requests", stats[0], "📊"),
-            ("Pending", stats[1], "⏳", self.colors['warning']),
-            ("Approved", stats[2], "✅", self.colors['success']),
-            ("Rejected", stats[3], "❌", self.colors['error'])
-        ]
-        
-        for i, (label, value, icon, *colors) in enumerate(stat_items):
-            card = ttk.Frame(stats_frame, style='Card.TFrame')
-            card.grid(row=0, column=i, padx=5, sticky='nsew')
-            
-            color = colors[0] if colors else self.colors['text']
-            
-            # Use tk.Label
-            tk.Label(
-                card,
-                text=f"{icon} {value}",
-                font=('Segoe UI', 20, 'bold'),
-                fg=color,
-                bg=self.colors['card_bg']
-            ).pack(pady=(10, 5))
-            
-            # Use tk.Label
-            tk.Label(
-                card,
-                text=label,
-                font=('Segoe UI', 10),
-                fg=self.colors['text_secondary'],
-                bg=self.colors['card_bg']
-            ).pack(pady=(0, 10))
-        
-        stats_frame.grid_columnconfigure((0,1,2,3), weight=1)
+        refresh_stats = self.create_header_stats(stats_frame, [
+            ("Total Requests", "📊"),
+            ("Pending", "⏳", self.colors['warning']),
+            ("Approved", "✅", self.colors['success']),
+            ("Rejected", "❌", self.colors['error'])
+        ], request_stats, 'request_stats')
+        self.events.subscribe(
+            ChangeEventBus.REQUEST_CHANGED, lambda **details: refresh_stats(), owner=stats_frame
+        )
         
         # Filters and search
         filter_frame = self.create_request_filters(main_frame)
         filter_frame.pack(fill='x', pady=(0, 20))
         
+        # Requests the current stock can fulfil
+        self.create_fulfilment_banner(main_frame)
+        
         # Request list
         self.create_request_list(main_frame)
+        
+        # Hidden screens skip change events, so stock that arrived elsewhere
+        # is matched again when the screen is shown
+        def refresh():
+            refresh_stats()
+            self.refresh_requests()
+            self.refresh_fulfilment_proposals()
+        
+        return refresh
 
     def create_request_header(self, parent):
         header_frame = ttk.Frame(parent, style='Modern.TFrame')
@@ -3282,16 +6532,17 @@ class ModernBloodBankSystem:
         ).pack(side='right')
         
         # Quick stats
-        self.cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) as pending,
-                SUM(CASE WHEN status = 'Approved' THEN 1 ELSE 0 END) as approved,
-                SUM(CASE WHEN status = 'Rejected' THEN 1 ELSE 0 END) as rejected
-            FROM Requests
-            WHERE request_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
-        """)
-        stats = self.cursor.fetchone()
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("""
+                SELECT 
+                    COUNT(*) as total,
+                    SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) as pending,
+                    SUM(CASE WHEN status = 'Approved' THEN 1 ELSE 0 END) as approved,
+                    SUM(CASE WHEN status = 'Rejected' THEN 1 ELSE 0 END) as rejected
+                FROM Requests
+                WHERE request_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
+            """)
+            stats = cursor.fetchone()
         
         stats_frame = ttk.Frame(parent, style='Modern.TFrame')
         stats_frame.pack(fill='x', pady=(0, 20))
@@ -3363,7 +6614,10 @@ class ModernBloodBankSystem:
         search_frame.pack(side='right', padx=20, pady=10)
         
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', lambda *args: self.refresh_requests())
+        self.request_search = DebouncedSearch(self.root)
+        self.search_var.trace(
+            'w', lambda *args: self.request_search.schedule(lambda: self.refresh_requests(narrow=True))
+        )
         
         search_entry = ttk.Entry(
             search_frame,
@@ -3391,10 +6645,12 @@ class ModernBloodBankSystem:
             'priority', 'status', 'notes'
         )
         
-        self.request_tree = ttk.Treeview(
+        # Shift/Control-click select several requests for bulk approval
+        self.request_tree = VirtualTreeview(
             parent,
             columns=columns,
             show='headings',
+            selectmode='extended',
             style='Modern.Treeview'
         )
         
@@ -3414,6 +6670,20 @@ class ModernBloodBankSystem:
             self.request_tree.heading(col, text=heading)
             self.request_tree.column(col, width=width)
         
+        # Configure status colors
+        self.request_tree.tag_configure(
+            'status_pending',
+            foreground=self.colors['warning']
+        )
+        self.request_tree.tag_configure(
+            'status_approved',
+            foreground=self.colors['success']
+        )
+        self.request_tree.tag_configure(
+            'status_rejected',
+            foreground=self.colors['error']
+        )
+        
         # Add scrollbar
         scrollbar = ttk.Scrollbar(
             parent,
@@ -3422,64 +6692,324 @@ class ModernBloodBankSystem:
         )
         self.request_tree.configure(yscrollcommand=scrollbar.set)
         
+        # Keyset paging controls under the list
+        self.requests_pager = KeysetPager()
+        self.create_pager_controls(parent, self.requests_pager, self.refresh_requests)
+        
         # Pack elements
         self.request_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
         
         # Bind double-click event
-        self.request_tree.bind('<Double-1>', self.show_request_details)
+        self.request_tree.bind(
+            '<Double-1>',
+            lambda e: self.show_request_details(e) if self.request_tree.event_key(e) is not None else None
+        )
+        
+        self.events.subscribe(
+            ChangeEventBus.REQUEST_CHANGED,
+            lambda **details: self.refresh_requests(),
+            owner=self.request_tree
+        )
         
         # Initial load
         self.refresh_requests()
 
-    def refresh_requests(self):
-        self.request_tree.delete(*self.request_tree.get_children())
+    def create_fulfilment_banner(self, parent):
+        banner = ttk.Frame(parent, style='Card.TFrame')
+        banner.pack(fill='x', pady=(0, 20))
+        
+        # Use tk.Label
+        self.fulfilment_label = tk.Label(
+            banner,
+            text="Matching pending requests against stock…",
+            font=('Segoe UI', 12),
+            bg=self.colors['card_bg'],
+            fg=self.colors['text_secondary']
+        )
+        self.fulfilment_label.pack(side='left', padx=20, pady=10)
+        
+        self.fulfilment_button = ttk.Button(
+            banner,
+            text="Review Proposals",
+            style='Modern.TButton',
+            command=self.show_fulfilment_proposals,
+            state='disabled'
+        )
+        self.fulfilment_button.pack(side='right', padx=20, pady=10)
+        
+        for event_type in (ChangeEventBus.REQUEST_CHANGED, ChangeEventBus.INVENTORY_CHANGED,
+                           ChangeEventBus.DONATION_RECORDED, ChangeEventBus.DONOR_ADDED):
+            self.events.subscribe(
+                event_type,
+                lambda **details: self.refresh_fulfilment_proposals(),
+                owner=self.fulfilment_label
+            )
+        
+        self.refresh_fulfilment_proposals()
+
+    def refresh_fulfilment_proposals(self):
+        def propose(cursor):
+            engine = FulfilmentEngine().load(cursor)
+            return engine, engine.propose(BloodUnits.usable_counts(cursor))
+        
+        def proposed(result):
+            self.fulfilment_engine, self.fulfilment_proposals = result
+            if not self.fulfilment_label.winfo_exists():
+                return
+            count = len(self.fulfilment_proposals)
+            substituted = sum(
+                1 for request_id, allocation in self.fulfilment_proposals
+                if any(group != self.fulfilment_engine.describe(request_id)[1] for group, _ in allocation)
+            )
+            if count:
+                text = f"{count} of {len(self.fulfilment_engine)} pending request(s) can be fulfilled from stock"
+                if substituted:
+                    text += f" ({substituted} with compatible substitutes)"
+            else:
+                text = "No pending requests can be fulfilled from current stock"
+            self.fulfilment_label.configure(
+                text=text,
+                fg=self.colors['success'] if count else self.colors['text_secondary']
+            )
+            self.fulfilment_button.configure(state='normal' if count else 'disabled')
+        
+        self.query_executor.submit(
+            propose,
+            proposed,
+            lambda e: print(f"Failed to match requests: {e}"),
+            key='fulfilment_proposals'
+        )
+
+    def show_fulfilment_proposals(self):
+        proposals = list(self.fulfilment_proposals)
+        engine = self.fulfilment_engine
+        
+        window = tk.Toplevel(self.root)
+        window.title("Fulfilment Proposals")
+        window.geometry("700x500")
+        window.configure(bg=self.colors['bg_dark'])
+        
+        main_frame = ttk.Frame(window, style='Modern.TFrame')
+        main_frame.pack(fill='both', expand=True, padx=30, pady=30)
+        
+        # Use tk.Label
+        tk.Label(
+            main_frame,
+            text="Proposed Allocations",
+            font=('Segoe UI', 20, 'bold'),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text']
+        ).pack(anchor='w', pady=(0, 5))
+        
+        # Use tk.Label
+        tk.Label(
+            main_frame,
+            text="Highest priority first; substitutes follow ABO/Rh compatibility",
+            font=('Segoe UI', 10),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text_secondary']
+        ).pack(anchor='w', pady=(0, 15))
+        
+        tree_frame = ttk.Frame(main_frame, style='Modern.TFrame')
+        tree_frame.pack(fill='both', expand=True)
+        
+        columns = ('id', 'priority', 'blood_group', 'units', 'allocation')
+        tree = ttk.Treeview(tree_frame, columns=columns, show='headings', style='Modern.Treeview')
+        for col, heading, width in (
+            ('id', 'Request', 70), ('priority', 'Priority', 100), ('blood_group', 'Blood Group', 100),
+            ('units', 'Units', 70), ('allocation', 'Allocated From', 260)
+        ):
+            tree.heading(col, text=heading)
+            tree.column(col, width=width)
+        
+        tree.tag_configure('substituted', foreground=self.colors['warning'])
+        for request_id, allocation in proposals:
+            priority, blood_group, units = engine.describe(request_id)
+            source = ", ".join(f"{group} × {count}" for group, count in allocation)
+            tags = ('substituted',) if any(group != blood_group for group, _ in allocation) else ()
+            tree.insert('', 'end', values=(request_id, priority, blood_group, units, source), tags=tags)
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        
+        button_frame = ttk.Frame(main_frame, style='Modern.TFrame')
+        button_frame.pack(fill='x', pady=(20, 0))
+        
+        ttk.Button(
+            button_frame,
+            text="Close",
+            style='Modern.TButton',
+            command=window.destroy
+        ).pack(side='right', padx=5)
+        
+        ttk.Button(
+            button_frame,
+            text="✅ Approve All",
+            style='Modern.TButton',
+            command=lambda: self.apply_fulfilment(proposals, engine, window)
+        ).pack(side='right', padx=5)
+
+    def apply_fulfilment(self, proposals, engine, window=None):
+        """Approve proposed requests and allocate their units in one transaction"""
+        approved = []
+        stock_deltas = {}
+        try:
+            with self.db_pool.transaction() as cursor:
+                for request_id, allocation in proposals:
+                    cursor.execute(
+                        """SELECT status, units_requested, blood_group, request_date, priority
+                        FROM Requests WHERE id = %s FOR UPDATE""",
+                        (request_id,)
+                    )
+                    original = cursor.fetchone()
+                    # Skip requests that were handled or edited since the proposal was made
+                    if (not original or original[0] != 'Pending'
+                            or original[1] != sum(units for _, units in allocation)):
+                        continue
+                    _, units, blood_group, request_date, priority = original
+                    
+                    for donor_group, donor_units in allocation:
+                        BloodUnits.allocate(cursor, donor_group, donor_units, request_id)
+                        stock_deltas[donor_group] = stock_deltas.get(donor_group, 0) - donor_units
+                    
+                    cursor.execute("UPDATE Requests SET status = 'Approved' WHERE id = %s", (request_id,))
+                    self.analytics_rollups.move_request(
+                        cursor,
+                        before=(request_date, 'Pending', priority, blood_group, units),
+                        after=(request_date, 'Approved', priority, blood_group, units)
+                    )
+                    approved.append(request_id)
+                
+                # One counter update per group for the whole batch
+                BloodUnits.adjust_counters(cursor, stock_deltas)
+                self.dashboard_stats.add(cursor, 'pending_requests', -len(approved))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to approve requests: {str(e)}")
+            return
         
+        for request_id in approved:
+            engine.discard(request_id)
+        self.inventory.invalidate()
+        if window is not None:
+            window.destroy()
+        
+        skipped = len(proposals) - len(approved)
+        message = f"{len(approved)} request(s) approved"
+        if skipped:
+            message += f"; {skipped} skipped because they changed since the proposal"
+        messagebox.showinfo("Success", message)
+        
+        if approved:
+            self.events.publish(ChangeEventBus.REQUEST_CHANGED, request_ids=approved, status='Approved')
+        if stock_deltas:
+            self.events.publish(ChangeEventBus.INVENTORY_CHANGED, blood_groups=sorted(stock_deltas))
+
+    def refresh_requests(self, narrow=False):
         status_filter = self.status_var.get()
         search_term = self.search_var.get().strip()
         
-        query = """
-            SELECT id, hospital_name, blood_group, units_requested,
-                request_date, priority, status, notes
-            FROM Requests
-            WHERE (status = %s OR %s = 'All')
-            AND (
+        where = ""
+        params = []
+        
+        # Only add predicates that apply so the status index can be used
+        if status_filter != 'All':
+            where += " AND status = %s"
+            params.append(status_filter)
+        
+        # Search through the full-text index, best matches first
+        phrase = fulltext_phrase(search_term)
+        sort_expr, sort_params = "request_date", []
+        if phrase:
+            match = "MATCH(hospital_name, notes) AGAINST (%s IN BOOLEAN MODE)"
+            if re.fullmatch(r'(A|B|AB|O)[+-]?', search_term.upper()):
+                where += f" AND ({match} OR blood_group LIKE %s)"
+                params.extend([phrase, f"{search_term}%"])
+            else:
+                where += f" AND {match}"
+                params.append(phrase)
+            sort_expr, sort_params = match, [phrase]
+        elif search_term:
+            where += """ AND (
                 hospital_name LIKE %s
                 OR blood_group LIKE %s
                 OR notes LIKE %s
-            )
-            ORDER BY request_date DESC
+            )"""
+            search_pattern = f"%{search_term}%"
+            params.extend([search_pattern, search_pattern, search_pattern])
+        
+        # The sort key is selected last so the pager can seek past it
+        query = f"""
+            SELECT id, hospital_name, blood_group, units_requested,
+                request_date, priority, status, notes, {sort_expr}
+            FROM Requests
+            WHERE 1=1 {where}
         """
+        count_query = f"SELECT COUNT(*) FROM Requests WHERE 1=1 {where}"
         
-        search_pattern = f"%{search_term}%" if search_term else "%"
-        self.cursor.execute(query, (
-            status_filter, status_filter,
-            search_pattern, search_pattern, search_pattern
-        ))
+        pager = self.requests_pager
+        pager.sync((status_filter, search_term))
+        page_query, page_params = pager.page_query(query, sort_params + params, sort_expr, "id", sort_params)
         
-        for row in self.cursor.fetchall():
-            # Format date
-            row = list(row)
-            row[4] = row[4].strftime("%Y-%m-%d")
-            
-            # Add status color tags
-            status = row[6]
-            tag = f'status_{status.lower()}'
-            
-            self.request_tree.insert('', 'end', values=row, tags=(tag,))
+        def fetch_requests(cursor):
+            cursor.execute(page_query, page_params)
+            return cursor.fetchall()
         
-        # Configure status colors
-        self.request_tree.tag_configure(
-            'status_pending',
-            foreground=self.colors['warning']
-        )
-        self.request_tree.tag_configure(
-            'status_approved',
-            foreground=self.colors['success']
-        )
-        self.request_tree.tag_configure(
-            'status_rejected',
-            foreground=self.colors['error']
+        def count_requests(cursor):
+            cursor.execute(count_query, params)
+            return cursor.fetchone()[0]
+        
+        def populate(rows):
+            requests = []
+            for row in rows:
+                # Format date
+                row = list(row[:8])
+                row[4] = row[4].strftime("%Y-%m-%d")
+                
+                # Add status color tags
+                status = row[6]
+                tag = f'status_{status.lower()}'
+                
+                requests.append((row[0], row, (tag,)))
+            self.request_tree.set_rows(requests)
+        
+        def loaded(rows):
+            rows = pager.receive(rows)
+            # Only a complete result can be narrowed locally
+            if pager.is_complete:
+                self.request_search.store(status_filter, search_term, rows)
+            else:
+                self.request_search.invalidate()
+                # Count in the background; the label shows "…" until it arrives
+                if pager.total is None or pager.page == 0:
+                    self.query_executor.submit(
+                        count_requests,
+                        pager.set_total,
+                        lambda e: print(f"Failed to count requests: {e}"),
+                        key='requests_count'
+                    )
+            populate(rows)
+        
+        # Search-box edits that only extend the term are answered from the last result
+        if narrow:
+            rows = self.request_search.narrow(
+                status_filter, search_term,
+                lambda row, term: any(term in str(row[i] or '').lower() for i in (1, 2, 7))
+            )
+            if rows is not None:
+                self.query_executor.cancel('requests_list')
+                populate(pager.receive(rows))
+                return
+        
+        if not pager.is_reload:
+            self.show_tree_loading(self.request_tree)
+        self.query_executor.submit(
+            fetch_requests,
+            loaded,
+            lambda e: messagebox.showerror("Error", f"Failed to load requests: {str(e)}"),
+            key='requests_list'
         )
 
     def show_request_details(self, event):
@@ -3495,17 +7025,17 @@ class ModernBloodBankSystem:
         main_frame.pack(fill='both', expand=True, padx=30, pady=30)
         
         # Fetch request details
-        self.cursor.execute("""
-            SELECT r.*, 
-                b.units_available,
-                (SELECT COUNT(*) FROM Requests 
-                    WHERE hospital_name = r.hospital_name) as total_requests
-            FROM Requests r
-            LEFT JOIN BloodBank b ON r.blood_group = b.blood_group
-            WHERE r.id = %s
-        """, (request_id,))
-        
-        request = self.cursor.fetchone()
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("""
+                SELECT r.*, 
+                    b.units_available,
+                    (SELECT COUNT(*) FROM Requests 
+                        WHERE hospital_name = r.hospital_name) as total_requests
+                FROM Requests r
+                LEFT JOIN BloodBank b ON r.blood_group = b.blood_group
+                WHERE r.id = %s
+            """, (request_id,))
+            request = cursor.fetchone()
         
         # Header - Use tk.Label
         tk.Label(
@@ -3648,28 +7178,94 @@ class ModernBloodBankSystem:
 
     def update_request_status(self, request_id, status):
         try:
-            self.cursor.execute("""
-                UPDATE Requests 
-                SET status = %s 
-                WHERE id = %s
-            """, (status, request_id))
+            self.set_request_statuses([request_id], status)
+            messagebox.showinfo("Success", f"Request {status.lower()} successfully")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to update request: {str(e)}")
+
+    def update_selected_requests(self, status):
+        request_ids = self.request_tree.selected_keys()
+        if not request_ids:
+            messagebox.showwarning("No Selection", "Select one or more requests first")
+            return
+        
+        verb = 'Approve' if status == 'Approved' else 'Reject'
+        if not messagebox.askyesno("Confirm", f"{verb} {len(request_ids)} selected request(s)?"):
+            return
+        
+        try:
+            changed = self.set_request_statuses(request_ids, status)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to update requests: {str(e)}")
+            return
+        
+        message = f"{len(changed)} request(s) {status.lower()}"
+        unchanged = len(request_ids) - len(changed)
+        if unchanged:
+            message += f"; {unchanged} already {status.lower()}"
+        messagebox.showinfo("Success", message)
+
+    def set_request_statuses(self, request_ids, status):
+        """Move requests to a status in one transaction; returns the ids that changed"""
+        if not request_ids:
+            return []
+        placeholders = ', '.join(['%s'] * len(request_ids))
+        with self.db_pool.transaction() as cursor:
+            cursor.execute(f"""
+                SELECT id, status, units_requested, blood_group, request_date, priority
+                FROM Requests WHERE id IN ({placeholders})
+                ORDER BY id
+                FOR UPDATE
+            """, list(request_ids))
+            changed = [row for row in cursor.fetchall() if row[1] != status]
+            if not changed:
+                return []
+            
+            changed_ids = [row[0] for row in changed]
+            cursor.execute(
+                f"UPDATE Requests SET status = %s WHERE id IN ({', '.join(['%s'] * len(changed_ids))})",
+                [status] + changed_ids
+            )
             
+            # Net inventory movement per blood group across the whole batch
+            stock_deltas = {}
             if status == 'Approved':
-                # Update blood bank inventory
-                self.cursor.execute("""
-                    UPDATE BloodBank b
-                    JOIN Requests r ON b.blood_group = r.blood_group
-                    SET b.units_available = b.units_available - r.units_requested
-                    WHERE r.id = %s
-                """, (request_id,))
-            
-            self.db.commit()
-            messagebox.showinfo("Success", f"Request {status.lower()} successfully")
-            self.refresh_requests()
+                # Take the first-expiring units, then move the counters to match
+                taken = BloodUnits.allocate_many(
+                    cursor, [(request_id, blood_group, units) for request_id, _, units, blood_group, _, _ in changed]
+                )
+                stock_deltas = {blood_group: -units for blood_group, units in taken.items()}
+            released = BloodUnits.release_many(cursor, [
+                (request_id, blood_group, units)
+                for request_id, original, units, blood_group, _, _ in changed
+                if original == 'Approved'
+            ])
+            for blood_group, units in released.items():
+                stock_deltas[blood_group] = stock_deltas.get(blood_group, 0) + units
             
-        except Exception as e:
-            self.db.rollback()
-            messagebox.showerror("Error", f"Failed to update request: {str(e)}")
+            # Update blood bank inventory
+            BloodUnits.adjust_counters(cursor, stock_deltas)
+            
+            pending_delta = sum((status == 'Pending') - (row[1] == 'Pending') for row in changed)
+            self.dashboard_stats.add(cursor, 'pending_requests', pending_delta)
+            self.analytics_rollups.move_requests(cursor, [
+                (
+                    (request_date, original, priority, blood_group, units),
+                    (request_date, status, priority, blood_group, units)
+                )
+                for _, original, units, blood_group, request_date, priority in changed
+            ])
+        
+        self.inventory.invalidate()
+        
+        # One event per batch, so each screen refreshes once
+        if len(changed_ids) == 1:
+            self.events.publish(ChangeEventBus.REQUEST_CHANGED, request_id=changed_ids[0], status=status)
+        else:
+            self.events.publish(ChangeEventBus.REQUEST_CHANGED, request_ids=changed_ids, status=status)
+        if stock_deltas:
+            self.events.publish(ChangeEventBus.INVENTORY_CHANGED, blood_groups=sorted(stock_deltas))
+        return changed_ids
             
     def print_request(self, request_id):
         try:
@@ -3683,14 +7279,14 @@ class ModernBloodBankSystem:
             filename = os.path.join(reports_dir, f"request_{request_id}_{timestamp}.txt")
             
             # Fetch request details
-            self.cursor.execute("""
-                SELECT r.*, b.units_available
-                FROM Requests r
-                LEFT JOIN BloodBank b ON r.blood_group = b.blood_group
-                WHERE r.id = %s
-            """, (request_id,))
-            
-            request = self.cursor.fetchone()
+            with self.db_pool.cursor() as cursor:
+                cursor.execute("""
+                    SELECT r.*, b.units_available
+                    FROM Requests r
+                    LEFT JOIN BloodBank b ON r.blood_group = b.blood_group
+                    WHERE r.id = %s
+                """, (request_id,))
+                request = cursor.fetchone()
             
             if not request:
                 messagebox.showerror("Error", "Request not found")
@@ -3727,10 +7323,10 @@ class ModernBloodBankSystem:
             messagebox.showerror("Print Error", f"Failed to print request: {str(e)}")
         
     def show_analytics(self):
-        for widget in self.main_container.winfo_children():
-            widget.destroy()
-                
-        main_frame = ttk.Frame(self.main_container, style='Modern.TFrame')
+        self.views.show('analytics', self.build_analytics, self.refresh_analytics_charts)
+    
+    def build_analytics(self, container):
+        main_frame = ttk.Frame(container, style='Modern.TFrame')
         main_frame.pack(fill='both', expand=True)
         
         # Header
@@ -3792,19 +7388,49 @@ class ModernBloodBankSystem:
             charts_frame.grid_rowconfigure(i, weight=1)
         
         # Create charts
-        self.create_donation_trend_chart(charts_frame, 0, 0)
-        self.create_blood_type_distribution_chart(charts_frame, 0, 1)
-        self.create_request_status_chart(charts_frame, 1, 0)
-        self.create_inventory_levels_chart(charts_frame, 1, 1)
+        self.analytics_charts_frame = charts_frame
+        self.analytics_charts = []
+        self.refresh_analytics_charts()
+    
+    def refresh_analytics_charts(self):
+        # Charts are built once; a refresh only feeds them new data
+        if not self.analytics_charts:
+            charts_frame = self.analytics_charts_frame
+            self.analytics_charts = [
+                self.create_donation_trend_chart(charts_frame, 0, 0),
+                self.create_blood_type_distribution_chart(charts_frame, 0, 1),
+                self.create_request_status_chart(charts_frame, 1, 0),
+                self.create_inventory_levels_chart(charts_frame, 1, 1)
+            ]
+        
+        def apply(snapshot):
+            for update_chart in self.analytics_charts:
+                update_chart(snapshot)
+        
+        # One snapshot feeds all four charts; reuse it until the data changes
+        start = self.get_date_range()
+        version = self.events.version
+        snapshot = self.analytics_snapshot.cached(start, version)
+        if snapshot is not None:
+            apply(snapshot)
+            return
+        
+        self.query_executor.submit(
+            lambda cursor: self.analytics_snapshot.load(cursor, start, version),
+            apply,
+            lambda e: print(f"Analytics snapshot failed: {e}"),
+            key='analytics_snapshot'
+        )
 
-    def create_donation_trend_chart(self, parent, row, col):
+    def create_chart_canvas(self, parent, row, col, title):
+        """Card with a title and an embedded figure; the figure is released with the card"""
         frame = ttk.Frame(parent, style='Card.TFrame')
         frame.grid(row=row, column=col, padx=10, pady=10, sticky='nsew')
         
         # Use tk.Label
         tk.Label(
             frame,
-            text="Donation Trends",
+            text=title,
             font=('Segoe UI', 18, 'bold'),
             bg=self.colors['card_bg'],
             fg=self.colors['text'],
@@ -3814,109 +7440,121 @@ class ModernBloodBankSystem:
         
         fig = Figure(figsize=(6, 4), facecolor=self.colors['chart_bg'])
         ax = fig.add_subplot(111)
-        
-        # Get donation data
-        date_range = self.get_date_range()
-        self.cursor.execute("""
-            SELECT DATE(donation_date) as date, COUNT(*) as count
-            FROM Donors
-            WHERE donation_date >= %s
-            GROUP BY DATE(donation_date)
-            ORDER BY date
-        """, (date_range,))
-        
-        dates = []
-        counts = []
-        for date, count in self.cursor.fetchall():
-            dates.append(date)
-            counts.append(count)
-        
-        # Plot data
-        ax.plot(dates, counts, color=self.colors['accent'], marker='o')
         ax.set_facecolor(self.colors['chart_bg'])
-        ax.tick_params(colors=self.colors['text'])
-        ax.grid(True, color=self.colors['grid'], linestyle='--', alpha=0.7)
-        
-        # Rotate x-axis labels
-        plt.setp(ax.get_xticklabels(), rotation=45)
         
         canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=(0, 20))
-
-    def create_blood_type_distribution_chart(self, parent, row, col):
-        frame = ttk.Frame(parent, style='Card.TFrame')
-        frame.grid(row=row, column=col, padx=10, pady=10, sticky='nsew')
+        widget = canvas.get_tk_widget()
+        widget.pack(fill='both', expand=True, padx=20, pady=(0, 20))
         
-        # Use tk.Label
-        tk.Label(
-            frame,
-            text="Blood Type Distribution",
-            font=('Segoe UI', 18, 'bold'),
-            bg=self.colors['card_bg'],
-            fg=self.colors['text'],
-            padx=20,
-            pady=10
-        ).pack(pady=(10, 20))
+        def dispose(event):
+            if event.widget is not widget:
+                return
+            # Drop the artists and renderer buffers held by the figure
+            fig.clear()
+            self.analytics_charts = []
         
-        fig = Figure(figsize=(6, 4), facecolor=self.colors['chart_bg'])
-        ax = fig.add_subplot(111)
+        widget.bind('<Destroy>', dispose, add='+')
+        return fig, ax, canvas
+
+    def create_donation_trend_chart(self, parent, row, col):
+        fig, ax, canvas = self.create_chart_canvas(parent, row, col, "Donation Trends")
         
-        # Get blood type data
-        self.cursor.execute("""
-            SELECT blood_group, units_available
-            FROM BloodBank
-            ORDER BY blood_group
-        """)
+        line, = ax.plot([], [], color=self.colors['accent'], marker='o')
+        average_line, = ax.plot([], [], color=self.colors['text_secondary'], linestyle='--', label='7-day average')
+        ax.xaxis_date()
+        ax.tick_params(colors=self.colors['text'])
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.grid(True, color=self.colors['grid'], linestyle='--', alpha=0.7)
+        
+        def update(snapshot):
+            engine, start, end = snapshot['engine'], snapshot['start'], snapshot['end']
+            daily = engine.daily('donations', start, end)
+            
+            # Coarser buckets for longer ranges
+            granularity = trend_granularity(start, end)
+            dates, counts = bucket_series(engine.days(start, end), daily, granularity)
+            # Daily view gets a 7-day trailing average on the same axis
+            average = engine.moving_average(daily, 7) if granularity == 'day' else None
+            
+            # Never plot more points than the axis has pixels for
+            width = max(canvas.get_tk_widget().winfo_width(), fig.get_figwidth() * fig.dpi)
+            kept = lttb([day.toordinal() for day in dates], counts, int(width * ax.get_position().width))
+            dates = [dates[i] for i in kept]
+            
+            line.set_data(dates, counts[kept])
+            line.set_marker('o' if len(dates) <= 60 else '')
+            if average is not None:
+                average_line.set_data(dates, average[kept])
+            else:
+                # Drop the last daily range's points so they cannot stretch the axes
+                average_line.set_data([], [])
+            average_line.set_visible(average is not None)
+            
+            comparison = engine.period_comparison('donations', start, end)
+            change = comparison['change_pct']
+            ax.set_title(
+                f"{comparison['current']} donations"
+                + (f" ({change:+.0f}% vs previous period)" if change is not None else ""),
+                color=self.colors['text']
+            )
+            ax.xaxis.set_major_formatter(
+                mdates.DateFormatter('%b %Y' if granularity == 'month' else '%d %b')
+            )
+            ax.set_xlabel(f"Donations per {granularity}", color=self.colors['text'])
+            if dates:
+                ax.relim(visible_only=True)
+                ax.autoscale_view()
+            canvas.draw_idle()
         
-        blood_types = []
-        units = []
-        for blood_type, unit in self.cursor.fetchall():
-            blood_types.append(blood_type)
-            units.append(unit)
+        return update
+
+    def create_blood_type_distribution_chart(self, parent, row, col):
+        fig, ax, canvas = self.create_chart_canvas(parent, row, col, "Blood Type Distribution")
         
-        # Create pie chart
         colors = [self.colors['accent'], self.colors['success'], 
                 self.colors['warning'], self.colors['error']]
-        ax.pie(units, labels=blood_types, colors=colors, autopct='%1.1f%%')
-        ax.set_facecolor(self.colors['chart_bg'])
-        
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        pie = {}
+        
+        def update(snapshot):
+            # Get blood type data
+            rows = sorted(snapshot['inventory'].items())
+            blood_types = [blood_type for blood_type, _ in rows]
+            units = [unit for _, unit in rows]
+            total = sum(units)
+            
+            if pie.get('labels') != blood_types:
+                # First draw, or the set of groups changed: lay the pie out again
+                ax.clear()
+                ax.set_facecolor(self.colors['chart_bg'])
+                pie['labels'] = blood_types
+                pie['wedges'], pie['texts'], pie['autotexts'] = ax.pie(
+                    [1] * len(units), labels=blood_types, colors=colors, autopct='%1.1f%%'
+                )
+            
+            # Move the existing wedges and their labels to the new angles
+            start = 0.0
+            for wedge, text, autotext, unit in zip(pie['wedges'], pie['texts'], pie['autotexts'], units):
+                share = unit / total if total else 0
+                end = start + 360 * share
+                wedge.set_theta1(start)
+                wedge.set_theta2(end)
+                middle = math.radians((start + end) / 2)
+                x, y = math.cos(middle), math.sin(middle)
+                text.set_position((1.1 * x, 1.1 * y))
+                text.set_horizontalalignment('left' if x > 0 else 'right')
+                autotext.set_position((0.6 * x, 0.6 * y))
+                autotext.set_text(f'{share * 100:.1f}%')
+                visible = share > 0
+                wedge.set_visible(visible)
+                text.set_visible(visible)
+                autotext.set_visible(visible)
+                start = end
+            canvas.draw_idle()
+        
+        return update
 
     def create_request_status_chart(self, parent, row, col):
-        frame = ttk.Frame(parent, style='Card.TFrame')
-        frame.grid(row=row, column=col, padx=10, pady=10, sticky='nsew')
-        
-        # Use tk.Label
-        tk.Label(
-            frame,
-            text="Request Status Distribution",
-            font=('Segoe UI', 18, 'bold'),
-            bg=self.colors['card_bg'],
-            fg=self.colors['text'],
-            padx=20,
-            pady=10
-        ).pack(pady=(10, 20))
-        
-        fig = Figure(figsize=(6, 4), facecolor=self.colors['chart_bg'])
-        ax = fig.add_subplot(111)
-        
-        # Get request status data
-        date_range = self.get_date_range()
-        self.cursor.execute("""
-            SELECT status, COUNT(*) as count
-            FROM Requests
-            WHERE request_date >= %s
-            GROUP BY status
-        """, (date_range,))
-        
-        statuses = []
-        counts = []
-        for status, count in self.cursor.fetchall():
-            statuses.append(status)
-            counts.append(count)
+        fig, ax, canvas = self.create_chart_canvas(parent, row, col, "Request Status Distribution")
         
         # Create bar chart
         status_colors = {
@@ -3924,65 +7562,55 @@ class ModernBloodBankSystem:
             'Approved': self.colors['success'],
             'Rejected': self.colors['error']
         }
-        
-        colors = [status_colors.get(status, self.colors['accent']) for status in statuses]
-        
-        ax.bar(statuses, counts, color=colors)
-        ax.set_facecolor(self.colors['chart_bg'])
+        statuses = list(status_colors)
+        bars = ax.bar(statuses, [0] * len(statuses), color=list(status_colors.values()))
         ax.tick_params(colors=self.colors['text'])
         ax.grid(True, color=self.colors['grid'], linestyle='--', alpha=0.7)
         
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        def update(snapshot):
+            counts = snapshot['request_status']
+            for bar, status in zip(bars, statuses):
+                bar.set_height(counts.get(status, 0))
+            ax.set_ylim(0, max(counts.values(), default=0) * 1.1 or 1)
+            canvas.draw_idle()
+        
+        return update
 
     def create_inventory_levels_chart(self, parent, row, col):
-        frame = ttk.Frame(parent, style='Card.TFrame')
-        frame.grid(row=row, column=col, padx=10, pady=10, sticky='nsew')
-        
-        # Use tk.Label
-        tk.Label(
-            frame,
-            text="Current Inventory Levels",
-            font=('Segoe UI', 18, 'bold'),
-            bg=self.colors['card_bg'],
-            fg=self.colors['text'],
-            padx=20,
-            pady=10
-        ).pack(pady=(10, 20))
-        
-        fig = Figure(figsize=(6, 4), facecolor=self.colors['chart_bg'])
-        ax = fig.add_subplot(111)
+        fig, ax, canvas = self.create_chart_canvas(parent, row, col, "Current Inventory Levels")
         
-        # Get inventory data
-        self.cursor.execute("""
-            SELECT blood_group, units_available
-            FROM BloodBank
-            ORDER BY blood_group
-        """)
-        
-        blood_types = []
-        units = []
-        for blood_type, unit in self.cursor.fetchall():
-            blood_types.append(blood_type)
-            units.append(unit)
-        
-        # Create horizontal bar chart
-        bars = ax.barh(blood_types, units, color=self.colors['accent'])
-        ax.set_facecolor(self.colors['chart_bg'])
         ax.tick_params(colors=self.colors['text'])
         ax.grid(True, color=self.colors['grid'], linestyle='--', alpha=0.7)
-        
-        # Add value labels
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(width, bar.get_y() + bar.get_height()/2,
-                f'{int(width):,}',
-                ha='left', va='center', color=self.colors['text'])
-        
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        chart = {}
+        
+        def update(snapshot):
+            # Shares the pie chart's inventory rows
+            rows = sorted(snapshot['inventory'].items())
+            blood_types = [blood_type for blood_type, _ in rows]
+            units = [unit for _, unit in rows]
+            
+            if chart.get('labels') != blood_types:
+                # First draw, or the set of groups changed
+                for artist in chart.get('artists', []):
+                    artist.remove()
+                bars = ax.barh(blood_types, [0] * len(units), color=self.colors['accent'])
+                labels = [
+                    ax.text(0, bar.get_y() + bar.get_height()/2, '',
+                        ha='left', va='center', color=self.colors['text'])
+                    for bar in bars
+                ]
+                chart.update(labels=blood_types, bars=bars, texts=labels,
+                             artists=list(bars) + labels)
+            
+            # Update bar lengths and value labels in place
+            for bar, label, unit in zip(chart['bars'], chart['texts'], units):
+                bar.set_width(unit)
+                label.set_x(unit)
+                label.set_text(f'{int(unit):,}')
+            ax.set_xlim(0, max(units, default=0) * 1.15 or 1)
+            canvas.draw_idle()
+        
+        return update
 
     def get_date_range(self):
         range_text = self.date_range_var.get()
@@ -3999,10 +7627,11 @@ class ModernBloodBankSystem:
 
     def show_edit_request_form(self, request_id, parent_window):
         # Fetch the current request data
-        self.cursor.execute("""
-            SELECT * FROM Requests WHERE id = %s
-        """, (request_id,))
-        request = self.cursor.fetchone()
+        with self.db_pool.cursor() as cursor:
+            cursor.execute("""
+                SELECT * FROM Requests WHERE id = %s
+            """, (request_id,))
+            request = cursor.fetchone()
         
         edit_window = tk.Toplevel(self.root)
         edit_window.title("Edit Request")
@@ -4246,68 +7875,50 @@ class ModernBloodBankSystem:
             except ValueError:
                 raise ValueError("Please enter a valid number of units")
             
-            # Get the original request data for comparison
-            self.cursor.execute("""
-                SELECT blood_group, units_requested, status 
-                FROM Requests 
-                WHERE id = %s
-            """, (request_id,))
-            original = self.cursor.fetchone()
-            orig_blood_group, orig_units, orig_status = original
-            
-            # Begin transaction
-            self.cursor.execute("START TRANSACTION")
-            
-            # Update request in database
-            self.cursor.execute("""
-                UPDATE Requests 
-                SET hospital_name = %s, blood_group = %s, units_requested = %s,
-                    priority = %s, status = %s, notes = %s
-                WHERE id = %s
-            """, (hospital, blood_type, units, priority, status, notes, request_id))
-            
-            # Handle status changes from Pending to Approved or Rejected
-            if orig_status != status:
-                if status == 'Approved' and orig_status != 'Approved':
-                    # If approved, decrease blood bank inventory
-                    self.cursor.execute("""
-                        UPDATE BloodBank
-                        SET units_available = units_available - %s
-                        WHERE blood_group = %s
-                    """, (units, blood_type))
-                elif orig_status == 'Approved' and status != 'Approved':
-                    # If un-approving, restore the blood bank inventory
-                    self.cursor.execute("""
-                        UPDATE BloodBank
-                        SET units_available = units_available + %s
-                        WHERE blood_group = %s
-                    """, (orig_units, orig_blood_group))
-            
-            # If still approved but changed units or blood type
-            elif status == 'Approved' and orig_status == 'Approved':
-                if blood_type != orig_blood_group:
-                    # Different blood group - restore original and reduce new
-                    self.cursor.execute("""
-                        UPDATE BloodBank
-                        SET units_available = units_available + %s
-                        WHERE blood_group = %s
-                    """, (orig_units, orig_blood_group))
-                    
-                    self.cursor.execute("""
-                        UPDATE BloodBank
-                        SET units_available = units_available - %s
-                        WHERE blood_group = %s
-                    """, (units, blood_type))
-                elif units != orig_units:
-                    # Same blood group but different units
-                    difference = orig_units - units
-                    self.cursor.execute("""
-                        UPDATE BloodBank
-                        SET units_available = units_available + %s
-                        WHERE blood_group = %s
-                    """, (difference, blood_type))
-            
-            self.db.commit()
+            with self.db_pool.transaction() as cursor:
+                # Get the original request data for comparison
+                cursor.execute("""
+                    SELECT blood_group, units_requested, status, request_date, priority
+                    FROM Requests 
+                    WHERE id = %s
+                    FOR UPDATE
+                """, (request_id,))
+                original = cursor.fetchone()
+                orig_blood_group, orig_units, orig_status, request_date, orig_priority = original
+                
+                # Update request in database
+                cursor.execute("""
+                    UPDATE Requests 
+                    SET hospital_name = %s, blood_group = %s, units_requested = %s,
+                        priority = %s, status = %s, notes = %s
+                    WHERE id = %s
+                """, (hospital, blood_type, units, priority, status, notes, request_id))
+                
+                # Return the old allocation and take the new one; the BloodBank
+                # counters move by the same per-group amounts as the lots
+                stock_deltas = {}
+                allocation_changed = (blood_type, units) != (orig_blood_group, orig_units)
+                if orig_status == 'Approved' and (status != 'Approved' or allocation_changed):
+                    released = BloodUnits.release(cursor, request_id, orig_blood_group, orig_units)
+                    for group, count in released.items():
+                        stock_deltas[group] = stock_deltas.get(group, 0) + count
+                if status == 'Approved' and (orig_status != 'Approved' or allocation_changed):
+                    BloodUnits.allocate(cursor, blood_type, units, request_id)
+                    stock_deltas[blood_type] = stock_deltas.get(blood_type, 0) - units
+                BloodUnits.adjust_counters(cursor, stock_deltas)
+                
+                self.dashboard_stats.add(
+                    cursor, 'pending_requests',
+                    (status == 'Pending') - (orig_status == 'Pending')
+                )
+                self.analytics_rollups.move_request(
+                    cursor,
+                    before=(request_date, orig_status, orig_priority, orig_blood_group, orig_units),
+                    after=(request_date, status, priority, blood_type, units)
+                )
+            
+            self.inventory.invalidate()
+            
             messagebox.showinfo("Success", "Request updated successfully!")
             
             # Close windows
@@ -4315,12 +7926,11 @@ class ModernBloodBankSystem:
             if parent_window:
                 parent_window.destroy()
             
-            # Refresh the requests view and dashboard
-            self.refresh_requests()
-            self.show_dashboard()
+            self.events.publish(ChangeEventBus.REQUEST_CHANGED, request_id=request_id, status=status)
+            if stock_deltas:
+                self.events.publish(ChangeEventBus.INVENTORY_CHANGED, blood_groups=sorted(stock_deltas))
             
         except Exception as e:
-            self.db.rollback()
             messagebox.showerror("Error", str(e))
 
     def save_donation(self, blood_type, units, donor, notes, window, parent_window=None):
@@ -4338,31 +7948,47 @@ class ModernBloodBankSystem:
             # Extract donor ID
             donor_id = int(donor.split(" - ")[0])
             
-            # Begin transaction
-            self.cursor.execute("START TRANSACTION")
-            
-            # Update blood bank inventory
-            self.cursor.execute("""
-                UPDATE BloodBank 
-                SET units_available = units_available + %s 
-                WHERE blood_group = %s
-            """, (units, blood_type))
-            
-            # Record donation
-            self.cursor.execute("""
-                UPDATE Donors 
-                SET donation_date = CURDATE()
-                WHERE id = %s
-            """, (donor_id,))
+            with self.db_pool.transaction() as cursor:
+                cursor.execute(
+                    "SELECT donation_date, CURDATE(), blood_group FROM Donors WHERE id = %s FOR UPDATE",
+                    (donor_id,)
+                )
+                previous_date, today, donor_group = cursor.fetchone()
+                
+                # Update blood bank inventory
+                cursor.execute("""
+                    UPDATE BloodBank 
+                    SET units_available = units_available + %s 
+                    WHERE blood_group = %s
+                """, (units, blood_type))
+                if cursor.rowcount:
+                    self.dashboard_stats.add(cursor, 'total_units', units)
+                    BloodUnits.receive(cursor, blood_type, units, donor_id=donor_id)
+                
+                # Record donation
+                cursor.execute("""
+                    UPDATE Donors 
+                    SET donation_date = CURDATE()
+                    WHERE id = %s
+                """, (donor_id,))
+                
+                # The donor moves from their previous donation day to today
+                if previous_date != today:
+                    self.dashboard_stats.add_day(cursor, previous_date, donations=-1)
+                    self.dashboard_stats.add_day(cursor, today, donations=1)
+                    self.analytics_rollups.move_donation(
+                        cursor, before=(previous_date, donor_group), after=(today, donor_group)
+                    )
+                
+                # Add to donation schedule
+                cursor.execute("""
+                    INSERT INTO DonationSchedule (
+                        donor_id, scheduled_date, time_slot, status, notes
+                    ) VALUES (%s, CURDATE(), NOW(), 'Completed', %s)
+                """, (donor_id, notes))
             
-            # Add to donation schedule
-            self.cursor.execute("""
-                INSERT INTO DonationSchedule (
-                    donor_id, scheduled_date, time_slot, status, notes
-                ) VALUES (%s, CURDATE(), NOW(), 'Completed', %s)
-            """, (donor_id, notes))
+            self.inventory.invalidate()
             
-            self.db.commit()
             messagebox.showinfo("Success", "Donation recorded successfully!")
             
             # Close windows
@@ -4370,88 +7996,16 @@ class ModernBloodBankSystem:
             if parent_window:
                 parent_window.destroy()
             
-            # Refresh dashboard to reflect changes
-            self.show_dashboard()
+            self.events.publish(ChangeEventBus.DONATION_RECORDED, donor_id=donor_id, units=units)
+            self.events.publish(ChangeEventBus.INVENTORY_CHANGED, blood_groups=[blood_type])
             
         except Exception as e:
-            self.db.rollback()
             messagebox.showerror("Error", str(e))
 
     def update_analytics(self, event=None):
         """Refresh all analytics charts based on current date range"""
-        for widget in self.main_container.winfo_children():
-            widget.destroy()
-                    
-        main_frame = ttk.Frame(self.main_container, style='Modern.TFrame')
-        main_frame.pack(fill='both', expand=True)
-        
-        # Header
-        header_frame = ttk.Frame(main_frame, style='Modern.TFrame')
-        header_frame.pack(fill='x', pady=(0, 20))
-        
-        # Back button
-        ttk.Button(
-            header_frame,
-            text="← Back to Dashboard",
-            style='Secondary.TButton',
-            command=self.show_dashboard
-        ).pack(side='left', padx=10, pady=5)
-        
-        # Title
-        tk.Label(
-            header_frame,
-            text="Analytics Dashboard",
-            font=('Segoe UI', 32, 'bold'),
-            bg=self.colors['bg_dark'],
-            fg=self.colors['text'],
-            pady=20
-        ).pack(side='left', padx=20)
-        
-        # Create date range selector
-        date_range_frame = ttk.Frame(header_frame, style='Card.TFrame')
-        date_range_frame.pack(side='right')
-        
-        # Use tk.Label
-        tk.Label(
-            date_range_frame,
-            text="Date Range:",
-            font=('Segoe UI', 16),
-            bg=self.colors['card_bg'],
-            fg=self.colors['text_secondary'],
-            pady=10
-        ).pack(side='left', padx=(0, 10))
-        
-        ranges = ['Last 7 Days', 'Last 30 Days', 'Last 3 Months', 'Last Year']
-        self.date_range_var = tk.StringVar(value='Last 30 Days')
-        
-        range_combo = ttk.Combobox(
-            date_range_frame,
-            textvariable=self.date_range_var,
-            values=ranges,
-            state='readonly',
-            style='Modern.TCombobox'
-        )
-        range_combo.pack(side='left')
-        range_combo.bind('<<ComboboxSelected>>', lambda e: self.update_analytics())
-        
-        # Create charts grid
-        charts_frame = ttk.Frame(main_frame, style='Modern.TFrame')
-        charts_frame.pack(fill='both', expand=True)
-        
-        # Configure grid
-        for i in range(2):
-            charts_frame.grid_columnconfigure(i, weight=1)
-            charts_frame.grid_rowconfigure(i, weight=1)
-        
-        # Create overview stats
-        stats_frame = ttk.Frame(main_frame, style='Modern.TFrame')
-        stats_frame.pack(fill='x', pady=(0, 20))
-        
-        # Create charts with real data
-        self.create_donation_trend_chart(charts_frame, 0, 0)
-        self.create_blood_type_distribution_chart(charts_frame, 0, 1)
-        self.create_request_status_chart(charts_frame, 1, 0)
-        self.create_inventory_levels_chart(charts_frame, 1, 1)
+        # The analytics screen stays alive; only its charts are redrawn
+        self.refresh_analytics_charts()
 
     def show_settings(self):
         settings_window = tk.Toplevel(self.root)
@@ -4614,11 +8168,12 @@ class ModernBloodBankSystem:
         ).pack(anchor='w')
         
         donor_var = tk.StringVar()
-        self.cursor.execute(
-            "SELECT id, name FROM Donors WHERE blood_group = %s",
-            (blood_type if blood_type else 'A+',)
-        )
-        donors = self.cursor.fetchall()
+        with self.db_pool.cursor() as cursor:
+            cursor.execute(
+                "SELECT id, name FROM Donors WHERE blood_group = %s",
+                (blood_type if blood_type else 'A+',)
+            )
+            donors = cursor.fetchall()
         donor_list = [f"{d[0]} - {d[1]}" for d in donors]
         
         donor_combo = ttk.Combobox(
@@ -4699,37 +8254,54 @@ class ModernBloodBankSystem:
             # Extract donor ID
             donor_id = int(donor.split(" - ")[0])
             
-            # Begin transaction
-            self.cursor.execute("START TRANSACTION")
-            
-            # Update blood bank inventory
-            self.cursor.execute("""
-                UPDATE BloodBank 
-                SET units_available = units_available + %s 
-                WHERE blood_group = %s
-            """, (units, blood_type))
-            
-            # Record donation
-            self.cursor.execute("""
-                UPDATE Donors 
-                SET donation_date = CURDATE()
-                WHERE id = %s
-            """, (donor_id,))
+            with self.db_pool.transaction() as cursor:
+                cursor.execute(
+                    "SELECT donation_date, CURDATE(), blood_group FROM Donors WHERE id = %s FOR UPDATE",
+                    (donor_id,)
+                )
+                previous_date, today, donor_group = cursor.fetchone()
+                
+                # Update blood bank inventory
+                cursor.execute("""
+                    UPDATE BloodBank 
+                    SET units_available = units_available + %s 
+                    WHERE blood_group = %s
+                """, (units, blood_type))
+                if cursor.rowcount:
+                    self.dashboard_stats.add(cursor, 'total_units', units)
+                    BloodUnits.receive(cursor, blood_type, units, donor_id=donor_id)
+                
+                # Record donation
+                cursor.execute("""
+                    UPDATE Donors 
+                    SET donation_date = CURDATE()
+                    WHERE id = %s
+                """, (donor_id,))
+                
+                # The donor moves from their previous donation day to today
+                if previous_date != today:
+                    self.dashboard_stats.add_day(cursor, previous_date, donations=-1)
+                    self.dashboard_stats.add_day(cursor, today, donations=1)
+                    self.analytics_rollups.move_donation(
+                        cursor, before=(previous_date, donor_group), after=(today, donor_group)
+                    )
+                
+                # Add to donation schedule
+                cursor.execute("""
+                    INSERT INTO DonationSchedule (
+                        donor_id, scheduled_date, time_slot, status, notes
+                    ) VALUES (%s, CURDATE(), NOW(), 'Completed', %s)
+                """, (donor_id, notes))
             
-            # Add to donation schedule
-            self.cursor.execute("""
-                INSERT INTO DonationSchedule (
-                    donor_id, scheduled_date, time_slot, status, notes
-                ) VALUES (%s, CURDATE(), NOW(), 'Completed', %s)
-            """, (donor_id, notes))
+            self.inventory.invalidate()
             
-            self.db.commit()
             messagebox.showinfo("Success", "Donation recorded successfully!")
             window.destroy()
-            self.show_dashboard()  # Refresh dashboard
+            
+            self.events.publish(ChangeEventBus.DONATION_RECORDED, donor_id=donor_id, units=units)
+            self.events.publish(ChangeEventBus.INVENTORY_CHANGED, blood_groups=[blood_type])
             
         except Exception as e:
-            self.db.rollback()
             messagebox.showerror("Error", str(e))
 
     def backup_database(self):
@@ -4933,6 +8505,37 @@ class ModernBloodBankSystem:
         
         for log in sample_logs:
             tree.insert('', 'end', values=log)
+        
+        # Connection pool health
+        metrics = self.db_pool.get_metrics()
+        tree.insert('', 'end', values=(
+            datetime.now(),
+            "DB Pool",
+            "system",
+            f"{metrics['in_use']}/{metrics['pool_size']} in use, {metrics['idle']} idle, "
+            f"{metrics['checkouts']} checkouts, avg wait {metrics['avg_wait_ms']:.1f} ms, "
+            f"max wait {metrics['max_wait_ms']:.1f} ms, {metrics['timeouts']} timeouts, "
+            f"{metrics['reconnects']} reconnects"
+        ))
+        
+        tree.insert('', 'end', values=(
+            datetime.now(),
+            "Startup",
+            "system",
+            self.format_startup_timings()
+        ))
+        
+        # EXPLAIN plans recorded by the last schema migration
+        try:
+            for name, full_scan, plan, recorded_at in self.schema_migrator.query_plans():
+                tree.insert('', 'end', values=(
+                    recorded_at,
+                    "Query Plan (FULL SCAN)" if full_scan else "Query Plan",
+                    "system",
+                    f"{name}: {plan}"
+                ))
+        except mysql.connector.Error as e:
+            print(f"Error loading query plans: {e}")
 
     def show_user_management(self):
         users_window = tk.Toplevel(self.root)
@@ -4984,11 +8587,13 @@ class ModernBloodBankSystem:
         tree.pack(fill='both', expand=True)
         
         # Load users
-        self.cursor.execute(
-            "SELECT username, role, email, last_login FROM Users"
-        )
+        with self.db_pool.cursor() as cursor:
+            cursor.execute(
+                "SELECT username, role, email, last_login FROM Users"
+            )
+            users = cursor.fetchall()
         
-        for user in self.cursor.fetchall():
+        for user in users:
             tree.insert('', 'end', values=user)
 
     def show_add_user_form(self):
@@ -5436,22 +9041,22 @@ class ModernBloodBankSystem:
             if not self.validate_email(email):
                 raise ValueError("Invalid email format")
             
-            # Check if username exists
-            self.cursor.execute(
-                "SELECT COUNT(*) FROM Users WHERE username = %s",
-                (username,)
-            )
-            if self.cursor.fetchone()[0] > 0:
-                raise ValueError("Username already exists")
-            
-            # Create user
-            hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            self.cursor.execute("""
-                INSERT INTO Users (username, password, role, email)
-                VALUES (%s, %s, %s, %s)
-            """, (username, hashed, role, email))
+            with self.db_pool.transaction() as cursor:
+                # Check if username exists
+                cursor.execute(
+                    "SELECT COUNT(*) FROM Users WHERE username = %s",
+                    (username,)
+                )
+                if cursor.fetchone()[0] > 0:
+                    raise ValueError("Username already exists")
+                
+                # Create user
+                hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+                cursor.execute("""
+                    INSERT INTO Users (username, password, role, email)
+                    VALUES (%s, %s, %s, %s)
+                """, (username, hashed, role, email))
             
-            self.db.commit()
             messagebox.showinfo("Success", "User created successfully!")
             window.destroy()
             
@@ -5532,23 +9137,23 @@ class ModernBloodBankSystem:
             if not self.validate_email(email):
                 raise ValueError("Invalid email format")
             
-            # Verify user exists and email matches
-            self.cursor.execute(
-                "SELECT id FROM Users WHERE username = %s AND email = %s",
-                (username, email)
-            )
-            
-            if not self.cursor.fetchone():
-                raise ValueError("Invalid username or email")
-            
-            # Update password
-            hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            self.cursor.execute(
-                "UPDATE Users SET password = %s WHERE username = %s",
-                (hashed, username)
-            )
+            with self.db_pool.transaction() as cursor:
+                # Verify user exists and email matches
+                cursor.execute(
+                    "SELECT id FROM Users WHERE username = %s AND email = %s",
+                    (username, email)
+                )
+                
+                if not cursor.fetchone():
+                    raise ValueError("Invalid username or email")
+                
+                # Update password
+                hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+                cursor.execute(
+                    "UPDATE Users SET password = %s WHERE username = %s",
+                    (hashed, username)
+                )
             
-            self.db.commit()
             messagebox.showinfo("Success", "Password reset successfully!")
             window.destroy()
             
@@ -5691,7 +9296,7 @@ class ModernBloodBankSystem:
         start_date = start_date.get_date()  # Get date from ModernCalendar
         end_date = end_date.get_date()      # Get date from ModernCalendar
         
-        try:
+        def write_report():
             # Create a reports directory if it doesn't exist
             reports_dir = "reports"
             if not os.path.exists(reports_dir):
@@ -5702,14 +9307,20 @@ class ModernBloodBankSystem:
             
             # Fetch data based on report type
             if report_type == "donation":
-                self.cursor.execute("""
-                    SELECT d.name, d.blood_group, d.donation_date, d.contact_info
-                    FROM Donors d
-                    WHERE d.donation_date BETWEEN %s AND %s
-                    ORDER BY d.donation_date
-                """, (start_date, end_date))
+                with self.db_pool.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT d.name, d.blood_group, d.donation_date, d.contact_info
+                        FROM Donors d
+                        WHERE d.donation_date BETWEEN %s AND %s
+                        ORDER BY d.donation_date
+                    """, (start_date, end_date))
+                    data = cursor.fetchall()
+                    
+                    # Summary statistics come from the rollups
+                    engine = AnalyticsEngine.load(cursor, start_date, end_date)
                 
-                data = self.cursor.fetchall()
+                daily = engine.daily('donations')
+                daily_percentiles = engine.percentiles(daily)
                 
                 # Write to a text file (simplified version of a PDF)
                 with open(filename, 'w') as file:
@@ -5728,15 +9339,24 @@ class ModernBloodBankSystem:
                     
                     file.write("\n" + "-" * 80 + "\n")
                     file.write(f"Total Donations: {len(data)}\n")
+                    for blood_group, count in engine.by_group('donations').items():
+                        if count:
+                            file.write(f"  {blood_group}: {int(count)}\n")
+                    if len(daily):
+                        file.write(f"Daily Average: {daily.mean():.2f}\n")
+                        file.write(f"7-Day Moving Average (last day): {engine.moving_average(daily, 7)[-1]:.2f}\n")
+                        file.write(f"30-Day Moving Average (last day): {engine.moving_average(daily, 30)[-1]:.2f}\n")
+                        file.write(f"Daily Donations P50/P90/P95: {daily_percentiles[50]:.1f} / "
+                                   f"{daily_percentiles[90]:.1f} / {daily_percentiles[95]:.1f}\n")
                     
             elif report_type == "inventory":
-                self.cursor.execute("""
-                    SELECT blood_group, units_available, last_updated
-                    FROM BloodBank
-                    ORDER BY blood_group
-                """)
-                
-                data = self.cursor.fetchall()
+                with self.db_pool.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT blood_group, units_available, last_updated
+                        FROM BloodBank
+                        ORDER BY blood_group
+                    """)
+                    data = cursor.fetchall()
                 
                 with open(filename, 'w') as file:
                     file.write(f"Blood Bank Management System - Inventory Report\n")
@@ -5758,15 +9378,22 @@ class ModernBloodBankSystem:
                     file.write(f"Total Blood Units Available: {total_units}\n")
             
             elif report_type == "requests":
-                self.cursor.execute("""
-                    SELECT hospital_name, blood_group, units_requested, request_date, 
-                        priority, status, notes
-                    FROM Requests
-                    WHERE request_date BETWEEN %s AND %s
-                    ORDER BY request_date DESC
-                """, (start_date, end_date))
+                with self.db_pool.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT hospital_name, blood_group, units_requested, request_date, 
+                            priority, status, notes
+                        FROM Requests
+                        WHERE request_date BETWEEN %s AND %s
+                        ORDER BY request_date DESC
+                    """, (start_date, end_date))
+                    data = cursor.fetchall()
+                    
+                    # Summary statistics come from the rollups
+                    engine = AnalyticsEngine.load(cursor, start_date, end_date)
                 
-                data = self.cursor.fetchall()
+                status_counts = engine.status_counts()
+                units_issued = engine.by_group('units_issued')
+                consumption = engine.consumption_rates()
                 
                 with open(filename, 'w') as file:
                     file.write(f"Blood Bank Management System - Blood Requests Report\n")
@@ -5777,11 +9404,6 @@ class ModernBloodBankSystem:
                         "Hospital", "Blood Type", "Units", "Date", "Priority", "Status"))
                     file.write("-" * 100 + "\n")
                     
-                    total_requests = 0
-                    approved_count = 0
-                    pending_count = 0
-                    rejected_count = 0
-                    
                     for row in data:
                         date_str = row[3].strftime("%Y-%m-%d")
                         file.write("{:<30} {:<10} {:<10} {:<15} {:<15} {:<15}\n".format(
@@ -5790,29 +9412,25 @@ class ModernBloodBankSystem:
                         if row[6]:  # Notes
                             file.write(f"Notes: {row[6]}\n")
                             file.write("-" * 100 + "\n")
-                        
-                        total_requests += 1
-                        if row[5] == 'Approved':
-                            approved_count += 1
-                        elif row[5] == 'Pending':
-                            pending_count += 1
-                        elif row[5] == 'Rejected':
-                            rejected_count += 1
                     
                     file.write("\n" + "-" * 100 + "\n")
-                    file.write(f"Total Requests: {total_requests}\n")
-                    file.write(f"Approved: {approved_count}\n")
-                    file.write(f"Pending: {pending_count}\n")
-                    file.write(f"Rejected: {rejected_count}\n")
+                    file.write(f"Total Requests: {sum(status_counts.values())}\n")
+                    file.write(f"Approved: {status_counts.get('Approved', 0)}\n")
+                    file.write(f"Pending: {status_counts.get('Pending', 0)}\n")
+                    file.write(f"Rejected: {status_counts.get('Rejected', 0)}\n")
+                    file.write(f"Units Issued: {int(sum(units_issued.values()))}\n")
+                    for blood_group, issued in units_issued.items():
+                        if issued:
+                            file.write(f"  {blood_group}: {int(issued)} ({consumption[blood_group]:.2f} units/day)\n")
                     
             elif report_type == "users":
-                self.cursor.execute("""
-                    SELECT username, role, email, last_login, created_at
-                    FROM Users
-                    ORDER BY created_at DESC
-                """)
-                
-                data = self.cursor.fetchall()
+                with self.db_pool.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT username, role, email, last_login, created_at
+                        FROM Users
+                        ORDER BY created_at DESC
+                    """)
+                    data = cursor.fetchall()
                 
                 with open(filename, 'w') as file:
                     file.write(f"Blood Bank Management System - Users Activity Report\n")
@@ -5833,20 +9451,28 @@ class ModernBloodBankSystem:
                     file.write("\n" + "-" * 100 + "\n")
                     file.write(f"Total Users: {len(data)}\n")
             
+            return filename
+        
+        def report_written(filename):
             # Open the generated file
             os.startfile(filename) if os.name == 'nt' else os.system(f'xdg-open "{filename}"')
             
             messagebox.showinfo("Report Generated", f"Report saved to {filename}\nThe file has been opened for you.")
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
+        # Queries and file writing run on a worker, as for the Excel export
+        self.query_executor.run_in_background(
+            write_report,
+            report_written,
+            lambda e: messagebox.showerror("Error", f"Failed to generate report: {str(e)}"),
+            key='pdf_report'
+        )
 
 
     def export_excel_report(self, start_date, end_date, report_type):
         start_date = start_date.get_date()  # Get date from ModernCalendar
         end_date = end_date.get_date()      # Get date from ModernCalendar
         
-        try:
+        def write_report():
             # Create a reports directory if it doesn't exist
             reports_dir = "reports"
             if not os.path.exists(reports_dir):
@@ -5857,16 +9483,16 @@ class ModernBloodBankSystem:
             
             # Fetch data based on report type
             if report_type == "donation":
-                self.cursor.execute("""
-                    SELECT d.name, d.blood_group, d.donation_date, d.contact_info, d.email,
-                        ds.time_slot, ds.status
-                    FROM Donors d
-                    LEFT JOIN DonationSchedule ds ON d.id = ds.donor_id
-                    WHERE d.donation_date BETWEEN %s AND %s
-                    ORDER BY d.donation_date
-                """, (start_date, end_date))
-                
-                data = self.cursor.fetchall()
+                with self.db_pool.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT d.name, d.blood_group, d.donation_date, d.contact_info, d.email,
+                            ds.time_slot, ds.status
+                        FROM Donors d
+                        LEFT JOIN DonationSchedule ds ON d.id = ds.donor_id
+                        WHERE d.donation_date BETWEEN %s AND %s
+                        ORDER BY d.donation_date
+                    """, (start_date, end_date))
+                    data = cursor.fetchall()
                 
                 # Write to a CSV file (Excel compatible)
                 with open(filename, 'w', newline='') as file:
@@ -5882,13 +9508,13 @@ class ModernBloodBankSystem:
                         file.write(f'"{row[0]}","{row[1]}","{date_str}","{row[3]}","{email}","{time_slot}","{status}"\n')
                         
             elif report_type == "inventory":
-                self.cursor.execute("""
-                    SELECT blood_group, units_available, last_updated
-                    FROM BloodBank
-                    ORDER BY blood_group
-                """)
-                
-                data = self.cursor.fetchall()
+                with self.db_pool.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT blood_group, units_available, last_updated
+                        FROM BloodBank
+                        ORDER BY blood_group
+                    """)
+                    data = cursor.fetchall()
                 
                 with open(filename, 'w', newline='') as file:
                     file.write("Blood Group,Units Available,Last Updated\n")
@@ -5898,15 +9524,15 @@ class ModernBloodBankSystem:
                         file.write(f'"{row[0]}",{row[1]},"{update_str}"\n')
             
             elif report_type == "requests":
-                self.cursor.execute("""
-                    SELECT hospital_name, blood_group, units_requested, request_date, 
-                        priority, status, notes, created_at
-                    FROM Requests
-                    WHERE request_date BETWEEN %s AND %s
-                    ORDER BY request_date DESC
-                """, (start_date, end_date))
-                
-                data = self.cursor.fetchall()
+                with self.db_pool.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT hospital_name, blood_group, units_requested, request_date, 
+                            priority, status, notes, created_at
+                        FROM Requests
+                        WHERE request_date BETWEEN %s AND %s
+                        ORDER BY request_date DESC
+                    """, (start_date, end_date))
+                    data = cursor.fetchall()
                 
                 with open(filename, 'w', newline='') as file:
                     file.write("Hospital,Blood Group,Units,Request Date,Priority,Status,Notes,Created At\n")
@@ -5919,13 +9545,13 @@ class ModernBloodBankSystem:
                         file.write(f'"{row[0]}","{row[1]}",{row[2]},"{date_str}","{row[4]}","{row[5]}","{notes}","{created_str}"\n')
             
             elif report_type == "users":
-                self.cursor.execute("""
-                    SELECT username, role, email, last_login, created_at
-                    FROM Users
-                    ORDER BY created_at DESC
-                """)
-                
-                data = self.cursor.fetchall()
+                with self.db_pool.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT username, role, email, last_login, created_at
+                        FROM Users
+                        ORDER BY created_at DESC
+                    """)
+                    data = cursor.fetchall()
                 
                 with open(filename, 'w', newline='') as file:
                     file.write("Username,Role,Email,Last Login,Created At\n")
@@ -5936,13 +9562,21 @@ class ModernBloodBankSystem:
                         
                         file.write(f'"{row[0]}","{row[1]}","{row[2]}","{last_login}","{created_at}"\n')
             
+            return filename
+        
+        def report_written(filename):
             # Open the generated file with default spreadsheet application
             os.startfile(filename) if os.name == 'nt' else os.system(f'xdg-open "{filename}"')
             
             messagebox.showinfo("Report Exported", f"Report exported to {filename}\nThe file has been opened for you.")
         
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export report: {str(e)}")
+        # Queries and file writing run on a worker so large exports keep the UI responsive
+        self.query_executor.run_in_background(
+            write_report,
+            report_written,
+            lambda e: messagebox.showerror("Error", f"Failed to export report: {str(e)}"),
+            key='excel_report'
+        )
 
     def logout(self):
         self.current_user = None
@@ -5950,9 +9584,24 @@ class ModernBloodBankSystem:
     
     def run(self):
         """Start the Tkinter main event loop"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            # Drop queued queries and release pooled connections on exit
+            if hasattr(self, 'query_executor'):
+                self.query_executor.shutdown()
+            if hasattr(self, 'db_pool'):
+                self.db_pool.close_all()
     
 if __name__ == "__main__":
+    if '--forecast-benchmark' in sys.argv:
+        run_forecast_benchmark()
+        sys.exit()
+    if '--fulfilment-benchmark' in sys.argv:
+        run_fulfilment_benchmark()
+        sys.exit()
+    if '--check-expired-release' in sys.argv:
+        sys.exit(0 if check_expired_release(DatabasePool(pool_size=1, **DB_CONFIG)) else 1)
     try:
         app = ModernBloodBankSystem()
         app.run()